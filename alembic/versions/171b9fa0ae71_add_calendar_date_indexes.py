@@ -0,0 +1,44 @@
+"""add calendar date indexes
+
+Revision ID: 171b9fa0ae71
+Revises: 59195289c7e4
+Create Date: 2026-10-19 17:05:12.604381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '171b9fa0ae71'
+down_revision: Union[str, Sequence[str], None] = '59195289c7e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (インデックス名, テーブル名, 列)
+INDEXES = [
+    ('ix_notebooks_renewal_date', 'notebooks', ['renewal_date']),
+    ('ix_users_disability_support_expiry_date', 'users', ['disability_support_expiry_date']),
+]
+
+
+def _existing_indexes(table_name: str) -> set:
+    """テーブルに作成済みのインデックス名"""
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 以前の create_all で作成済みの場合もあるため、未作成のインデックスのみ作成
+    for name, table_name, columns in INDEXES:
+        if name not in _existing_indexes(table_name):
+            op.create_index(name, table_name, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table_name, _ in INDEXES:
+        if name in _existing_indexes(table_name):
+            op.drop_index(name, table_name=table_name)
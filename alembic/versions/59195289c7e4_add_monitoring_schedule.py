@@ -0,0 +1,55 @@
+"""add monitoring schedule
+
+Revision ID: 59195289c7e4
+Revises: 6146a27b3fb7
+Create Date: 2026-10-19 16:32:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '59195289c7e4'
+down_revision: Union[str, Sequence[str], None] = '6146a27b3fb7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 以前の create_all で作成済みの場合は何もしない（予定は scripts/init_db.py が適用後に算出）
+    if sa.inspect(op.get_bind()).has_table('monitoring_schedule'):
+        return
+
+    op.create_table('monitoring_schedule',
+    sa.Column('id', sa.Integer(), nullable=False, comment='予定ID'),
+    sa.Column('user_id', sa.Integer(), nullable=False, comment='利用者ID'),
+    sa.Column('plan_id', sa.Integer(), nullable=False, comment='有効な計画ID'),
+    sa.Column('staff_id', sa.Integer(), nullable=True, comment='担当スタッフID（利用者の担当）'),
+    sa.Column('last_monitoring_id', sa.Integer(), nullable=True, comment='最新のモニタリングID'),
+    sa.Column('due_date', sa.Date(), nullable=False, comment='次回モニタリング予定日'),
+    sa.Column('last_monitoring_date', sa.Date(), nullable=True, comment='最新のモニタリング実施日'),
+    sa.Column('interval_months', sa.Integer(), nullable=False, comment='モニタリング周期（月）'),
+    sa.Column('basis', sa.String(length=20), nullable=False, comment='算出根拠（次回予定日/周期/計画開始/計画終了）'),
+    sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新日時'),
+    sa.ForeignKeyConstraint(['last_monitoring_id'], ['monitorings.id'], ),
+    sa.ForeignKeyConstraint(['plan_id'], ['plans.id'], ),
+    sa.ForeignKeyConstraint(['staff_id'], ['staffs.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_index('idx_monitoring_schedule_due', 'monitoring_schedule', ['due_date'], unique=False)
+    op.create_index('idx_monitoring_schedule_staff_due', 'monitoring_schedule', ['staff_id', 'due_date'], unique=False)
+    op.create_index(op.f('ix_monitoring_schedule_id'), 'monitoring_schedule', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_monitoring_schedule_id'), table_name='monitoring_schedule')
+    op.drop_index('idx_monitoring_schedule_staff_due', table_name='monitoring_schedule')
+    op.drop_index('idx_monitoring_schedule_due', table_name='monitoring_schedule')
+    op.drop_table('monitoring_schedule')
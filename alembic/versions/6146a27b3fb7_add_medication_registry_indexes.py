@@ -0,0 +1,53 @@
+"""add medication registry indexes
+
+Revision ID: 6146a27b3fb7
+Revises: 6ffe51561439
+Create Date: 2026-10-19 15:48:09.524310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6146a27b3fb7'
+down_revision: Union[str, Sequence[str], None] = '6ffe51561439'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    'idx_medications_user_current': ['user_id', 'is_current'],
+    'idx_medications_doctor_current': ['prescribing_doctor_id', 'is_current'],
+}
+
+
+def _existing_indexes() -> set:
+    """medications に作成済みのインデックス名（テーブルがない場合はNone）"""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('medications'):
+        return None
+    return {index['name'] for index in inspector.get_indexes('medications')}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # medications は初期マイグレーションに含まれておらず、create_all で
+    # 作成済みの場合もあるため、未作成のインデックスのみ作成
+    existing = _existing_indexes()
+    if existing is None:
+        return
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, 'medications', columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    existing = _existing_indexes()
+    if existing is None:
+        return
+    for name in INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name='medications')
@@ -0,0 +1,41 @@
+"""add medication changes date index
+
+Revision ID: 6ffe51561439
+Revises: 6c3edd76a50b
+Create Date: 2026-10-19 15:02:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6ffe51561439'
+down_revision: Union[str, Sequence[str], None] = '6c3edd76a50b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_index() -> bool:
+    """medication_changes が存在し、インデックスが作成済みかどうか"""
+    inspector = sa.inspect(op.get_bind())
+    return any(
+        index['name'] == 'idx_medication_changes_medication_date'
+        for index in inspector.get_indexes('medication_changes')
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # medication_changes は初期マイグレーションに含まれておらず、create_all で
+    # 作成済みの場合もあるため、テーブルがありインデックスが未作成の場合のみ作成
+    if sa.inspect(op.get_bind()).has_table('medication_changes') and not _has_index():
+        op.create_index('idx_medication_changes_medication_date', 'medication_changes', ['medication_id', 'change_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if sa.inspect(op.get_bind()).has_table('medication_changes') and _has_index():
+        op.drop_index('idx_medication_changes_medication_date', table_name='medication_changes')
@@ -0,0 +1,28 @@
+"""populate monitoring schedule
+
+Revision ID: bd251e4070e1
+Revises: f3ea947d3c8c
+Create Date: 2026-10-19 19:02:11.528417
+
+"""
+from typing import Sequence, Union
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bd251e4070e1'
+down_revision: Union[str, Sequence[str], None] = 'f3ea947d3c8c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # モニタリング予定の算出はアプリケーションのモデル（最新のスキーマ）に依存するため、
+    # マイグレーションでは行わず、scripts/init_db.py が適用後に空の場合のみ算出する
+    # （このリビジョンを適用済みのデータベースのために、リビジョンのみ残している）
+    pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
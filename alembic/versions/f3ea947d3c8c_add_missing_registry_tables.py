@@ -0,0 +1,153 @@
+"""add missing registry tables
+
+Revision ID: f3ea947d3c8c
+Revises: 171b9fa0ae71
+Create Date: 2026-10-19 18:10:27.402195
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3ea947d3c8c'
+down_revision: Union[str, Sequence[str], None] = '171b9fa0ae71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 初期マイグレーションに含まれていなかった列（テーブル名, 列名, 型, コメント）
+MISSING_COLUMNS = [
+    ('staffs', 'hire_date', sa.Date, '採用年月日'),
+    ('staffs', 'qualifications', sa.Text, '資格（カンマ区切り）'),
+    ('staffs', 'resignation_date', sa.Date, '退職日'),
+    ('users', 'disability_characteristics', sa.Text, '障害特性（特性、困難さ、配慮事項など）'),
+    ('users', 'interest_bias', sa.Text, '興味の偏り（興味関心、好き嫌い、こだわりなど）'),
+]
+
+
+def _has_table(table_name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(table_name)
+
+
+def _has_column(table_name: str, column_name: str) -> bool:
+    return any(column['name'] == column_name for column in sa.inspect(op.get_bind()).get_columns(table_name))
+
+
+def _create_missing_indexes(table_name: str, indexes: list) -> None:
+    """テーブルに未作成のインデックスのみ作成"""
+    existing = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table_name)}
+    for name, columns in indexes:
+        if name not in existing:
+            op.create_index(name, table_name, columns, unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 以下のテーブル・列は初期マイグレーションに含まれておらず、以前の create_all で
+    # 作成済みの場合もあるため、未作成のもののみ作成する
+    # （空のデータベースでも alembic upgrade head で全テーブルを作成できるようにする）
+    if not _has_table('prescribing_doctors'):
+        op.create_table('prescribing_doctors',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False, comment='医師名'),
+        sa.Column('hospital_name', sa.String(length=200), nullable=True, comment='医療機関名'),
+        sa.Column('department', sa.String(length=100), nullable=True, comment='診療科'),
+        sa.Column('phone', sa.String(length=20), nullable=True, comment='電話番号'),
+        sa.Column('address', sa.Text(), nullable=True, comment='住所'),
+        sa.Column('notes', sa.Text(), nullable=True, comment='備考'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True, comment='登録日時'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True, comment='更新日時'),
+        sa.PrimaryKeyConstraint('id')
+        )
+    _create_missing_indexes('prescribing_doctors', [('ix_prescribing_doctors_id', ['id'])])
+
+    if not _has_table('medications'):
+        op.create_table('medications',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False, comment='利用者ID'),
+        sa.Column('prescribing_doctor_id', sa.Integer(), nullable=True, comment='処方医ID'),
+        sa.Column('medication_name', sa.String(length=200), nullable=False, comment='薬品名'),
+        sa.Column('generic_name', sa.String(length=200), nullable=True, comment='一般名'),
+        sa.Column('dosage', sa.String(length=100), nullable=True, comment='用量 (例: 1錠)'),
+        sa.Column('frequency', sa.String(length=100), nullable=True, comment='服用回数 (例: 1日3回)'),
+        sa.Column('timing', sa.String(length=100), nullable=True, comment='服用タイミング (例: 食後)'),
+        sa.Column('start_date', sa.Date(), nullable=True, comment='服用開始日'),
+        sa.Column('end_date', sa.Date(), nullable=True, comment='服用終了日'),
+        sa.Column('is_current', sa.Boolean(), nullable=True, comment='現在服用中かどうか'),
+        sa.Column('purpose', sa.Text(), nullable=True, comment='処方目的'),
+        sa.Column('notes', sa.Text(), nullable=True, comment='備考'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True, comment='登録日時'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True, comment='更新日時'),
+        sa.ForeignKeyConstraint(['prescribing_doctor_id'], ['prescribing_doctors.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+        )
+    _create_missing_indexes('medications', [
+        ('idx_medications_doctor_current', ['prescribing_doctor_id', 'is_current']),
+        ('idx_medications_user_current', ['user_id', 'is_current']),
+        ('ix_medications_id', ['id']),
+    ])
+
+    if not _has_table('medication_changes'):
+        op.create_table('medication_changes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('medication_id', sa.Integer(), nullable=False, comment='服薬情報ID'),
+        sa.Column('change_date', sa.Date(), nullable=False, comment='変更日'),
+        sa.Column('change_type', sa.String(length=50), nullable=False, comment='変更種別 (新規/変更/中止)'),
+        sa.Column('previous_value', sa.Text(), nullable=True, comment='変更前の内容'),
+        sa.Column('new_value', sa.Text(), nullable=True, comment='変更後の内容'),
+        sa.Column('reason', sa.Text(), nullable=True, comment='変更理由'),
+        sa.Column('notes', sa.Text(), nullable=True, comment='備考'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True, comment='登録日時'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True, comment='更新日時'),
+        sa.ForeignKeyConstraint(['medication_id'], ['medications.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+        )
+    _create_missing_indexes('medication_changes', [
+        ('idx_medication_changes_medication_date', ['medication_id', 'change_date']),
+        ('ix_medication_changes_id', ['id']),
+    ])
+
+    if not _has_table('plan_evaluations'):
+        op.create_table('plan_evaluations',
+        sa.Column('id', sa.Integer(), nullable=False, comment='評価ID'),
+        sa.Column('plan_id', sa.Integer(), nullable=False, comment='計画ID'),
+        sa.Column('user_id', sa.Integer(), nullable=False, comment='利用者ID'),
+        sa.Column('staff_id', sa.Integer(), nullable=False, comment='評価者スタッフID'),
+        sa.Column('evaluation_date', sa.Date(), nullable=False, comment='評価日'),
+        sa.Column('achievement_status', sa.String(length=50), nullable=False, comment='達成状況 (達成/一部達成/未達成/継続中)'),
+        sa.Column('achievement_details', sa.Text(), nullable=True, comment='達成状況詳細'),
+        sa.Column('goal_1_achievement', sa.String(length=50), nullable=True, comment='目標1達成度'),
+        sa.Column('goal_1_notes', sa.Text(), nullable=True, comment='目標1備考'),
+        sa.Column('goal_2_achievement', sa.String(length=50), nullable=True, comment='目標2達成度'),
+        sa.Column('goal_2_notes', sa.Text(), nullable=True, comment='目標2備考'),
+        sa.Column('goal_3_achievement', sa.String(length=50), nullable=True, comment='目標3達成度'),
+        sa.Column('goal_3_notes', sa.Text(), nullable=True, comment='目標3備考'),
+        sa.Column('overall_evaluation', sa.Text(), nullable=True, comment='総合評価'),
+        sa.Column('challenges', sa.Text(), nullable=True, comment='課題・問題点'),
+        sa.Column('next_actions', sa.Text(), nullable=True, comment='次期計画への提言'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='作成日時'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新日時'),
+        sa.ForeignKeyConstraint(['plan_id'], ['plans.id'], ),
+        sa.ForeignKeyConstraint(['staff_id'], ['staffs.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    _create_missing_indexes('plan_evaluations', [
+        ('ix_plan_evaluations_evaluation_date', ['evaluation_date']),
+        ('ix_plan_evaluations_id', ['id']),
+        ('ix_plan_evaluations_plan_id', ['plan_id']),
+        ('ix_plan_evaluations_user_id', ['user_id']),
+    ])
+
+    for table_name, column_name, column_type, comment in MISSING_COLUMNS:
+        if not _has_column(table_name, column_name):
+            op.add_column(table_name, sa.Column(column_name, column_type(), nullable=True, comment=comment))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 以前の create_all で作成されたテーブル・列と区別できないため、データを失わないよう何もしない
+    pass
@@ -0,0 +1,48 @@
+"""
+管理者用API
+
+スロークエリの記録の確認など、運用向けのエンドポイントを提供します。
+"""
+from fastapi import APIRouter, Depends, Query, status
+
+from app.models.staff import Staff
+from app.api.staffs import require_admin
+from app.schemas.slow_query import SlowQueryLogResponse
+from app.utils.slow_query_log import slow_query_log
+
+router = APIRouter()
+
+
+@router.get("/slow-queries", response_model=SlowQueryLogResponse)
+def list_slow_queries(
+    limit: int = Query(100, ge=1, le=1000),
+    admin: Staff = Depends(require_admin)
+):
+    """
+    スロークエリの記録を取得（管理者のみ）
+
+    記録はワーカープロセスごとに保持されます。
+
+    Args:
+        limit: 取得件数上限
+        admin: 管理者スタッフ
+
+    Returns:
+        SlowQueryLogResponse: しきい値と記録（新しい順）
+    """
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "max_entries": slow_query_log.max_entries,
+        "entries": slow_query_log.entries()[:limit],
+    }
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries(admin: Staff = Depends(require_admin)):
+    """
+    スロークエリの記録を削除（管理者のみ）
+
+    Args:
+        admin: 管理者スタッフ
+    """
+    slow_query_log.clear()
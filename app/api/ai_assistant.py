@@ -3,21 +3,38 @@ AI計画作成支援APIエンドポイント
 
 Ollama ローカルLLMを使用した計画作成支援機能のAPIを提供します。
 """
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from datetime import datetime, date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator
 from sqlalchemy.orm import Session
 from app.database.connection import get_db
-from app.services.ai_assistant_service import OllamaAIAssistantService
+from app.services.ai_job_queue import AIJobQueue
+from app.services.plan_renewal_service import PlanRenewalService
+from app.services.ai_context_loader import AIContextLoader, similar_case_query
+from app.models.ai_generation_job import AIGenerationJob
+from app.models.user import User
+from app.models.staff import Staff
+from app.api.auth import get_current_staff
 
 router = APIRouter(prefix="/ai", tags=["AI Assistant"])
 
 
+def _ai_service(db: Session, **kwargs):
+    """AI計画作成支援サービスを作成（ollamaは初回の利用時に読み込む）"""
+    from app.services.ai_assistant_service import OllamaAIAssistantService
+
+    return OllamaAIAssistantService(db, **kwargs)
+
+
 class PlanProposalRequest(BaseModel):
     """計画提案リクエスト"""
     user_id: int = Field(..., description="利用者ID")
     previous_plan_id: Optional[int] = Field(None, description="前回の計画ID(任意)")
     model: Optional[str] = Field("llama3", description="使用するOllamaモデル名")
+    force_regenerate: bool = Field(False, description="キャッシュを使わずに再生成する")
 
 
 class PlanProposalResponse(BaseModel):
@@ -25,10 +42,71 @@ class PlanProposalResponse(BaseModel):
     user_id: int
     generated_at: str
     model_used: str
+    cached: bool = False
     proposal: Dict[str, Any]
     data_sources: Dict[str, bool]
 
 
+class AIJobResponse(BaseModel):
+    """AI生成ジョブ状態レスポンス"""
+    job_id: int
+    job_type: str
+    status: str
+    user_id: Optional[int] = None
+    attempts: int
+    max_attempts: int
+    error_message: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class PlanRenewalBatchRequest(BaseModel):
+    """計画一括更新リクエスト"""
+    start_date: Optional[date] = Field(None, description="計画終了日の範囲（開始）。省略時は今日")
+    end_date: Optional[date] = Field(None, description="計画終了日の範囲（終了）。省略時は開始日の90日後")
+    staff_id: Optional[int] = Field(None, description="対象計画の作成者スタッフIDで絞り込み(任意)")
+    limit: Optional[int] = Field(None, ge=1, le=500, description="対象件数上限(任意)")
+    model: Optional[str] = Field("llama3", description="使用するOllamaモデル名")
+
+
+class PlanRenewalJob(BaseModel):
+    """計画一括更新で登録されたジョブ"""
+    job_id: int
+    previous_plan_id: int
+    user_id: int
+    end_date: date
+
+
+class PlanRenewalBatchResponse(BaseModel):
+    """計画一括更新レスポンス"""
+    start_date: date
+    end_date: date
+    total: int
+    jobs: List[PlanRenewalJob]
+
+
+class SimilarPlan(BaseModel):
+    """類似ケースの計画"""
+    plan_id: int
+    plan_number: Optional[str] = None
+    user_id: int
+    similarity: float
+    start_date: date
+    end_date: date
+    disability_characteristics: Optional[str] = None
+    long_term_goal: Optional[str] = None
+    short_term_goal: Optional[str] = None
+    overall_evaluation: Optional[str] = None
+
+
+class SimilarPlansResponse(BaseModel):
+    """類似ケース検索レスポンス"""
+    user_id: int
+    query: str
+    results: List[SimilarPlan]
+
+
 class ModelListResponse(BaseModel):
     """利用可能モデル一覧レスポンス"""
     models: List[Dict[str, Any]]
@@ -44,6 +122,7 @@ async def generate_plan_proposal(
 
     利用者の基本情報、障害特性、服薬情報、相談記録、前回計画の評価などを
     総合的に分析し、新しいサービス利用計画を提案します。
+    入力内容が同一の場合はキャッシュ済みの提案を返します（force_regenerate で再生成）。
 
     Args:
         request: 計画提案リクエスト
@@ -56,10 +135,11 @@ async def generate_plan_proposal(
         HTTPException: 利用者が見つからない、またはOllamaエラーの場合
     """
     try:
-        ai_service = OllamaAIAssistantService(db, model=request.model)
+        ai_service = _ai_service(db, model=request.model)
         result = ai_service.generate_plan_proposal(
             user_id=request.user_id,
-            previous_plan_id=request.previous_plan_id
+            previous_plan_id=request.previous_plan_id,
+            force_regenerate=request.force_regenerate
         )
         return result
     except ValueError as e:
@@ -68,6 +148,272 @@ async def generate_plan_proposal(
         raise HTTPException(status_code=500, detail=f"AI計画提案生成エラー: {str(e)}")
 
 
+@router.post("/plans/propose/stream")
+async def stream_plan_proposal(
+    request: PlanProposalRequest,
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """
+    AI計画提案をストリーミング生成 (Server-Sent Events)
+
+    Ollamaが出力したトークンを逐次転送し、【現在の状況】【長期目標】などの
+    セクション見出しを検出するたびに構造化イベントを送信します。
+    最後に /plans/propose と同じ形式の結果を done イベントで送信します。
+
+    Args:
+        request: 計画提案リクエスト
+        db: データベースセッション
+        current_staff: 現在のスタッフ
+
+    Returns:
+        StreamingResponse: text/event-stream
+
+    Raises:
+        HTTPException: 利用者が見つからない場合
+    """
+    try:
+        ai_service = _ai_service(db, model=request.model)
+        events = ai_service.stream_plan_proposal(
+            user_id=request.user_id,
+            previous_plan_id=request.previous_plan_id,
+            force_regenerate=request.force_regenerate
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"AI計画提案生成エラー: {str(e)}")
+
+    return StreamingResponse(
+        _to_sse(events),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # リバースプロキシのバッファリングを無効化
+        }
+    )
+
+
+def _to_sse(events: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """
+    イベントをServer-Sent Events形式に変換
+
+    Args:
+        events: イベント(dict)のイテレーター
+
+    Returns:
+        SSEメッセージ文字列のイテレーター
+    """
+    for event in events:
+        name = event.pop("event")
+        yield f"event: {name}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+@router.get("/plans/similar", response_model=SimilarPlansResponse)
+def get_similar_plans(
+    user_id: int = Query(..., description="利用者ID"),
+    plan_id: Optional[int] = Query(None, description="基準とする計画ID(任意)"),
+    top_k: int = Query(5, ge=1, le=50, description="取得件数"),
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """
+    障害特性・目標が近い他の利用者の計画を検索
+
+    利用者の障害特性・興味の偏りと、基準とする計画の長期目標・短期目標をもとに、
+    過去の計画（目標・総合評価を含む）をコサイン類似度の高い順に返します。
+    他の利用者の氏名は返しません。
+
+    初回の検索時は全計画のベクトル化を行うため、イベントループを止めないよう
+    同期関数（スレッドプールで実行）としています。
+
+    Args:
+        user_id: 利用者ID
+        plan_id: 基準とする計画ID(任意)
+        top_k: 取得件数
+        db: データベースセッション
+        current_staff: 現在のスタッフ
+
+    Returns:
+        類似ケースの一覧
+
+    Raises:
+        HTTPException: 利用者が見つからない場合
+    """
+    context = AIContextLoader(db, token_budget=0, similar_case_limit=0).load_one(user_id, plan_id)
+    if context is None:
+        raise HTTPException(status_code=404, detail=f"利用者ID {user_id} が見つかりません")
+
+    from app.services.similar_case_index import similar_case_index, load_cases  # numpyは初回の検索時に読み込む
+
+    query = similar_case_query(context)
+    similar_case_index.ensure_fresh(db)
+    matches = similar_case_index.search(query, top_k, exclude_user_id=user_id)
+    cases = load_cases(db, [match_plan_id for match_plan_id, _, _ in matches])
+
+    return {
+        "user_id": user_id,
+        "query": query,
+        "results": [
+            {**cases[match_plan_id], "similarity": round(similarity, 3)}
+            for match_plan_id, _, similarity in matches
+            if match_plan_id in cases
+        ]
+    }
+
+
+@router.post("/plans/propose/jobs", response_model=AIJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_plan_proposal_job(
+    request: PlanProposalRequest,
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """
+    AI計画提案をバックグラウンドジョブとして登録
+
+    生成はワーカーが非同期に実行します。返されたジョブIDで
+    /ai/jobs/{job_id} を参照して状態を確認し、完了後に
+    /ai/jobs/{job_id}/result から結果を取得してください。
+
+    Args:
+        request: 計画提案リクエスト
+        db: データベースセッション
+        current_staff: 現在のスタッフ
+
+    Returns:
+        登録されたジョブの状態
+
+    Raises:
+        HTTPException: 利用者が見つからない場合
+    """
+    user = db.query(User).filter(User.id == request.user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail=f"利用者ID {request.user_id} が見つかりません")
+
+    job = AIJobQueue(db).submit(
+        "plan_proposal",
+        params={
+            "user_id": request.user_id,
+            "previous_plan_id": request.previous_plan_id,
+            "model": request.model,
+            "force_regenerate": request.force_regenerate,
+        },
+        user_id=request.user_id
+    )
+    return _job_to_response(job)
+
+
+@router.post("/plans/renewals/batch", response_model=PlanRenewalBatchResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_plan_renewal_batch(
+    request: PlanRenewalBatchRequest,
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """
+    計画終了日が近い計画の更新計画案を一括生成
+
+    指定期間内に終了する計画を抽出し、コンテキストデータを一括取得した上で
+    計画ごとの生成ジョブを登録します。生成された計画案は「作成中」の計画として
+    保存されるため、内容を確認・編集してから承認してください。
+
+    Args:
+        request: 計画一括更新リクエスト
+        db: データベースセッション
+        current_staff: 現在のスタッフ（更新計画の作成者）
+
+    Returns:
+        登録されたジョブの一覧
+
+    Raises:
+        HTTPException: 期間の指定が不正な場合
+    """
+    start_date = request.start_date or date.today()
+    end_date = request.end_date or start_date + timedelta(days=90)
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="終了日は開始日以降を指定してください")
+
+    return PlanRenewalService(db).submit_renewal_batch(
+        start_date,
+        end_date,
+        staff_id=current_staff.id,
+        model=request.model,
+        filter_staff_id=request.staff_id,
+        limit=request.limit
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=AIJobResponse)
+async def get_job_status(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """
+    AI生成ジョブの状態を取得
+
+    Args:
+        job_id: ジョブID
+        db: データベースセッション
+        current_staff: 現在のスタッフ
+
+    Returns:
+        ジョブの状態
+
+    Raises:
+        HTTPException: ジョブが見つからない場合
+    """
+    job = AIJobQueue(db).get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="指定されたジョブが見つかりません")
+    return _job_to_response(job)
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+) -> Dict[str, Any]:
+    """
+    AI生成ジョブの結果を取得
+
+    Args:
+        job_id: ジョブID
+        db: データベースセッション
+        current_staff: 現在のスタッフ
+
+    Returns:
+        ジョブの実行結果（計画提案ジョブの場合は /plans/propose と同じ形式）
+
+    Raises:
+        HTTPException: ジョブが見つからない、未完了、または失敗した場合
+    """
+    job = AIJobQueue(db).get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="指定されたジョブが見つかりません")
+    if job.status == AIGenerationJob.STATUS_FAILED:
+        raise HTTPException(status_code=500, detail=f"AI生成ジョブが失敗しました: {job.error_message}")
+    if job.status != AIGenerationJob.STATUS_SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"ジョブはまだ完了していません（状態: {job.status}）")
+    return job.result
+
+
+def _job_to_response(job: AIGenerationJob) -> Dict[str, Any]:
+    """ジョブをレスポンス形式に変換"""
+    return {
+        "job_id": job.id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "user_id": job.user_id,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "error_message": job.error_message,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
 @router.get("/models/available", response_model=ModelListResponse)
 async def get_available_models(db: Session = Depends(get_db)):
     """
@@ -83,7 +429,7 @@ async def get_available_models(db: Session = Depends(get_db)):
         HTTPException: Ollamaサーバーエラーの場合
     """
     try:
-        ai_service = OllamaAIAssistantService(db)
+        ai_service = _ai_service(db)
         models = ai_service.get_available_models()
         return {"models": models}
     except Exception as e:
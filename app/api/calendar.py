@@ -0,0 +1,131 @@
+"""
+カレンダーAPI
+
+計画・モニタリング・手帳更新・障害支援区分有効期限の予定を
+期間ごとにまとめて提供します。
+"""
+from datetime import date, timedelta
+from typing import List, Optional
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+
+from app.database.connection import get_db
+from app.models.staff import Staff
+from app.schemas.calendar import CalendarEvent
+from app.api.auth import get_current_staff
+from app.services.calendar_service import CalendarService, EVENT_TYPES, to_icalendar
+
+router = APIRouter()
+
+# 一度に取得できる期間の上限（日数）
+MAX_WINDOW_DAYS = 366
+
+
+def _resolve_window(start_date: Optional[date], end_date: Optional[date]):
+    """
+    期間を確定（省略時は今日から30日間）
+
+    Raises:
+        HTTPException: 期間が不正、または長すぎる場合
+    """
+    start_date = start_date or date.today()
+    end_date = end_date or start_date + timedelta(days=30)
+
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="期間の開始日は終了日以前にしてください"
+        )
+    if (end_date - start_date).days >= MAX_WINDOW_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"期間は{MAX_WINDOW_DAYS}日以内で指定してください"
+        )
+    return start_date, end_date
+
+
+def _validate_event_types(event_types: Optional[List[str]]) -> Optional[List[str]]:
+    """
+    予定の種別を確認
+
+    Raises:
+        HTTPException: 未対応の種別が含まれる場合
+    """
+    if event_types:
+        unknown = [event_type for event_type in event_types if event_type not in EVENT_TYPES]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"未対応の予定の種別です: {', '.join(unknown)}"
+            )
+    return event_types
+
+
+@router.get("/events", response_model=List[CalendarEvent])
+def list_calendar_events(
+    start_date: Optional[date] = Query(None, description="期間の開始日（省略時は今日）"),
+    end_date: Optional[date] = Query(None, description="期間の終了日（省略時は開始日から30日後）"),
+    staff_id: Optional[int] = Query(None, description="担当スタッフIDでフィルタ"),
+    event_type: Optional[List[str]] = Query(None, description="予定の種別でフィルタ（複数指定可）"),
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """
+    期間内の予定一覧を取得
+
+    Args:
+        start_date: 期間の開始日
+        end_date: 期間の終了日
+        staff_id: 担当スタッフID
+        event_type: 予定の種別
+        db: データベースセッション
+        current_staff: 現在のスタッフ
+
+    Returns:
+        List[CalendarEvent]: 日付順の予定一覧
+    """
+    start_date, end_date = _resolve_window(start_date, end_date)
+    return CalendarService(db).get_events(
+        start_date, end_date, staff_id=staff_id, event_types=_validate_event_types(event_type)
+    )
+
+
+@router.get("/events.ics")
+def export_calendar_events(
+    start_date: Optional[date] = Query(None, description="期間の開始日（省略時は今日）"),
+    end_date: Optional[date] = Query(None, description="期間の終了日（省略時は開始日から30日後）"),
+    staff_id: Optional[int] = Query(None, description="担当スタッフIDでフィルタ"),
+    event_type: Optional[List[str]] = Query(None, description="予定の種別でフィルタ（複数指定可）"),
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """
+    期間内の予定をiCalendar形式でダウンロード
+
+    Args:
+        start_date: 期間の開始日
+        end_date: 期間の終了日
+        staff_id: 担当スタッフID
+        event_type: 予定の種別
+        db: データベースセッション
+        current_staff: 現在のスタッフ
+
+    Returns:
+        Response: iCalendar data
+    """
+    start_date, end_date = _resolve_window(start_date, end_date)
+    events = CalendarService(db).get_events(
+        start_date, end_date, staff_id=staff_id, event_types=_validate_event_types(event_type)
+    )
+
+    filename = f"予定_{start_date:%Y%m%d}-{end_date:%Y%m%d}.ics"
+    encoded_filename = quote(filename.encode('utf-8'))
+    return Response(
+        content=to_icalendar(events),
+        media_type="text/calendar; charset=utf-8",
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}"
+        }
+    )
@@ -16,7 +16,6 @@ from app.models.staff import Staff
 from app.schemas.consultation import ConsultationCreate, ConsultationUpdate, ConsultationResponse
 from app.api.auth import get_current_staff
 from app.utils.kana_converter import hiragana_to_katakana
-from app.services.pdf_service import PDFService
 
 router = APIRouter()
 
@@ -259,7 +258,9 @@ def download_consultation_pdf(
     user_name = user.name if user else f"利用者{consultation.user_id}"
 
     # PDF生成サービスを使用してPDF作成
-    pdf_service = PDFService()
+    from app.services.pdf_service import get_pdf_service  # ReportLabは初回のPDF出力時に読み込む
+
+    pdf_service = get_pdf_service()
     pdf_buffer = pdf_service.generate_consultation_pdf(consultation)
 
     # ファイル名を生成（日本語対応）
@@ -19,6 +19,8 @@ from app.models.notebook import Notebook
 from app.models.medication import Medication
 from app.models.prescribing_doctor import PrescribingDoctor
 from app.api.auth import get_current_staff
+from app.services.medication_registry_service import MedicationRegistryService
+from app.services.monitoring_schedule_service import MonitoringScheduleService
 
 router = APIRouter()
 
@@ -142,29 +144,14 @@ async def get_dashboard_stats(
     total_doctors = db.query(func.count(PrescribingDoctor.id)).scalar()
 
     # 処方医別利用者数（上位5件）
-    doctors_with_patient_count = db.query(
-        PrescribingDoctor.id,
-        PrescribingDoctor.name,
-        PrescribingDoctor.hospital_name,
-        func.count(func.distinct(Medication.user_id)).label('patient_count')
-    ).join(
-        Medication, Medication.prescribing_doctor_id == PrescribingDoctor.id
-    ).filter(
-        Medication.is_current == True
-    ).group_by(
-        PrescribingDoctor.id
-    ).order_by(
-        func.count(func.distinct(Medication.user_id)).desc()
-    ).limit(5).all()
-
     top_doctors = [
         {
-            "doctor_id": doc.id,
-            "doctor_name": doc.name,
-            "hospital_name": doc.hospital_name or "",
-            "patient_count": doc.patient_count
+            "doctor_id": doc["doctor_id"],
+            "doctor_name": doc["doctor_name"],
+            "hospital_name": doc["hospital_name"],
+            "patient_count": doc["patient_count"]
         }
-        for doc in doctors_with_patient_count
+        for doc in MedicationRegistryService(db).doctor_patient_counts(limit=5)["items"]
     ]
 
     return {
@@ -225,23 +212,19 @@ async def get_alerts(
         for plan in plans_expiring_soon
     ]
 
-    # モニタリング期限超過
-    monitorings_overdue = db.query(Monitoring).join(User).filter(
-        Monitoring.is_deleted == False,
-        User.is_deleted == False,
-        Monitoring.monitoring_date < today
-    ).all()
+    # モニタリング期限超過（モニタリング予定の予定日が過ぎたもの）
+    monitorings_overdue = MonitoringScheduleService(db).overdue(today=today)
 
     monitoring_alerts = [
         {
-            "monitoring_id": mon.id,
-            "user_id": mon.user_id,
-            "user_name": mon.user.name,
-            "monitoring_date": mon.monitoring_date.isoformat(),
-            "days_overdue": (today - mon.monitoring_date).days,
+            "monitoring_id": schedule["last_monitoring_id"],
+            "user_id": schedule["user_id"],
+            "user_name": schedule["user_name"],
+            "monitoring_date": schedule["due_date"].isoformat(),
+            "days_overdue": -schedule["days_remaining"],
             "type": "monitoring_overdue"
         }
-        for mon in monitorings_overdue
+        for schedule in monitorings_overdue
     ]
 
     # 手帳更新期限が近い（3ヶ月以内）
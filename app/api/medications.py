@@ -1,10 +1,13 @@
 """服薬情報API"""
+from datetime import date
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import insert
 from sqlalchemy.orm import Session, joinedload
 
 from app.database.connection import get_db
 from app.models.medication import Medication
+from app.models.medication_change import MedicationChange
 from app.models.prescribing_doctor import PrescribingDoctor
 from app.models.user import User
 from app.models.staff import Staff
@@ -12,12 +15,30 @@ from app.schemas.medication import (
     Medication as MedicationSchema,
     MedicationCreate,
     MedicationUpdate,
-    MedicationWithDoctor
+    MedicationWithDoctor,
+    InteractionFinding,
+    InteractionScanResponse,
+    MedicationTimeline,
+    DrugUserList,
+    DoctorPatientList,
+    PolypharmacyList,
+    MedicationReconcileRequest,
+    MedicationReconcileResponse
 )
 from app.api.auth import get_current_staff
+from app.services.drug_interaction_service import DrugInteractionService, get_interaction_checker
+from app.services.medication_timeline_service import MedicationTimelineService
+from app.services.medication_registry_service import MedicationRegistryService
+from app.services.drug_dictionary import normalize_drug_text
 
 router = APIRouter(prefix="/medications", tags=["medications"])
 
+# 一括照合で比較する項目
+RECONCILE_FIELDS = (
+    'medication_name', 'generic_name', 'dosage', 'frequency', 'timing',
+    'start_date', 'purpose', 'notes', 'prescribing_doctor_id'
+)
+
 
 @router.get("", response_model=List[MedicationWithDoctor])
 def list_medications(
@@ -52,6 +73,111 @@ def list_medications(
     return result
 
 
+@router.get("/interactions", response_model=List[InteractionFinding])
+def check_interactions(
+    user_id: int = Query(..., description="利用者ID"),
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """
+    利用者の服用中の薬の飲み合わせチェック
+
+    相互作用・同種同効薬の重複・同一成分の重複を、重要度の高い順に返します。
+    チェック結果は参考情報です。判断は必ず医師・薬剤師に確認してください。
+    """
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="利用者が見つかりません"
+        )
+
+    return DrugInteractionService(db).check_user(user_id)
+
+
+@router.get("/interactions/scan", response_model=InteractionScanResponse)
+def scan_interactions(
+    staff_id: Optional[int] = Query(None, description="担当スタッフIDで絞り込み"),
+    min_severity: Optional[str] = Query(None, pattern="^(高|中|低)$", description="この重要度以上のみ"),
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """
+    利用者全体の飲み合わせ一括チェック
+
+    服用中の薬を一括で取得してチェックし、指摘のあった利用者を重要度の高い順に返します。
+    """
+    return DrugInteractionService(db).scan_caseload(staff_id=staff_id, min_severity=min_severity)
+
+
+@router.get("/timeline", response_model=MedicationTimeline, response_model_by_alias=True)
+def get_medication_timeline(
+    user_id: int = Query(..., description="利用者ID"),
+    start_date: Optional[date] = Query(None, description="期間の開始日"),
+    end_date: Optional[date] = Query(None, description="期間の終了日"),
+    limit: int = Query(500, ge=1, le=2000, description="取得する履歴行数の上限（新しい方から）"),
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """
+    利用者の服薬タイムライン取得
+
+    服薬の開始・終了と変更履歴を日付順にまとめて返します。
+    同じ日の同じ薬の変更は1件のイベントにまとめ、項目ごとの差分で表します。
+    履歴が上限を超える場合は新しい方から返し、truncated と next_end_date で
+    古い履歴があることと、続きを取得する際の end_date を返します。
+    """
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="利用者が見つかりません"
+        )
+
+    if start_date and end_date and end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="終了日は開始日以降を指定してください"
+        )
+
+    return MedicationTimelineService(db).get_timeline(user_id, start_date, end_date, limit)
+
+
+@router.get("/registry/users", response_model=DrugUserList)
+def list_users_on_drug(
+    drug: str = Query(..., min_length=1, description="薬品名・一般名の検索キーワード"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """指定した薬を服用中の利用者一覧取得"""
+    return MedicationRegistryService(db).users_on_drug(drug, skip=skip, limit=limit)
+
+
+@router.get("/registry/doctors", response_model=DoctorPatientList)
+def list_doctor_patient_counts(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """処方医ごとの患者数一覧取得（患者数の多い順）"""
+    return MedicationRegistryService(db).doctor_patient_counts(skip=skip, limit=limit)
+
+
+@router.get("/registry/polypharmacy", response_model=PolypharmacyList)
+def list_polypharmacy_users(
+    min_count: int = Query(5, ge=2, description="服用中の薬の数の下限"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """服用中の薬が指定数以上の利用者一覧取得（多剤服用）"""
+    return MedicationRegistryService(db).users_with_many_medications(min_count=min_count, skip=skip, limit=limit)
+
+
 @router.get("/{medication_id}", response_model=MedicationWithDoctor)
 def get_medication(
     medication_id: int,
@@ -111,6 +237,220 @@ def create_medication(
     return medication
 
 
+@router.post("/reconcile", response_model=MedicationReconcileResponse, response_model_by_alias=True)
+def reconcile_medications(
+    request: MedicationReconcileRequest,
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """
+    服薬情報の一括照合
+
+    退院時などの新しい処方内容（服用中の薬すべて）を現在の服用中の薬と照合し、
+    新規・変更・中止をまとめて1回のトランザクションで反映します。
+    既存の薬との対応は、medication_id、薬品名、一般名の順に照合します。
+    変更履歴はまとめて登録します。dry_run の場合は差分のみ返します。
+    """
+    user = db.query(User).filter(User.id == request.user_id).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="利用者が見つかりません"
+        )
+
+    # 処方医の存在確認（指定されているものをまとめて確認）
+    doctor_ids = {item.prescribing_doctor_id for item in request.medications if item.prescribing_doctor_id}
+    if doctor_ids:
+        found = {
+            doctor_id for (doctor_id,) in db.query(PrescribingDoctor.id).filter(
+                PrescribingDoctor.id.in_(doctor_ids)
+            ).all()
+        }
+        if found != doctor_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="処方医が見つかりません"
+            )
+
+    current = db.query(Medication).filter(
+        Medication.user_id == request.user_id,
+        Medication.is_current == True
+    ).order_by(Medication.id).all()
+
+    matches, unmatched_items = _match_reconcile_items(request.medications, current)
+    if matches is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="指定された服薬情報IDが利用者の服用中の薬にありません"
+        )
+
+    change_date = request.change_date or date.today()
+    change_rows = []
+    added, changed, stopped = [], [], []
+    unchanged = 0
+
+    # 変更
+    for item, medication in matches:
+        diffs = []
+        for field in RECONCILE_FIELDS:
+            if field not in item.model_fields_set:
+                continue
+            old_value, new_value = getattr(medication, field), getattr(item, field)
+            if field == 'medication_name' and normalize_drug_text(old_value) == normalize_drug_text(new_value):
+                continue
+            if old_value != new_value:
+                diffs.append((field, old_value, new_value))
+
+        if not diffs:
+            unchanged += 1
+            continue
+
+        for field, old_value, new_value in diffs:
+            change_rows.append(_change_row(medication.id, change_date, field, old_value, new_value, request.reason))
+            if not request.dry_run:
+                setattr(medication, field, new_value)
+        changed.append({
+            "medication_id": medication.id,
+            "medication_name": medication.medication_name,
+            "changes": [
+                {"field": _get_field_label(field), "from": _to_history_value(old), "to": _to_history_value(new)}
+                for field, old, new in diffs
+            ]
+        })
+
+    # 中止（新しい処方内容にない服用中の薬）
+    matched_ids = {medication.id for _, medication in matches}
+    for medication in current:
+        if medication.id in matched_ids:
+            continue
+        change_rows.append(_change_row(medication.id, change_date, 'end_date', medication.end_date, change_date, request.reason))
+        change_rows.append(_change_row(medication.id, change_date, 'is_current', True, False, request.reason))
+        if not request.dry_run:
+            medication.is_current = False
+            medication.end_date = change_date
+        stopped.append({"medication_id": medication.id, "medication_name": medication.medication_name})
+
+    # 新規
+    new_medications = []
+    for item in unmatched_items:
+        data = item.model_dump(exclude={'medication_id', 'is_current', 'end_date'})
+        if data.get('start_date') is None:
+            data['start_date'] = change_date
+        medication = Medication(user_id=request.user_id, is_current=True, **data)
+        new_medications.append(medication)
+        added.append(medication)
+
+    if request.dry_run:
+        return {
+            "user_id": request.user_id,
+            "applied": False,
+            "added": [{"medication_id": None, "medication_name": med.medication_name} for med in added],
+            "changed": changed,
+            "stopped": stopped,
+            "unchanged": unchanged
+        }
+
+    try:
+        db.add_all(new_medications)
+        db.flush()
+        for medication in new_medications:
+            change_rows.append({
+                "medication_id": medication.id,
+                "change_date": change_date,
+                "change_type": "追加",
+                "previous_value": None,
+                "new_value": " ".join(
+                    value for value in (medication.medication_name, medication.dosage, medication.frequency) if value
+                ),
+                "reason": request.reason,
+                "notes": "一括照合による追加",
+            })
+        if change_rows:
+            db.execute(insert(MedicationChange), change_rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {
+        "user_id": request.user_id,
+        "applied": True,
+        "added": [{"medication_id": med.id, "medication_name": med.medication_name} for med in added],
+        "changed": changed,
+        "stopped": stopped,
+        "unchanged": unchanged
+    }
+
+
+def _match_reconcile_items(items, current):
+    """
+    新しい処方内容と服用中の薬を対応付ける
+
+    medication_id、正規化した薬品名、一般名の順に照合し、
+    各服用中の薬は1回だけ対応付けます。
+
+    Returns:
+        (対応付いた (item, 服用中の薬) のリスト, 対応のない item のリスト)
+        medication_id が服用中の薬にない場合は (None, None)
+    """
+    by_id = {medication.id: medication for medication in current}
+    remaining = dict(by_id)
+    matches = []
+    pending = []
+
+    for item in items:
+        if item.medication_id is not None:
+            medication = remaining.pop(item.medication_id, None)
+            if medication is None:
+                return None, None
+            matches.append((item, medication))
+        else:
+            pending.append(item)
+
+    checker = get_interaction_checker()
+    key_functions = (
+        lambda name, generic: normalize_drug_text(name),
+        lambda name, generic: checker.drug_key(name, generic),
+    )
+    for key_function in key_functions:
+        unmatched = []
+        for item in pending:
+            key = key_function(item.medication_name, item.generic_name)
+            medication = next(
+                (
+                    med for med in remaining.values()
+                    if key_function(med.medication_name, med.generic_name) == key
+                ),
+                None
+            )
+            if medication is None:
+                unmatched.append(item)
+            else:
+                del remaining[medication.id]
+                matches.append((item, medication))
+        pending = unmatched
+
+    return matches, pending
+
+
+def _change_row(medication_id: int, change_date: date, field: str, old_value, new_value, reason: Optional[str]) -> dict:
+    """変更履歴の登録内容を作成（update_medication と同じ形式）"""
+    return {
+        "medication_id": medication_id,
+        "change_date": change_date,
+        "change_type": _get_change_type(field),
+        "previous_value": _to_history_value(old_value),
+        "new_value": _to_history_value(new_value),
+        "reason": reason,
+        "notes": f"{_get_field_label(field)}の変更",
+    }
+
+
+def _to_history_value(value) -> Optional[str]:
+    """変更履歴に記録する値（文字列）に変換"""
+    return str(value) if value is not None else None
+
+
 @router.put("/{medication_id}", response_model=MedicationSchema)
 def update_medication(
     medication_id: int,
@@ -119,7 +459,6 @@ def update_medication(
     current_staff: Staff = Depends(get_current_staff)
 ):
     """服薬情報更新"""
-    from app.models.medication_change import MedicationChange
     from datetime import date
 
     medication = db.query(Medication).filter(Medication.id == medication_id).first()
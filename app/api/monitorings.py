@@ -3,6 +3,7 @@
 
 モニタリング記録のCRUD操作を提供します。
 """
+from datetime import date
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import StreamingResponse
@@ -14,13 +15,25 @@ from app.models.monitoring import Monitoring
 from app.models.plan import Plan
 from app.models.user import User
 from app.models.staff import Staff
-from app.schemas.monitoring import MonitoringCreate, MonitoringUpdate, MonitoringResponse
+from app.schemas.monitoring import (
+    MonitoringCreate,
+    MonitoringUpdate,
+    MonitoringResponse,
+    MonitoringScheduleItem,
+    MonitoringCalendar,
+    MonitoringScheduleRefreshResult
+)
 from app.api.auth import get_current_staff
+from app.api.staffs import require_admin
+from app.services.monitoring_schedule_service import MonitoringScheduleService
 from app.utils.kana_converter import hiragana_to_katakana
-from app.services.pdf_service import PDFService
+from app.utils.fast_json import ListProjection
 
 router = APIRouter()
 
+# 一覧の列指定（ORMオブジェクトを生成せずにレスポンスを作成する）
+MONITORING_LIST_PROJECTION = ListProjection(Monitoring, MonitoringResponse)
+
 
 @router.get("", response_model=List[MonitoringResponse])
 def list_monitorings(
@@ -96,8 +109,7 @@ def list_monitorings(
     # 実施日降順でソート
     query = query.order_by(Monitoring.monitoring_date.desc())
 
-    monitorings = query.offset(skip).limit(limit).all()
-    return monitorings
+    return MONITORING_LIST_PROJECTION.response(query.offset(skip).limit(limit))
 
 
 @router.post("", response_model=MonitoringResponse, status_code=status.HTTP_201_CREATED)
@@ -136,12 +148,95 @@ def create_monitoring(
     # モニタリング記録作成
     monitoring = Monitoring(**monitoring_in.dict())
     db.add(monitoring)
+    MonitoringScheduleService(db).refresh_user(monitoring.user_id, commit=False)
     db.commit()
     db.refresh(monitoring)
 
     return monitoring
 
 
+@router.get("/schedule/due", response_model=List[MonitoringScheduleItem])
+def list_due_monitorings(
+    staff_id: Optional[int] = Query(None, description="担当スタッフIDでフィルタ"),
+    start_date: Optional[date] = Query(None, description="期間の開始日（省略時は今週の月曜日）"),
+    end_date: Optional[date] = Query(None, description="期間の終了日（省略時は今週の日曜日）"),
+    include_overdue: bool = Query(True, description="期間より前の期限超過分を含む"),
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """
+    期限が近いモニタリング予定を取得
+
+    期間を省略した場合は今週（月曜〜日曜）が予定日のものを返します。
+
+    Args:
+        staff_id: 担当スタッフID
+        start_date: 期間の開始日
+        end_date: 期間の終了日
+        include_overdue: 期限超過分を含むか
+        db: データベースセッション
+        current_staff: 現在のスタッフ
+
+    Returns:
+        List[MonitoringScheduleItem]: 予定日順のモニタリング予定
+    """
+    service = MonitoringScheduleService(db)
+    if start_date is None and end_date is None:
+        return service.due_this_week(staff_id=staff_id, include_overdue=include_overdue)
+
+    if start_date is None or end_date is None or start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="期間の開始日と終了日を正しく指定してください"
+        )
+
+    return service.due_between(None if include_overdue else start_date, end_date, staff_id=staff_id)
+
+
+@router.get("/schedule/calendar", response_model=MonitoringCalendar)
+def get_monitoring_calendar(
+    year: int = Query(..., ge=2000, le=2100, description="年"),
+    month: int = Query(..., ge=1, le=12, description="月"),
+    staff_id: Optional[int] = Query(None, description="担当スタッフIDでフィルタ"),
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """
+    月間のモニタリング予定カレンダーを取得
+
+    Args:
+        year: 年
+        month: 月
+        staff_id: 担当スタッフID
+        db: データベースセッション
+        current_staff: 現在のスタッフ
+
+    Returns:
+        MonitoringCalendar: 月の各日の予定一覧
+    """
+    return MonitoringScheduleService(db).month_calendar(year, month, staff_id=staff_id)
+
+
+@router.post("/schedule/refresh", response_model=MonitoringScheduleRefreshResult)
+def refresh_monitoring_schedule(
+    db: Session = Depends(get_db),
+    admin: Staff = Depends(require_admin)
+):
+    """
+    全利用者のモニタリング予定を再計算（管理者のみ）
+
+    通常は記録・計画の更新時に自動で再計算されます。データ移行後などに使用します。
+
+    Args:
+        db: データベースセッション
+        admin: 管理者スタッフ
+
+    Returns:
+        MonitoringScheduleRefreshResult: 登録・更新・削除の件数
+    """
+    return MonitoringScheduleService(db).refresh()
+
+
 @router.get("/{monitoring_id}", response_model=MonitoringResponse)
 def get_monitoring(
     monitoring_id: int,
@@ -202,10 +297,12 @@ def update_monitoring(
         )
 
     # 更新
+    previous_user_id = monitoring.user_id
     update_data = monitoring_in.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(monitoring, field, value)
 
+    MonitoringScheduleService(db).refresh([previous_user_id, monitoring.user_id], commit=False)
     db.commit()
     db.refresh(monitoring)
 
@@ -238,6 +335,7 @@ def delete_monitoring(
 
     # 論理削除
     monitoring.is_deleted = True
+    MonitoringScheduleService(db).refresh_user(monitoring.user_id, commit=False)
     db.commit()
 
 
@@ -350,7 +448,9 @@ def download_monitoring_pdf(
     user_name = user.name if user else f"利用者{monitoring.user_id}"
 
     # PDF生成サービスを使用してPDF作成
-    pdf_service = PDFService()
+    from app.services.pdf_service import get_pdf_service  # ReportLabは初回のPDF出力時に読み込む
+
+    pdf_service = get_pdf_service()
     pdf_buffer = pdf_service.generate_monitoring_pdf(monitoring)
 
     # ファイル名を生成（日本語対応）
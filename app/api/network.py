@@ -7,15 +7,13 @@ from typing import List, Dict, Any
 from urllib.parse import quote
 from fastapi import APIRouter, Depends, HTTPException, status, Body
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload, joinedload
 
 from app.database.connection import get_db
 from app.models.user import User
 from app.models.staff import Staff
 from app.models.user_organization import UserOrganization
-from app.models.organization import Organization
 from app.api.auth import get_current_staff
-from app.services.pdf_service import PDFService
 
 router = APIRouter()
 
@@ -40,14 +38,33 @@ async def get_user_network(
     Raises:
         HTTPException: 利用者が見つからない
     """
-    # 利用者の存在確認
-    user = db.query(User).filter(User.id == user_id).first()
+    # 利用者の存在確認（関係機関・担当スタッフはまとめて取得）
+    user = db.query(User).options(
+        selectinload(User.user_organizations).joinedload(UserOrganization.organization),
+        joinedload(User.assigned_staff)
+    ).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="利用者が見つかりません"
         )
 
+    return build_user_network(user)
+
+
+def build_user_network(user: User) -> Dict[str, Any]:
+    """
+    利用者のネットワークデータを作成
+
+    利用者の関係機関（user_organizations.organization）と担当スタッフは
+    事前に読み込んでおくことを想定しています。
+
+    Args:
+        user: 利用者
+
+    Returns:
+        Dict[str, Any]: ノードとエッジのネットワークデータ
+    """
     # 利用者ノード
     nodes = [
         {
@@ -64,19 +81,13 @@ async def get_user_network(
 
     edges = []
 
-    # 関係機関を取得
-    user_orgs = db.query(UserOrganization).filter(
-        UserOrganization.user_id == user_id,
-        UserOrganization.is_deleted == False
-    ).all()
+    # 関係機関
+    user_orgs = [user_org for user_org in user.user_organizations if not user_org.is_deleted]
 
     for user_org in user_orgs:
-        org = db.query(Organization).filter(
-            Organization.id == user_org.organization_id,
-            Organization.is_deleted == False
-        ).first()
+        org = user_org.organization
 
-        if org:
+        if org and not org.is_deleted:
             # 組織ノードを追加
             node_id = f"org_{org.id}"
 
@@ -150,7 +161,7 @@ async def get_user_network(
     return {
         "nodes": nodes,
         "edges": edges,
-        "user_id": user_id,
+        "user_id": user.id,
         "user_name": user.name
     }
 
@@ -224,7 +235,9 @@ async def download_network_pdf(
         )
 
     # PDF生成サービスを使用してPDF作成
-    pdf_service = PDFService()
+    from app.services.pdf_service import get_pdf_service  # ReportLabは初回のPDF出力時に読み込む
+
+    pdf_service = get_pdf_service()
     pdf_buffer = pdf_service.generate_network_pdf(image_data, user.name)
 
     # ファイル名を生成（日本語対応・URLエンコード）
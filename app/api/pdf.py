@@ -13,11 +13,16 @@ from app.models.plan import Plan
 from app.models.monitoring import Monitoring
 from app.models.medication import Medication
 from app.models.staff import Staff
-from app.services.pdf_service import PDFService
 from app.api.auth import get_current_staff
 
 router = APIRouter()
-pdf_service = PDFService()
+
+
+def _pdf_service():
+    """PDF生成サービスを取得（ReportLabは初回のPDF出力時に読み込む）"""
+    from app.services.pdf_service import get_pdf_service
+
+    return get_pdf_service()
 
 
 @router.get("/users/{user_id}")
@@ -44,7 +49,7 @@ def generate_user_pdf(
             detail="指定された利用者が見つかりません"
         )
 
-    pdf_buffer = pdf_service.generate_user_profile_pdf(user)
+    pdf_buffer = _pdf_service().generate_user_profile_pdf(user)
 
     return StreamingResponse(
         pdf_buffer,
@@ -79,7 +84,7 @@ def generate_plan_pdf(
             detail="指定された計画が見つかりません"
         )
 
-    pdf_buffer = pdf_service.generate_plan_pdf(plan)
+    pdf_buffer = _pdf_service().generate_plan_pdf(plan)
 
     return StreamingResponse(
         pdf_buffer,
@@ -117,7 +122,7 @@ def generate_monitoring_pdf(
             detail="指定されたモニタリング記録が見つかりません"
         )
 
-    pdf_buffer = pdf_service.generate_monitoring_pdf(monitoring)
+    pdf_buffer = _pdf_service().generate_monitoring_pdf(monitoring)
 
     return StreamingResponse(
         pdf_buffer,
@@ -155,7 +160,7 @@ def generate_medications_pdf(
     # 利用者の服薬情報を取得
     medications = db.query(Medication).filter(Medication.user_id == user_id).order_by(Medication.is_current.desc(), Medication.start_date.desc()).all()
 
-    pdf_buffer = pdf_service.generate_medications_pdf(user, medications)
+    pdf_buffer = _pdf_service().generate_medications_pdf(user, medications)
 
     return StreamingResponse(
         pdf_buffer,
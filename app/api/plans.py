@@ -16,10 +16,15 @@ from app.models.staff import Staff
 from app.schemas.plan import PlanCreate, PlanUpdate, PlanResponse, PlanApprove
 from app.api.auth import get_current_staff
 from app.utils.kana_converter import hiragana_to_katakana
-from app.services.pdf_service import PDFService
+from app.services.monitoring_schedule_service import MonitoringScheduleService
+from app.services.form_options import invalidate_form_options
+from app.utils.fast_json import ListProjection
 
 router = APIRouter()
 
+# 一覧の列指定（ORMオブジェクトを生成せずにレスポンスを作成する）
+PLAN_LIST_PROJECTION = ListProjection(Plan, PlanResponse)
+
 
 @router.get("", response_model=List[PlanResponse])
 def list_plans(
@@ -91,8 +96,7 @@ def list_plans(
     # 作成日降順でソート
     query = query.order_by(Plan.created_date.desc())
 
-    plans = query.offset(skip).limit(limit).all()
-    return plans
+    return PLAN_LIST_PROJECTION.response(query.offset(skip).limit(limit))
 
 
 @router.post("", response_model=PlanResponse, status_code=status.HTTP_201_CREATED)
@@ -131,7 +135,9 @@ def create_plan(
     # 計画作成
     plan = Plan(**plan_in.dict())
     db.add(plan)
+    MonitoringScheduleService(db).refresh_user(plan.user_id, commit=False)
     db.commit()
+    invalidate_form_options()
     db.refresh(plan)
 
     return plan
@@ -198,11 +204,14 @@ def update_plan(
         )
 
     # 更新
+    previous_user_id = plan.user_id
     update_data = plan_in.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(plan, field, value)
 
+    MonitoringScheduleService(db).refresh([previous_user_id, plan.user_id], commit=False)
     db.commit()
+    invalidate_form_options()
     db.refresh(plan)
 
     return plan
@@ -231,7 +240,9 @@ def delete_plan(
 
     # 論理削除
     plan.is_deleted = True
+    MonitoringScheduleService(db).refresh_user(plan.user_id, commit=False)
     db.commit()
+    invalidate_form_options()
 
 
 @router.get("/users/{user_id}/plans", response_model=List[PlanResponse])
@@ -301,6 +312,7 @@ def approve_plan(
     plan.approval_status = approve_in.approval_status
     plan.approval_date = approve_in.approval_date
 
+    MonitoringScheduleService(db).refresh_user(plan.user_id, commit=False)
     db.commit()
     db.refresh(plan)
 
@@ -339,7 +351,9 @@ def download_plan_pdf(
     user_name = user.name if user else f"利用者{plan.user_id}"
 
     # PDF生成サービスを使用してPDF作成
-    pdf_service = PDFService()
+    from app.services.pdf_service import get_pdf_service  # ReportLabは初回のPDF出力時に読み込む
+
+    pdf_service = get_pdf_service()
     pdf_buffer = pdf_service.generate_plan_pdf(plan)
 
     # ファイル名を生成（日本語対応）
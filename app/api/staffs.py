@@ -14,6 +14,7 @@ from app.schemas.staff import StaffCreate, StaffUpdate, StaffResponse, StaffPass
 from app.utils.auth import get_password_hash, verify_password
 from app.api.auth import get_current_staff
 from app.utils.kana_converter import hiragana_to_katakana
+from app.services.form_options import invalidate_form_options
 
 router = APIRouter()
 
@@ -138,6 +139,7 @@ def create_staff(
 
     db.add(new_staff)
     db.commit()
+    invalidate_form_options()
     db.refresh(new_staff)
 
     return new_staff
@@ -230,6 +232,7 @@ def update_staff(
         setattr(staff, field, value)
 
     db.commit()
+    invalidate_form_options()
     db.refresh(staff)
 
     return staff
@@ -267,6 +270,7 @@ def delete_staff(
 
     db.delete(staff)
     db.commit()
+    invalidate_form_options()
 
 
 @router.post("/{staff_id}/change-password")
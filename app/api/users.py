@@ -17,12 +17,20 @@ from app.models.staff import Staff
 from app.models.notebook import Notebook
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserListResponse
 from app.schemas.notebook import NotebookResponse
+from app.schemas.case_summary import CaseSummary
 from app.api.auth import get_current_staff
 from app.utils.kana_converter import hiragana_to_katakana
-from app.services.pdf_service import PDFService
+from app.services.monitoring_schedule_service import MonitoringScheduleService
+from app.services.case_summary_service import CaseSummaryService
+from app.services.form_options import invalidate_form_options
+from app.api.network import build_user_network
+from app.utils.fast_json import FastJSONResponse, ListProjection
 
 router = APIRouter()
 
+# 一覧の列指定（ORMオブジェクトを生成せずにレスポンスを作成する）
+USER_LIST_PROJECTION = ListProjection(User, UserListResponse)
+
 
 @router.get("", response_model=List[UserListResponse])
 def list_users(
@@ -132,13 +140,14 @@ def list_users(
             query = query.order_by(User.id.asc())
 
     # 年齢フィルタは取得後に適用（計算プロパティのため）
-    users = query.offset(skip).limit(limit * 2).all()  # 年齢フィルタのため多めに取得
+    rows = USER_LIST_PROJECTION.apply(query).offset(skip).limit(limit * 2).all()  # 年齢フィルタのため多めに取得
+    users = USER_LIST_PROJECTION.to_dicts(rows)
 
     # 年齢フィルタリング
     if min_age is not None or max_age is not None:
         filtered_users = []
         for user in users:
-            age = user.age
+            age = user["age"]
             if age is None:
                 continue
             if min_age is not None and age < min_age:
@@ -150,7 +159,7 @@ def list_users(
     else:
         users = users[:limit]
 
-    return users
+    return FastJSONResponse(users)
 
 
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -185,6 +194,7 @@ def create_user(
     new_user = User(**user_data.model_dump())
     db.add(new_user)
     db.commit()
+    invalidate_form_options()
     db.refresh(new_user)
 
     return new_user
@@ -219,6 +229,42 @@ def get_user(
     return user
 
 
+@router.get("/{user_id}/summary", response_model=CaseSummary)
+def get_user_summary(
+    user_id: int,
+    recent_limit: int = Query(10, ge=1, le=100, description="相談記録・モニタリング記録の件数"),
+    db: Session = Depends(get_db),
+    current_staff: Staff = Depends(get_current_staff)
+):
+    """
+    利用者のケースサマリーを取得
+
+    利用者詳細画面に必要な情報（基本情報・手帳・服薬・相談記録・計画・
+    モニタリング・関係機関）を1回のリクエストでまとめて返します。
+
+    Args:
+        user_id: 利用者ID
+        recent_limit: 相談記録・モニタリング記録の件数（最新のもの）
+        db: データベースセッション
+        current_staff: 現在のスタッフ
+
+    Returns:
+        CaseSummary: ケースサマリー
+
+    Raises:
+        HTTPException: 利用者が見つからない
+    """
+    summary = CaseSummaryService(db).get_summary(user_id, recent_limit=recent_limit)
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="利用者が見つかりません"
+        )
+
+    summary["network"] = build_user_network(summary["user"])
+    return summary
+
+
 @router.put("/{user_id}", response_model=UserResponse)
 def update_user(
     user_id: int,
@@ -262,7 +308,12 @@ def update_user(
     for field, value in update_data.items():
         setattr(user, field, value)
 
+    # 担当スタッフの変更をモニタリング予定に反映
+    if "assigned_staff_id" in update_data:
+        MonitoringScheduleService(db).refresh_user(user.id, commit=False)
+
     db.commit()
+    invalidate_form_options()
     db.refresh(user)
 
     return user
@@ -293,7 +344,9 @@ def delete_user(
         )
 
     user.is_deleted = True
+    MonitoringScheduleService(db).refresh_user(user.id, commit=False)
     db.commit()
+    invalidate_form_options()
 
 
 @router.get("/{user_id}/notebooks", response_model=List[NotebookResponse])
@@ -359,7 +412,9 @@ def download_user_pdf(
         )
 
     # PDF生成サービスを使用してPDF作成
-    pdf_service = PDFService()
+    from app.services.pdf_service import get_pdf_service  # ReportLabは初回のPDF出力時に読み込む
+
+    pdf_service = get_pdf_service()
     pdf_buffer = pdf_service.generate_user_profile_pdf(user)
 
     # ファイル名を生成（日本語対応）
@@ -374,6 +429,67 @@ def download_user_pdf(
     )
 
 
+# 利用者CSVのヘッダー行
+USER_CSV_HEADER = [
+    "ID",
+    "氏名",
+    "氏名（カナ）",
+    "生年月日",
+    "年齢",
+    "性別",
+    "郵便番号",
+    "住所",
+    "電話番号",
+    "メールアドレス",
+    "緊急連絡先氏名",
+    "緊急連絡先電話番号",
+    "障害支援区分",
+    "障害支援区分認定日",
+    "障害支援区分有効期限",
+    "後見人種別",
+    "後見人氏名",
+    "後見人連絡先",
+    "担当スタッフ",
+    "作成日時",
+    "更新日時"
+]
+
+
+def user_csv_row(user: User) -> list:
+    """
+    利用者CSVの1行を作成
+
+    Args:
+        user: 利用者（assigned_staff を参照）
+
+    Returns:
+        USER_CSV_HEADER の順の値
+    """
+    return [
+        user.id,
+        user.name or "",
+        user.name_kana or "",
+        user.birth_date.strftime("%Y-%m-%d") if user.birth_date else "",
+        user.age if user.age is not None else "",
+        user.gender or "",
+        user.postal_code or "",
+        user.address or "",
+        user.phone or "",
+        user.email or "",
+        user.emergency_contact_name or "",
+        user.emergency_contact_phone or "",
+        f"区分{user.disability_support_level}" if user.disability_support_level else "",
+        user.disability_support_certified_date.strftime("%Y-%m-%d") if user.disability_support_certified_date else "",
+        user.disability_support_expiry_date.strftime("%Y-%m-%d") if user.disability_support_expiry_date else "",
+        user.guardian_type or "",
+        user.guardian_name or "",
+        user.guardian_contact or "",
+        user.assigned_staff.name if user.assigned_staff else "",
+        user.created_at.strftime("%Y-%m-%d %H:%M:%S") if user.created_at else "",
+        user.updated_at.strftime("%Y-%m-%d %H:%M:%S") if user.updated_at else ""
+    ]
+
+
 @router.get("/export/csv")
 def export_users_csv(
     search: Optional[str] = Query(None, description="氏名・カナで検索"),
@@ -465,56 +581,9 @@ def export_users_csv(
     output = StringIO()
     writer = csv.writer(output)
 
-    # ヘッダー行
-    writer.writerow([
-        "ID",
-        "氏名",
-        "氏名（カナ）",
-        "生年月日",
-        "年齢",
-        "性別",
-        "郵便番号",
-        "住所",
-        "電話番号",
-        "メールアドレス",
-        "緊急連絡先氏名",
-        "緊急連絡先電話番号",
-        "障害支援区分",
-        "障害支援区分認定日",
-        "障害支援区分有効期限",
-        "後見人種別",
-        "後見人氏名",
-        "後見人連絡先",
-        "担当スタッフ",
-        "作成日時",
-        "更新日時"
-    ])
-
-    # データ行
-    for user in users:
-        writer.writerow([
-            user.id,
-            user.name or "",
-            user.name_kana or "",
-            user.birth_date.strftime("%Y-%m-%d") if user.birth_date else "",
-            user.age if user.age is not None else "",
-            user.gender or "",
-            user.postal_code or "",
-            user.address or "",
-            user.phone or "",
-            user.email or "",
-            user.emergency_contact_name or "",
-            user.emergency_contact_phone or "",
-            f"区分{user.disability_support_level}" if user.disability_support_level else "",
-            user.disability_support_certified_date.strftime("%Y-%m-%d") if user.disability_support_certified_date else "",
-            user.disability_support_expiry_date.strftime("%Y-%m-%d") if user.disability_support_expiry_date else "",
-            user.guardian_type or "",
-            user.guardian_name or "",
-            user.guardian_contact or "",
-            user.assigned_staff.name if user.assigned_staff else "",
-            user.created_at.strftime("%Y-%m-%d %H:%M:%S") if user.created_at else "",
-            user.updated_at.strftime("%Y-%m-%d %H:%M:%S") if user.updated_at else ""
-        ])
+    # ヘッダー行・データ行
+    writer.writerow(USER_CSV_HEADER)
+    writer.writerows(user_csv_row(user) for user in users)
 
     # CSVデータを取得
     csv_data = output.getvalue()
@@ -25,6 +25,56 @@ class Settings(BaseSettings):
     # サーバー設定
     host: str = "0.0.0.0"
     port: int = 8000
+    startup_time_budget_seconds: float = 3.0  # 起動時間の目安（超えた場合は警告を記録。0で無効）
+
+    # モニタリング予定設定
+    monitoring_interval_months: int = 3  # 標準のモニタリング周期（月）
+    monitoring_initial_interval_months: int = 1  # 初回計画の開始から3ヶ月間の周期（月）
+
+    # レスポンス圧縮設定
+    compression_minimum_size: int = 1024  # この大きさ（バイト）未満のレスポンスは圧縮しない
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4  # brotliモジュールがある場合のみ使用
+
+    # リクエスト計測設定（Server-Timingヘッダー・構造化ログ・/metrics）
+    request_metrics_enabled: bool = True
+    request_log_enabled: bool = True  # リクエストごとの構造化ログ（JSON 1行）を出力
+    request_log_slow_ms: float = 0  # この時間（ミリ秒）以上のリクエストのみログを出力（0で全件）
+
+    # スロークエリの記録設定（管理者用API /api/admin/slow-queries で確認）
+    slow_query_threshold_ms: float = 200  # この時間（ミリ秒）以上かかったSQLを記録（0で記録しない）
+    slow_query_max_entries: int = 100  # 保持する最大件数（古いものから削除）
+    slow_query_explain: bool = True  # 記録時に実行計画（EXPLAIN）を取得
+
+    # N+1クエリの検出設定（開発・CI用。off / warn / raise）
+    n_plus_one_mode: str = "off"
+    n_plus_one_threshold: int = 5  # 1リクエストで同じ形のSELECTをこの回数実行した場合に検出
+
+    # 入力画面の選択肢キャッシュ設定
+    form_options_cache_ttl_seconds: int = 300  # 0の場合はキャッシュしない
+
+    # 薬品辞書設定
+    drug_dictionary_path: str = ""  # 薬品辞書ファイル（JSON/CSV）。空の場合は同梱の辞書を使用
+    drug_interaction_rules_path: str = ""  # 飲み合わせ規則表（JSON）。空の場合は同梱の規則表を使用
+
+    # AI計画作成支援設定
+    ai_proposal_cache_ttl_seconds: int = 3600
+    ai_proposal_cache_max_entries: int = 128
+    ai_context_token_budget: int = 1500  # プロンプトに含める長文項目の推定トークン数上限（0で無制限）
+
+    # 類似ケース検索設定
+    ai_similar_case_top_k: int = 3  # プロンプトに含める類似ケース数（0で無効）
+    ai_similar_case_index_path: str = "./similar_case_index.npz"
+    ai_similar_case_refresh_seconds: int = 300
+    ai_embedding_model: str = ""  # Ollamaの埋め込みモデル名（空の場合は文字n-gramハッシュ）
+    ai_embedding_dim: int = 512  # 文字n-gramハッシュの次元数
+
+    # AI生成ジョブ設定
+    ai_job_workers: int = 1  # 0の場合はこのプロセスではジョブを実行しない
+    ai_job_max_attempts: int = 3
+    ai_job_retry_backoff_seconds: float = 5.0
+    ai_job_poll_interval_seconds: float = 2.0
+    ai_job_timeout_seconds: int = 600
 
     class Config:
         env_file = ".env"
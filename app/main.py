@@ -2,21 +2,64 @@
 FastAPIメインアプリケーション
 
 計画相談支援 利用者管理システムのエントリーポイント
+
+データベースのテーブル作成・変更は Alembic（alembic upgrade head）で行い、
+起動時にはスキーマを変更しません。PDF出力（ReportLab）やAI計画作成支援（ollama）など
+重いモジュールは初回の利用時に読み込みます。
 """
-from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
+import time
+
+# 起動時間の計測開始（インポートを含む）
+_startup_started = time.perf_counter()
+
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import RedirectResponse
+from fastapi.responses import PlainTextResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
 from app.api import api_router
-from app.database.connection import engine, Base
+from app.database.connection import SessionLocal, engine
+from app.services.ai_job_queue import worker_pool
+from app.services.form_options import form_options_cache
+from app.utils.middleware import CompressionMiddleware, ETagMiddleware
+from app.utils.n_plus_one import NPlusOneMiddleware, install_n_plus_one_hooks, n_plus_one_registry
+from app.utils.request_metrics import (
+    RequestMetricsMiddleware, configure_request_logger, install_sql_hooks, metrics_registry
+)
+from app.utils.slow_query_log import SlowQueryMiddleware, install_slow_query_log
+from app.utils.static_assets import PrecompressedStaticFiles, static_url
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# データベーステーブルの作成
-Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """アプリケーションの起動・終了処理"""
+    # AI生成ジョブのワーカーを起動
+    worker_pool.start()
+
+    # 起動時間を記録（目安を超えた場合は警告）
+    elapsed = time.perf_counter() - _startup_started
+    app.state.startup_seconds = elapsed
+    if settings.startup_time_budget_seconds and elapsed > settings.startup_time_budget_seconds:
+        logger.warning(
+            "起動に%.2f秒かかりました（目安: %.2f秒）", elapsed, settings.startup_time_budget_seconds
+        )
+    else:
+        logger.info("起動しました（%.2f秒）", elapsed)
+
+    yield
+    worker_pool.stop()
+
+    # N+1クエリの検出結果を出力
+    report = n_plus_one_registry.format_report()
+    if report:
+        logger.warning("N+1クエリの可能性がある処理:\n%s", report)
+
 
 # FastAPIアプリケーション初期化
 app = FastAPI(
@@ -25,6 +68,16 @@ app = FastAPI(
     description="北九州市の計画相談支援事業所向け利用者管理システム",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
+)
+
+# ETag・圧縮ミドルウェア設定（ETagは圧縮前の本文から作成するため、圧縮より内側に追加）
+app.add_middleware(ETagMiddleware, path_prefix="/api")
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
 )
 
 # CORSミドルウェア設定
@@ -36,14 +89,65 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# スロークエリの記録設定（記録に実行元のルートを含めるためミドルウェアも追加）
+if settings.slow_query_threshold_ms > 0:
+    install_slow_query_log(
+        engine,
+        threshold_ms=settings.slow_query_threshold_ms,
+        max_entries=settings.slow_query_max_entries,
+        explain=settings.slow_query_explain,
+    )
+    app.add_middleware(SlowQueryMiddleware)
+
+# N+1クエリの検出ミドルウェア設定（開発・CI用）
+if settings.n_plus_one_mode != "off":
+    install_n_plus_one_hooks(engine, SessionLocal)
+    app.add_middleware(
+        NPlusOneMiddleware,
+        mode=settings.n_plus_one_mode,
+        threshold=settings.n_plus_one_threshold,
+    )
+
+# リクエスト計測ミドルウェア設定（処理時間・SQL実行回数。最も外側で計測する）
+if settings.request_metrics_enabled:
+    install_sql_hooks(engine)
+    if settings.request_log_enabled:
+        configure_request_logger()
+    app.add_middleware(
+        RequestMetricsMiddleware,
+        log_enabled=settings.request_log_enabled,
+        log_slow_ms=settings.request_log_slow_ms,
+    )
+
 # 静的ファイルとテンプレート設定
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+# （scripts/build_static.py でビルドした場合は縮小・事前圧縮したハッシュ付きファイルを配信）
+app.mount("/static", PrecompressedStaticFiles(directory="app/static"), name="static")
 templates = Jinja2Templates(directory="app/templates")
+templates.env.globals["static_url"] = static_url
 
 # APIルーター登録
 app.include_router(api_router, prefix="/api")
 
 
+def _form_options(*kinds: str):
+    """
+    入力画面のプルダウンの選択肢を取得
+
+    キャッシュにない種別のみデータベースから取得します。
+
+    Args:
+        kinds: 選択肢の種別（users / staffs / plans）
+
+    Returns:
+        種別ごとの選択肢の一覧
+    """
+    db = SessionLocal()
+    try:
+        return form_options_cache.get_many(db, *kinds)
+    finally:
+        db.close()
+
+
 # ルートエンドポイント
 @app.get("/")
 async def root():
@@ -75,20 +179,8 @@ async def users_list_page(request: Request):
 @app.get("/users/new")
 async def user_create_page(request: Request):
     """利用者新規作成画面"""
-    from app.database.connection import get_db
-    from app.models.staff import Staff
-
-    db = next(get_db())
-    try:
-        # スタッフ一覧を取得
-        staffs = db.query(Staff).filter(Staff.is_active == True).all()
-
-        return templates.TemplateResponse("users/create.html", {
-            "request": request,
-            "staffs": staffs
-        })
-    finally:
-        db.close()
+    options = _form_options("staffs")
+    return templates.TemplateResponse("users/create.html", {"request": request, **options})
 
 
 @app.get("/users/{user_id}")
@@ -118,24 +210,8 @@ async def consultations_list_page(request: Request):
 @app.get("/consultations/new")
 async def consultation_create_page(request: Request):
     """相談記録新規作成画面"""
-    from app.database.connection import get_db
-    from app.models.user import User
-    from app.models.staff import Staff
-
-    db = next(get_db())
-    try:
-        # 利用者一覧を取得
-        users = db.query(User).filter(User.is_deleted == False).all()
-        # スタッフ一覧を取得
-        staffs = db.query(Staff).filter(Staff.is_active == True).all()
-
-        return templates.TemplateResponse("consultations/create.html", {
-            "request": request,
-            "users": users,
-            "staffs": staffs
-        })
-    finally:
-        db.close()
+    options = _form_options("users", "staffs")
+    return templates.TemplateResponse("consultations/create.html", {"request": request, **options})
 
 
 @app.get("/consultations/{consultation_id}/edit")
@@ -155,24 +231,8 @@ async def plans_list_page(request: Request):
 @app.get("/plans/create")
 async def plan_create_page(request: Request):
     """計画新規作成画面"""
-    from app.database.connection import get_db
-    from app.models.user import User
-    from app.models.staff import Staff
-
-    db = next(get_db())
-    try:
-        # 利用者一覧を取得
-        users = db.query(User).filter(User.is_deleted == False).all()
-        # スタッフ一覧を取得
-        staffs = db.query(Staff).filter(Staff.is_active == True).all()
-
-        return templates.TemplateResponse("plans/create.html", {
-            "request": request,
-            "users": users,
-            "staffs": staffs
-        })
-    finally:
-        db.close()
+    options = _form_options("users", "staffs")
+    return templates.TemplateResponse("plans/create.html", {"request": request, **options})
 
 
 @app.get("/plans/{plan_id}")
@@ -197,28 +257,8 @@ async def monitorings_list_page(request: Request):
 @app.get("/monitorings/new")
 async def monitoring_create_page(request: Request):
     """モニタリング新規作成画面"""
-    from app.database.connection import get_db
-    from app.models.user import User
-    from app.models.staff import Staff
-    from app.models.plan import Plan
-
-    db = next(get_db())
-    try:
-        # 利用者一覧を取得
-        users = db.query(User).filter(User.is_deleted == False).all()
-        # スタッフ一覧を取得
-        staffs = db.query(Staff).filter(Staff.is_active == True).all()
-        # 計画一覧を取得
-        plans = db.query(Plan).filter(Plan.is_deleted == False).all()
-
-        return templates.TemplateResponse("monitorings/create.html", {
-            "request": request,
-            "users": users,
-            "staffs": staffs,
-            "plans": plans
-        })
-    finally:
-        db.close()
+    options = _form_options("users", "staffs", "plans")
+    return templates.TemplateResponse("monitorings/create.html", {"request": request, **options})
 
 
 @app.get("/monitorings/{monitoring_id}")
@@ -297,6 +337,14 @@ async def health_check():
     return {"status": "healthy", "app": settings.app_name, "version": settings.app_version}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """リクエスト計測のメトリクス（Prometheusのテキスト形式、ワーカーごとの値）"""
+    if not settings.request_metrics_enabled:
+        raise HTTPException(status_code=404, detail="メトリクスは無効です")
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
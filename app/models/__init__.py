@@ -12,9 +12,12 @@ from app.models.organization import Organization
 from app.models.user_organization import UserOrganization
 from app.models.plan import Plan
 from app.models.monitoring import Monitoring
+from app.models.plan_evaluation import PlanEvaluation
+from app.models.monitoring_schedule import MonitoringSchedule
 from app.models.prescribing_doctor import PrescribingDoctor
 from app.models.medication import Medication
 from app.models.medication_change import MedicationChange
+from app.models.ai_generation_job import AIGenerationJob
 
 # すべてのモデルをエクスポート
 __all__ = [
@@ -27,7 +30,10 @@ __all__ = [
     "UserOrganization",
     "Plan",
     "Monitoring",
+    "PlanEvaluation",
+    "MonitoringSchedule",
     "PrescribingDoctor",
     "Medication",
     "MedicationChange",
+    "AIGenerationJob",
 ]
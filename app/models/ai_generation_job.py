@@ -0,0 +1,63 @@
+"""
+AI生成ジョブモデル
+
+AI計画作成支援の生成処理をバックグラウンドで実行するためのジョブキューです。
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index
+from app.database.connection import Base
+
+
+class AIGenerationJob(Base):
+    """
+    AI生成ジョブモデル
+
+    送信されたAI生成リクエストを永続化し、ワーカーが順に取り出して実行します。
+    """
+    __tablename__ = "ai_generation_jobs"
+
+    # ジョブ状態
+    STATUS_QUEUED = "待機中"
+    STATUS_RUNNING = "実行中"
+    STATUS_SUCCEEDED = "完了"
+    STATUS_FAILED = "失敗"
+
+    # 主キー
+    id = Column(Integer, primary_key=True, index=True, comment="ジョブID")
+
+    # ジョブ内容
+    job_type = Column(String(50), nullable=False, comment="ジョブ種別（plan_proposal など）")
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, comment="対象利用者ID")
+    params = Column(JSON, nullable=False, comment="ジョブパラメータ（JSON形式）")
+
+    # 実行状態
+    status = Column(String(20), nullable=False, default=STATUS_QUEUED, comment="状態（待機中/実行中/完了/失敗）")
+    attempts = Column(Integer, nullable=False, default=0, comment="実行回数")
+    max_attempts = Column(Integer, nullable=False, default=3, comment="最大実行回数")
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow, comment="実行可能日時（リトライ待機用）")
+
+    # 実行結果
+    result = Column(JSON, comment="実行結果（JSON形式）")
+    error_message = Column(Text, comment="エラー内容")
+
+    # タイムスタンプ
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, comment="作成日時")
+    started_at = Column(DateTime, comment="実行開始日時")
+    finished_at = Column(DateTime, comment="実行終了日時")
+
+    @property
+    def is_finished(self):
+        """
+        ジョブが終了しているかを判定
+
+        Returns:
+            bool: 完了または失敗ならTrue
+        """
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED)
+
+    def __repr__(self):
+        return f"<AIGenerationJob(id={self.id}, type={self.job_type}, status={self.status}, attempts={self.attempts})>"
+
+
+# 複合インデックスの定義（ワーカーの取り出し用）
+Index('idx_ai_generation_jobs_status_available', AIGenerationJob.status, AIGenerationJob.available_at)
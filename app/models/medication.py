@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Date, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, Date, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.connection import Base
@@ -33,5 +33,11 @@ class Medication(Base):
     prescribing_doctor = relationship("PrescribingDoctor")
     changes = relationship("MedicationChange", back_populates="medication", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # 利用者ごとの服用中の薬、処方医ごとの服用中の薬の集計用インデックス
+        Index("idx_medications_user_current", "user_id", "is_current"),
+        Index("idx_medications_doctor_current", "prescribing_doctor_id", "is_current"),
+    )
+
     def __repr__(self):
         return f"<Medication(id={self.id}, name={self.medication_name}, user_id={self.user_id})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.connection import Base
@@ -24,5 +24,10 @@ class MedicationChange(Base):
     # リレーションシップ
     medication = relationship("Medication", back_populates="changes")
 
+    __table_args__ = (
+        # 服薬ごとの履歴を日付順に取得するためのインデックス
+        Index("idx_medication_changes_medication_date", "medication_id", "change_date"),
+    )
+
     def __repr__(self):
         return f"<MedicationChange(id={self.id}, type={self.change_type}, date={self.change_date})>"
@@ -0,0 +1,56 @@
+"""
+モニタリング予定モデル
+
+利用者ごとの次回モニタリング予定日を管理します。
+有効な計画と最新のモニタリング記録から算出し、記録・計画の更新時に再計算します。
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.database.connection import Base
+
+
+class MonitoringSchedule(Base):
+    """
+    モニタリング予定モデル
+
+    有効な計画（承認済み/実施中）がある利用者ごとに1行を持ち、
+    担当スタッフ・予定日のインデックスで期限の範囲検索を行います。
+    """
+    __tablename__ = "monitoring_schedule"
+
+    # 予定日の算出根拠
+    BASIS_NEXT_DATE = "次回予定日"
+    BASIS_INTERVAL = "周期"
+    BASIS_PLAN_START = "計画開始"
+    BASIS_PLAN_END = "計画終了"
+
+    # 主キー
+    id = Column(Integer, primary_key=True, index=True, comment="予定ID")
+
+    # 関連情報
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, unique=True, comment="利用者ID")
+    plan_id = Column(Integer, ForeignKey("plans.id"), nullable=False, comment="有効な計画ID")
+    staff_id = Column(Integer, ForeignKey("staffs.id"), comment="担当スタッフID（利用者の担当）")
+    last_monitoring_id = Column(Integer, ForeignKey("monitorings.id"), comment="最新のモニタリングID")
+
+    # 予定
+    due_date = Column(Date, nullable=False, comment="次回モニタリング予定日")
+    last_monitoring_date = Column(Date, comment="最新のモニタリング実施日")
+    interval_months = Column(Integer, nullable=False, comment="モニタリング周期（月）")
+    basis = Column(String(20), nullable=False, comment="算出根拠（次回予定日/周期/計画開始/計画終了）")
+
+    # タイムスタンプ
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, comment="更新日時")
+
+    # リレーションシップ
+    user = relationship("User")
+    plan = relationship("Plan")
+
+    def __repr__(self):
+        return f"<MonitoringSchedule(user={self.user_id}, plan={self.plan_id}, due={self.due_date}, basis={self.basis})>"
+
+
+# 複合インデックスの定義（担当スタッフごとの期限検索、事業所全体の期限検索用）
+Index('idx_monitoring_schedule_staff_due', MonitoringSchedule.staff_id, MonitoringSchedule.due_date)
+Index('idx_monitoring_schedule_due', MonitoringSchedule.due_date)
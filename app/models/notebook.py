@@ -27,7 +27,7 @@ class Notebook(Base):
     notebook_type = Column(String(50), nullable=False, comment="手帳種別（療育手帳/精神障害者保健福祉手帳）")
     grade = Column(String(20), comment="等級・程度")
     issue_date = Column(Date, comment="交付日")
-    renewal_date = Column(Date, comment="更新日")
+    renewal_date = Column(Date, index=True, comment="更新日")
     notes = Column(Text, comment="備考")
 
     # 削除フラグ
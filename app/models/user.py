@@ -39,7 +39,7 @@ class User(Base):
     # 障害支援区分
     disability_support_level = Column(Integer, comment="障害支援区分 (1-6)")
     disability_support_certified_date = Column(Date, comment="障害支援区分認定日")
-    disability_support_expiry_date = Column(Date, comment="障害支援区分有効期限")
+    disability_support_expiry_date = Column(Date, index=True, comment="障害支援区分有効期限")
 
     # 障害特性・興味の偏り
     disability_characteristics = Column(Text, comment="障害特性（特性、困難さ、配慮事項など）")
@@ -0,0 +1,22 @@
+"""
+カレンダーのスキーマ定義
+
+APIレスポンスのデータ検証に使用します。
+"""
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class CalendarEvent(BaseModel):
+    """カレンダーの予定"""
+    date: date
+    event_type: str = Field(..., description="予定の種別（計画開始/計画終了/モニタリング予定/手帳更新/障害支援区分有効期限）")
+    ref_id: int = Field(..., description="対象のID（計画ID/手帳ID/利用者ID）")
+    user_id: int
+    user_name: str
+    staff_id: Optional[int] = Field(None, description="利用者の担当スタッフID")
+    title: str
+    detail: Optional[str] = None
+    link: str = Field(..., description="詳細画面のURL")
@@ -0,0 +1,30 @@
+"""
+ケースサマリーのスキーマ定義
+
+利用者詳細画面に必要な情報をまとめたAPIレスポンスに使用します。
+"""
+from typing import Optional, List, Dict, Any
+
+from pydantic import BaseModel, Field
+
+from app.schemas.user import UserResponse
+from app.schemas.notebook import NotebookResponse
+from app.schemas.consultation import ConsultationResponse
+from app.schemas.plan import PlanResponse
+from app.schemas.monitoring import MonitoringResponse, MonitoringScheduleItem
+from app.schemas.medication import MedicationWithDoctor
+
+
+class CaseSummary(BaseModel):
+    """利用者のケースサマリー"""
+    user: UserResponse
+    assigned_staff_name: Optional[str] = None
+    notebooks: List[NotebookResponse]
+    medications: List[MedicationWithDoctor] = Field(..., description="服薬情報（服用中・服用履歴）")
+    consultations: List[ConsultationResponse] = Field(..., description="最新の相談記録")
+    consultations_total: int = Field(..., description="相談記録の総件数")
+    plans: List[PlanResponse]
+    monitorings: List[MonitoringResponse] = Field(..., description="最新のモニタリング記録")
+    monitorings_total: int = Field(..., description="モニタリング記録の総件数")
+    next_monitoring: Optional[MonitoringScheduleItem] = Field(None, description="次回モニタリング予定")
+    network: Dict[str, Any] = Field(..., description="ネットワーク図データ（ノードとエッジ）")
@@ -1,6 +1,6 @@
 """服薬情報スキーマ"""
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -57,3 +57,127 @@ class MedicationWithDoctor(Medication):
 
     class Config:
         from_attributes = True
+
+
+class InteractionFinding(BaseModel):
+    """飲み合わせチェックの指摘事項"""
+    severity: str = Field(..., description="重要度（高/中/低）")
+    category: str = Field(..., description="種別（相互作用/同種同効/同一成分）")
+    title: str = Field(..., description="該当する規則")
+    message: str = Field(..., description="内容")
+    medication_ids: List[int] = Field(..., description="対象の服薬情報ID")
+    medication_names: List[str] = Field(..., description="対象の薬品名")
+
+
+class UserInteractionResult(BaseModel):
+    """利用者ごとの飲み合わせチェック結果"""
+    user_id: int
+    user_name: str
+    max_severity: str
+    findings: List[InteractionFinding]
+
+
+class InteractionScanResponse(BaseModel):
+    """飲み合わせ一括チェック結果"""
+    scanned_users: int = Field(..., description="チェックした利用者数")
+    flagged_users: int = Field(..., description="指摘のあった利用者数")
+    results: List[UserInteractionResult]
+
+
+class MedicationFieldChange(BaseModel):
+    """服薬変更の差分"""
+    field: str = Field(..., description="変更項目")
+    from_value: Optional[str] = Field(None, alias="from", description="変更前")
+    to_value: Optional[str] = Field(None, alias="to", description="変更後")
+
+    class Config:
+        populate_by_name = True
+
+
+class MedicationTimelineEvent(BaseModel):
+    """服薬タイムラインのイベント"""
+    date: date
+    medication_id: int
+    medication_name: str
+    event: str = Field(..., description="イベント種別（開始/変更/終了）")
+    changes: List[MedicationFieldChange] = Field(default_factory=list, description="変更内容（変更イベントのみ）")
+    reasons: List[str] = Field(default_factory=list, description="変更理由")
+
+
+class MedicationTimeline(BaseModel):
+    """服薬タイムライン"""
+    items: List[MedicationTimelineEvent] = Field(..., description="日付順のイベント")
+    truncated: bool = Field(..., description="上限により古い履歴を省略した場合はTrue")
+    next_end_date: Optional[date] = Field(None, description="古い履歴を取得する際に end_date に指定する日付")
+
+
+class DrugUserItem(BaseModel):
+    """薬を服用中の利用者"""
+    user_id: int
+    user_name: str
+    medications: List[str] = Field(..., description="該当する服用中の薬品名")
+
+
+class DrugUserList(BaseModel):
+    """薬を服用中の利用者一覧"""
+    total: int = Field(..., description="総件数")
+    items: List[DrugUserItem]
+
+
+class DoctorPatientItem(BaseModel):
+    """処方医ごとの患者数"""
+    doctor_id: int
+    doctor_name: str
+    hospital_name: str
+    patient_count: int = Field(..., description="服用中の薬がある利用者数")
+    medication_count: int = Field(..., description="服用中の薬の数")
+
+
+class DoctorPatientList(BaseModel):
+    """処方医ごとの患者数一覧"""
+    total: int = Field(..., description="総件数")
+    items: List[DoctorPatientItem]
+
+
+class PolypharmacyItem(BaseModel):
+    """多剤服用の利用者"""
+    user_id: int
+    user_name: str
+    medication_count: int = Field(..., description="服用中の薬の数")
+
+
+class PolypharmacyList(BaseModel):
+    """多剤服用の利用者一覧"""
+    total: int = Field(..., description="総件数")
+    items: List[PolypharmacyItem]
+
+
+class MedicationReconcileItem(MedicationBase):
+    """服薬一括照合の薬（新しい処方内容の1剤）"""
+    medication_id: Optional[int] = Field(None, description="対応する既存の服薬情報ID（省略時は薬品名で照合）")
+
+
+class MedicationReconcileRequest(BaseModel):
+    """服薬一括照合リクエスト"""
+    user_id: int = Field(..., description="利用者ID")
+    medications: List[MedicationReconcileItem] = Field(..., description="新しい処方内容（服用中の薬すべて）")
+    change_date: Optional[date] = Field(None, description="変更日（省略時は今日）")
+    reason: Optional[str] = Field(None, description="変更理由（例: 退院時処方）")
+    dry_run: bool = Field(False, description="差分の確認のみ行い、反映しない")
+
+
+class ReconciledMedication(BaseModel):
+    """照合結果の薬"""
+    medication_id: Optional[int] = Field(None, description="服薬情報ID（dry_run時の新規はなし）")
+    medication_name: str
+    changes: List[MedicationFieldChange] = Field(default_factory=list, description="変更内容（変更の場合）")
+
+
+class MedicationReconcileResponse(BaseModel):
+    """服薬一括照合結果"""
+    user_id: int
+    applied: bool = Field(..., description="反映したかどうか")
+    added: List[ReconciledMedication]
+    changed: List[ReconciledMedication]
+    stopped: List[ReconciledMedication]
+    unchanged: int = Field(..., description="変更のない薬の数")
@@ -4,7 +4,7 @@
 APIリクエスト・レスポンスのデータ検証に使用します。
 """
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field, validator
 
 
@@ -75,3 +75,38 @@ class MonitoringResponse(MonitoringBase):
 
     class Config:
         from_attributes = True
+
+
+class MonitoringScheduleItem(BaseModel):
+    """モニタリング予定"""
+    user_id: int
+    user_name: str
+    plan_id: int
+    staff_id: Optional[int] = None
+    due_date: date = Field(..., description="次回モニタリング予定日")
+    days_remaining: int = Field(..., description="予定日までの日数（負の値は期限超過）")
+    last_monitoring_id: Optional[int] = None
+    last_monitoring_date: Optional[date] = None
+    interval_months: int = Field(..., description="モニタリング周期（月）")
+    basis: str = Field(..., description="算出根拠（次回予定日/周期/計画開始/計画終了）")
+
+
+class MonitoringCalendarDay(BaseModel):
+    """モニタリング予定カレンダーの1日"""
+    date: date
+    items: List[MonitoringScheduleItem]
+
+
+class MonitoringCalendar(BaseModel):
+    """月間のモニタリング予定カレンダー"""
+    year: int
+    month: int
+    total: int = Field(..., description="月内の予定件数")
+    days: List[MonitoringCalendarDay]
+
+
+class MonitoringScheduleRefreshResult(BaseModel):
+    """モニタリング予定の再計算結果"""
+    inserted: int
+    updated: int
+    removed: int
@@ -0,0 +1,25 @@
+"""
+スロークエリのスキーマ定義
+
+APIレスポンスのデータ検証に使用します。
+"""
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SlowQueryEntry(BaseModel):
+    """記録したスロークエリ"""
+    recorded_at: str = Field(..., description="記録日時")
+    duration_ms: float = Field(..., description="実行時間（ミリ秒）")
+    route: Optional[str] = Field(None, description="実行元のルート（例: GET /api/users/{user_id}）")
+    statement: str
+    parameters: Any = Field(None, description="パラメータ（文字列・日付はマスク済み）")
+    plan: Optional[List[str]] = Field(None, description="実行計画（SELECT以外・取得できない場合はなし）")
+
+
+class SlowQueryLogResponse(BaseModel):
+    """スロークエリの記録一覧"""
+    threshold_ms: float = Field(..., description="記録するしきい値（ミリ秒、0の場合は記録しない）")
+    max_entries: int = Field(..., description="保持する最大件数")
+    entries: List[SlowQueryEntry] = Field(..., description="記録（新しい順）")
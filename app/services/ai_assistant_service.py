@@ -4,20 +4,136 @@ AI計画作成支援サービス
 Ollama ローカルLLMを使用したサービス利用計画の作成支援機能を提供します。
 """
 import ollama
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator
 import json
+import hashlib
 from datetime import datetime, date
 from sqlalchemy.orm import Session
-from app.models.user import User
-from app.models.plan import Plan
-from app.models.plan_evaluation import PlanEvaluation
-from app.models.consultation import Consultation
-from app.models.medication import Medication
+from app.services.ai_context_loader import AIContextLoader
+from app.services.proposal_cache import proposal_cache
+
+
+# 計画提案のセクション見出し（判定順）とパース結果のキー
+SECTION_HEADERS = [
+    ('現在の状況', 'current_situation'),
+    ('希望やニーズ', 'hopes_and_needs'),
+    ('援助方針', 'support_policy'),
+    ('長期目標', 'long_term_goal'),
+    ('短期目標', 'short_term_goal'),
+    ('推奨サービス', 'recommended_services'),
+]
+
+# 推奨サービスとして扱う行頭記号
+SERVICE_LINE_PREFIXES = ('1.', '2.', '3.', '4.', '5.', '-', '•')
+
+
+def _detect_section(line: str) -> Optional[str]:
+    """
+    行がセクション見出しであればセクションキーを返す
+
+    Args:
+        line: 前後の空白を除去した行
+
+    Returns:
+        セクションキー（見出しでない場合はNone）
+    """
+    for header, section in SECTION_HEADERS:
+        if header in line:
+            return section
+    return None
+
+
+class PlanProposalStreamParser:
+    """
+    計画提案レスポンスの逐次パーサー
+
+    トークン単位で届くテキストを行ごとに解析し、【現在の状況】などの
+    セクション見出しを検出するたびにイベントを返します。
+    """
+
+    def __init__(self):
+        self.sections: Dict[str, Any] = {
+            "current_situation": "",
+            "hopes_and_needs": "",
+            "support_policy": "",
+            "long_term_goal": "",
+            "short_term_goal": "",
+            "recommended_services": [],
+            "raw_response": ""
+        }
+        self._current_section: Optional[str] = None
+        self._buffer = ""
+        self._chunks: List[str] = []
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        受信したテキスト断片を追加し、確定した行をパース
+
+        Args:
+            chunk: LLMから受信したテキスト断片
+
+        Returns:
+            発生したセクションイベントのリスト
+        """
+        self._chunks.append(chunk)
+        self._buffer += chunk
+
+        events = []
+        while '\n' in self._buffer:
+            line, self._buffer = self._buffer.split('\n', 1)
+            events.extend(self._consume_line(line))
+        return events
+
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        残りのバッファをパースして終了
+
+        Returns:
+            発生したセクションイベントのリスト
+        """
+        events = self._consume_line(self._buffer)
+        self._buffer = ""
+        self.sections["raw_response"] = "".join(self._chunks)
+        return events
+
+    def _consume_line(self, line: str) -> List[Dict[str, Any]]:
+        """1行分をパースしてセクションに反映"""
+        line = line.strip()
+
+        section = _detect_section(line)
+        if section:
+            self._current_section = section
+            return [{"event": "section_start", "section": section}]
+
+        if not self._current_section or not line:
+            return []
+
+        if self._current_section == 'recommended_services':
+            # サービスはリストとして保存
+            if not line.startswith(SERVICE_LINE_PREFIXES):
+                return []
+            self.sections['recommended_services'].append(line)
+        else:
+            # その他のセクションはテキストとして結合
+            if self.sections[self._current_section]:
+                self.sections[self._current_section] += ' '
+            self.sections[self._current_section] += line
+
+        return [{"event": "section_delta", "section": self._current_section, "text": line}]
 
 
 class OllamaAIAssistantService:
     """Ollama ローカルLLMを使用した計画作成支援サービス"""
 
+    SYSTEM_PROMPT = 'あなたは経験豊富な計画相談支援専門員です。利用者の状況を総合的に判断し、具体的で実現可能なサービス利用計画を提案してください。必ず日本語で回答してください。'
+
+    # 生成オプション
+    OPTIONS = {
+        'temperature': 0.7,  # 創造性と一貫性のバランス
+        'top_p': 0.9,
+        'top_k': 40,
+    }
+
     def __init__(self, db: Session, model: str = "llama3"):
         """
         初期化
@@ -32,14 +148,19 @@ class OllamaAIAssistantService:
     def generate_plan_proposal(
         self,
         user_id: int,
-        previous_plan_id: Optional[int] = None
+        previous_plan_id: Optional[int] = None,
+        force_regenerate: bool = False
     ) -> Dict[str, Any]:
         """
         利用者情報を総合的に分析し、計画案を生成
 
+        同一のプロンプト・モデル・生成オプションによる生成結果がキャッシュに
+        あれば、LLMを呼び出さずにその結果を返します。
+
         Args:
             user_id: 利用者ID
             previous_plan_id: 前回の計画ID(任意)
+            force_regenerate: Trueの場合はキャッシュを使わずに再生成
 
         Returns:
             生成された計画提案とメタ情報
@@ -50,27 +171,165 @@ class OllamaAIAssistantService:
         # コンテキストデータを収集
         context_data = self._gather_context_data(user_id, previous_plan_id)
 
+        return self.generate_from_context(user_id, previous_plan_id, context_data, force_regenerate)
+
+    def generate_from_context(
+        self,
+        user_id: int,
+        previous_plan_id: Optional[int],
+        context_data: Dict[str, Any],
+        force_regenerate: bool = False
+    ) -> Dict[str, Any]:
+        """
+        収集済みのコンテキストデータから計画案を生成
+
+        一括更新などでコンテキストデータをまとめて取得した場合に使用します。
+
+        Args:
+            user_id: 利用者ID
+            previous_plan_id: 前回の計画ID(任意)
+            context_data: コンテキストデータ
+            force_regenerate: Trueの場合はキャッシュを使わずに再生成
+
+        Returns:
+            生成された計画提案とメタ情報
+        """
         # プロンプトを構築
         prompt = self._build_prompt(context_data)
 
+        # キャッシュを確認
+        cache_key = self._cache_key(prompt)
+        if not force_regenerate:
+            cached = proposal_cache.get(cache_key)
+            if cached is not None:
+                return self._build_result(
+                    user_id, previous_plan_id, context_data, cached["proposal"],
+                    generated_at=cached["generated_at"], cached=True
+                )
+
         # Ollamaを呼び出し
         response = self._call_ollama(prompt)
 
         # レスポンスをパース
         parsed_response = self._parse_response(response)
 
+        result = self._build_result(user_id, previous_plan_id, context_data, parsed_response)
+        proposal_cache.set(cache_key, {"proposal": parsed_response, "generated_at": result["generated_at"]})
+        return result
+
+    def stream_plan_proposal(
+        self,
+        user_id: int,
+        previous_plan_id: Optional[int] = None,
+        force_regenerate: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        計画案をストリーミング生成
+
+        コンテキスト収集とプロンプト構築はこのメソッドの呼び出し時に行い、
+        LLMの生成結果は返り値のイテレーターから逐次取得します。
+
+        キャッシュに生成結果がある場合は、LLMを呼び出さずに done イベントのみを返します。
+
+        Args:
+            user_id: 利用者ID
+            previous_plan_id: 前回の計画ID(任意)
+            force_regenerate: Trueの場合はキャッシュを使わずに再生成
+
+        Returns:
+            イベント(dict)のイテレーター
+            - meta: 生成開始
+            - token: LLMが出力したテキスト断片
+            - section_start / section_delta: セクション見出しと確定した行
+            - done: generate_plan_proposal と同じ形式の最終結果
+            - error: 生成中のエラー
+
+        Raises:
+            ValueError: 利用者が見つからない場合
+        """
+        context_data = self._gather_context_data(user_id, previous_plan_id)
+        prompt = self._build_prompt(context_data)
+
+        return self._stream_events(user_id, previous_plan_id, context_data, prompt, force_regenerate)
+
+    def _stream_events(
+        self,
+        user_id: int,
+        previous_plan_id: Optional[int],
+        context_data: Dict[str, Any],
+        prompt: str,
+        force_regenerate: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """ストリーミング生成のイベントを順に返すジェネレーター"""
+        parser = PlanProposalStreamParser()
+
+        yield {"event": "meta", "user_id": user_id, "model_used": self.model}
+
+        cache_key = self._cache_key(prompt)
+        if not force_regenerate:
+            cached = proposal_cache.get(cache_key)
+            if cached is not None:
+                yield {
+                    "event": "done",
+                    "result": self._build_result(
+                        user_id, previous_plan_id, context_data, cached["proposal"],
+                        generated_at=cached["generated_at"], cached=True
+                    )
+                }
+                return
+
+        try:
+            for chunk in self._call_ollama_stream(prompt):
+                if not chunk:
+                    continue
+                yield {"event": "token", "text": chunk}
+                yield from parser.feed(chunk)
+        except Exception as e:
+            yield {"event": "error", "detail": str(e)}
+            return
+
+        yield from parser.close()
+        result = self._build_result(user_id, previous_plan_id, context_data, parser.sections)
+        proposal_cache.set(cache_key, {"proposal": parser.sections, "generated_at": result["generated_at"]})
+        yield {"event": "done", "result": result}
+
+    def _build_result(
+        self,
+        user_id: int,
+        previous_plan_id: Optional[int],
+        context_data: Dict[str, Any],
+        proposal: Dict[str, Any],
+        generated_at: Optional[str] = None,
+        cached: bool = False
+    ) -> Dict[str, Any]:
+        """
+        計画提案とメタ情報をまとめたレスポンスを作成
+
+        Args:
+            user_id: 利用者ID
+            previous_plan_id: 前回の計画ID(任意)
+            context_data: コンテキストデータ
+            proposal: パースされた計画提案
+            generated_at: 生成日時（キャッシュ結果の場合は元の生成日時）
+            cached: キャッシュから返した結果かどうか
+
+        Returns:
+            生成された計画提案とメタ情報
+        """
         return {
             "user_id": user_id,
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": generated_at or datetime.now().isoformat(),
             "model_used": self.model,
-            "proposal": parsed_response,
+            "cached": cached,
+            "proposal": proposal,
             "data_sources": {
                 "user_profile": True,
                 "disability_info": context_data.get("disability_info") is not None,
                 "medications": len(context_data.get("medications", [])) > 0,
                 "previous_plan": previous_plan_id is not None,
                 "previous_evaluation": context_data.get("previous_evaluation") is not None,
-                "consultations": len(context_data.get("consultations", [])) > 0
+                "consultations": len(context_data.get("consultations", [])) > 0,
+                "similar_cases": len(context_data.get("similar_cases", [])) > 0
             }
         }
 
@@ -82,6 +341,9 @@ class OllamaAIAssistantService:
         """
         計画作成に必要なコンテキストデータを収集
 
+        削除済みの相談記録は除外し、長文項目は設定のトークン予算
+        （AI_CONTEXT_TOKEN_BUDGET）に収まるよう切り詰めます。
+
         Args:
             user_id: 利用者ID
             previous_plan_id: 前回の計画ID(任意)
@@ -92,91 +354,11 @@ class OllamaAIAssistantService:
         Raises:
             ValueError: 利用者が見つからない場合
         """
-        # 利用者基本情報を取得
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
+        # 利用者・服薬・相談記録・前回計画・評価を固定回数のクエリで取得
+        context = AIContextLoader(self.db).load_one(user_id, previous_plan_id)
+        if context is None:
             raise ValueError(f"利用者ID {user_id} が見つかりません")
 
-        context = {
-            "user_profile": {
-                "name": user.name,
-                "age": user.age,
-                "gender": user.gender,
-                "disability_support_level": user.disability_support_level,
-            },
-            "disability_info": None,
-            "medications": [],
-            "consultations": [],
-            "previous_plan": None,
-            "previous_evaluation": None
-        }
-
-        # 障害特性・興味の偏り情報
-        if user.disability_characteristics or user.interest_bias:
-            context["disability_info"] = {
-                "characteristics": user.disability_characteristics,
-                "interests": user.interest_bias
-            }
-
-        # 服薬情報を取得
-        medications = self.db.query(Medication).filter(
-            Medication.user_id == user_id,
-            Medication.is_current == True
-        ).all()
-
-        context["medications"] = [
-            {
-                "name": med.medication_name,
-                "purpose": med.purpose,
-                "dosage": med.dosage,
-                "frequency": med.frequency
-            }
-            for med in medications
-        ]
-
-        # 最近の相談記録を取得(直近5件)
-        consultations = self.db.query(Consultation).filter(
-            Consultation.user_id == user_id
-        ).order_by(Consultation.consultation_date.desc()).limit(5).all()
-
-        context["consultations"] = [
-            {
-                "date": cons.consultation_date.isoformat(),
-                "type": cons.consultation_type,
-                "content": cons.content
-            }
-            for cons in consultations
-        ]
-
-        # 前回の計画と評価を取得
-        if previous_plan_id:
-            previous_plan = self.db.query(Plan).filter(Plan.id == previous_plan_id).first()
-            if previous_plan:
-                context["previous_plan"] = {
-                    "start_date": previous_plan.start_date.isoformat(),
-                    "end_date": previous_plan.end_date.isoformat(),
-                    "current_situation": previous_plan.current_situation,
-                    "hopes_and_needs": previous_plan.hopes_and_needs,
-                    "support_policy": previous_plan.support_policy,
-                    "long_term_goal": previous_plan.long_term_goal,
-                    "short_term_goal": previous_plan.short_term_goal,
-                    "services": previous_plan.services
-                }
-
-                # 前回計画の評価を取得
-                evaluation = self.db.query(PlanEvaluation).filter(
-                    PlanEvaluation.plan_id == previous_plan_id
-                ).order_by(PlanEvaluation.evaluation_date.desc()).first()
-
-                if evaluation:
-                    context["previous_evaluation"] = {
-                        "achievement_status": evaluation.achievement_status,
-                        "achievement_details": evaluation.achievement_details,
-                        "overall_evaluation": evaluation.overall_evaluation,
-                        "challenges": evaluation.challenges,
-                        "next_actions": evaluation.next_actions
-                    }
-
         return context
 
     def _build_prompt(self, context_data: Dict[str, Any]) -> str:
@@ -195,6 +377,7 @@ class OllamaAIAssistantService:
         consultations = context_data.get("consultations", [])
         previous_plan = context_data.get("previous_plan")
         previous_evaluation = context_data.get("previous_evaluation")
+        similar_cases = context_data.get("similar_cases", [])
 
         prompt = f"""あなたは経験豊富な計画相談支援専門員です。以下の情報をもとに、利用者のサービス利用計画を提案してください。
 
@@ -261,6 +444,22 @@ class OllamaAIAssistantService:
             if previous_evaluation.get('next_actions'):
                 prompt += f"【次期計画への提言】\n{previous_evaluation['next_actions']}\n\n"
 
+        # 類似ケース（他の利用者の過去計画）
+        if similar_cases:
+            prompt += "# 参考: 特性や目標が近い過去のケース\n"
+            prompt += "※他の利用者の計画です。内容をそのまま写さず、本人の状況を優先してください\n\n"
+            for i, case in enumerate(similar_cases, 1):
+                prompt += f"ケース{i}（類似度 {case['similarity']:.2f}）\n"
+                if case.get('disability_characteristics'):
+                    prompt += f"- 障害特性: {case['disability_characteristics']}\n"
+                if case.get('long_term_goal'):
+                    prompt += f"- 長期目標: {case['long_term_goal']}\n"
+                if case.get('short_term_goal'):
+                    prompt += f"- 短期目標: {case['short_term_goal']}\n"
+                if case.get('overall_evaluation'):
+                    prompt += f"- 評価: {case['overall_evaluation']}\n"
+                prompt += "\n"
+
         # 回答フォーマットの指示
         prompt += """
 # 以下の形式で計画を提案してください
@@ -291,6 +490,51 @@ class OllamaAIAssistantService:
 
         return prompt
 
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """
+        Ollama chat API に渡すメッセージを構築
+
+        Args:
+            prompt: 生成用プロンプト
+
+        Returns:
+            メッセージのリスト
+        """
+        return [
+            {
+                'role': 'system',
+                'content': self.SYSTEM_PROMPT
+            },
+            {
+                'role': 'user',
+                'content': prompt + '\n\n※必ず日本語で回答してください。'
+            }
+        ]
+
+    def _cache_key(self, prompt: str) -> str:
+        """
+        計画提案キャッシュのキーを作成
+
+        構築済みプロンプト（システムプロンプトを含む）、モデル名、生成オプションの
+        ハッシュ値をキーとします。
+
+        Args:
+            prompt: 生成用プロンプト
+
+        Returns:
+            SHA-256ハッシュ文字列
+        """
+        payload = json.dumps(
+            {
+                "model": self.model,
+                "messages": self._build_messages(prompt),
+                "options": self.OPTIONS,
+            },
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
     def _call_ollama(self, prompt: str) -> str:
         """
         Ollama APIを呼び出し
@@ -304,26 +548,35 @@ class OllamaAIAssistantService:
         try:
             response = ollama.chat(
                 model=self.model,
-                messages=[
-                    {
-                        'role': 'system',
-                        'content': 'あなたは経験豊富な計画相談支援専門員です。利用者の状況を総合的に判断し、具体的で実現可能なサービス利用計画を提案してください。必ず日本語で回答してください。'
-                    },
-                    {
-                        'role': 'user',
-                        'content': prompt + '\n\n※必ず日本語で回答してください。'
-                    }
-                ],
-                options={
-                    'temperature': 0.7,  # 創造性と一貫性のバランス
-                    'top_p': 0.9,
-                    'top_k': 40,
-                }
+                messages=self._build_messages(prompt),
+                options=self.OPTIONS
             )
             return response['message']['content']
         except Exception as e:
             raise Exception(f"Ollama呼び出しエラー: {str(e)}")
 
+    def _call_ollama_stream(self, prompt: str) -> Iterator[str]:
+        """
+        Ollama APIをストリーミングモードで呼び出し
+
+        Args:
+            prompt: 生成用プロンプト
+
+        Returns:
+            生成されたテキスト断片のイテレーター
+        """
+        try:
+            stream = ollama.chat(
+                model=self.model,
+                messages=self._build_messages(prompt),
+                options=self.OPTIONS,
+                stream=True
+            )
+            for chunk in stream:
+                yield chunk['message']['content']
+        except Exception as e:
+            raise Exception(f"Ollama呼び出しエラー: {str(e)}")
+
     def _parse_response(self, response: str) -> Dict[str, Any]:
         """
         Ollamaのレスポンスをパース
@@ -334,56 +587,10 @@ class OllamaAIAssistantService:
         Returns:
             パースされた計画提案
         """
-        # セクションごとに分割
-        sections = {
-            "current_situation": "",
-            "hopes_and_needs": "",
-            "support_policy": "",
-            "long_term_goal": "",
-            "short_term_goal": "",
-            "recommended_services": [],
-            "raw_response": response
-        }
-
-        # 簡易的なパース(改善の余地あり)
-        lines = response.split('\n')
-        current_section = None
-
-        for line in lines:
-            line = line.strip()
-
-            if '【現在の状況】' in line or '現在の状況' in line:
-                current_section = 'current_situation'
-                continue
-            elif '【本人・家族の希望やニーズ】' in line or '希望やニーズ' in line:
-                current_section = 'hopes_and_needs'
-                continue
-            elif '【総合的な援助方針】' in line or '援助方針' in line:
-                current_section = 'support_policy'
-                continue
-            elif '【長期目標】' in line or '長期目標' in line:
-                current_section = 'long_term_goal'
-                continue
-            elif '【短期目標】' in line or '短期目標' in line:
-                current_section = 'short_term_goal'
-                continue
-            elif '【推奨サービス】' in line or '推奨サービス' in line:
-                current_section = 'recommended_services'
-                continue
-
-            # 内容を追加
-            if current_section and line:
-                if current_section == 'recommended_services':
-                    # サービスはリストとして保存
-                    if line.startswith(('1.', '2.', '3.', '4.', '5.', '-', '•')):
-                        sections[current_section].append(line)
-                else:
-                    # その他のセクションはテキストとして結合
-                    if sections[current_section]:
-                        sections[current_section] += ' '
-                    sections[current_section] += line
-
-        return sections
+        parser = PlanProposalStreamParser()
+        parser.feed(response)
+        parser.close()
+        return parser.sections
 
     def get_available_models(self) -> List[Dict[str, Any]]:
         """
@@ -0,0 +1,434 @@
+"""
+AIコンテキスト一括取得サービス
+
+AI計画作成支援で使用するコンテキストデータ（利用者情報・服薬・相談記録・
+前回計画・計画評価・類似ケース）を、複数利用者分まとめて固定回数のクエリで取得します。
+"""
+import logging
+import unicodedata
+from typing import Dict, Any, Optional, List, Sequence, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+
+from app.models.user import User
+from app.models.plan import Plan
+from app.models.plan_evaluation import PlanEvaluation
+from app.models.consultation import Consultation
+from app.models.medication import Medication
+
+# 取得対象（利用者ID, 前回の計画ID）
+ContextTarget = Tuple[int, Optional[int]]
+
+# 切り詰めたテキストの末尾に付ける記号
+TRUNCATION_MARK = "…"
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class AIContextLoader:
+    """AI計画作成支援のコンテキストデータを一括取得するローダー"""
+
+    # 利用者ごとに取得する相談記録の件数
+    CONSULTATION_LIMIT = 5
+
+    def __init__(
+        self,
+        db: Session,
+        token_budget: Optional[int] = None,
+        similar_case_limit: Optional[int] = None
+    ):
+        """
+        初期化
+
+        Args:
+            db: データベースセッション
+            token_budget: 利用者1人あたりの長文項目の推定トークン数上限
+                （省略時は設定値 ai_context_token_budget、0以下で無制限）
+            similar_case_limit: 利用者1人あたりの類似ケース数
+                （省略時は設定値 ai_similar_case_top_k、0で取得しない）
+        """
+        self.db = db
+        self.token_budget = settings.ai_context_token_budget if token_budget is None else token_budget
+        self.similar_case_limit = (
+            settings.ai_similar_case_top_k if similar_case_limit is None else similar_case_limit
+        )
+
+    def load_one(self, user_id: int, previous_plan_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        1人の利用者のコンテキストデータを取得
+
+        Args:
+            user_id: 利用者ID
+            previous_plan_id: 前回の計画ID(任意)
+
+        Returns:
+            コンテキストデータ（利用者が見つからない場合はNone）
+        """
+        return self.load([(user_id, previous_plan_id)]).get((user_id, previous_plan_id))
+
+    def load(self, targets: Sequence[ContextTarget]) -> Dict[ContextTarget, Dict[str, Any]]:
+        """
+        複数の利用者のコンテキストデータを一括取得
+
+        対象件数にかかわらず、利用者・服薬・相談記録・前回計画・計画評価の
+        最大5回のクエリで取得します。削除済みの相談記録は含みません。
+        類似ケースを取得する場合は、インデックスの差分同期と類似ケースの取得が加わります。
+        長文項目はトークン予算に収まるよう切り詰めます。
+
+        Args:
+            targets: (利用者ID, 前回の計画ID) のリスト
+
+        Returns:
+            (利用者ID, 前回の計画ID) をキーとしたコンテキストデータ
+            （利用者が見つからない対象は含まれません）
+        """
+        if not targets:
+            return {}
+
+        user_ids = {user_id for user_id, _ in targets}
+        plan_ids = {plan_id for _, plan_id in targets if plan_id}
+
+        users = self._load_users(user_ids)
+        if not users:
+            return {}
+
+        user_ids = set(users)
+        medications = self._load_medications(user_ids)
+        consultations = self._load_consultations(user_ids)
+        previous_plans = self._load_plans(plan_ids)
+        evaluations = self._load_latest_evaluations(plan_ids)
+
+        contexts = {}
+        for user_id, plan_id in targets:
+            user = users.get(user_id)
+            if user is None:
+                continue
+
+            context = build_user_context(user)
+            context["medications"] = [
+                medication_context(med) for med in medications.get(user_id, [])
+            ]
+            context["consultations"] = [
+                consultation_context(cons) for cons in consultations.get(user_id, [])
+            ]
+
+            previous_plan = previous_plans.get(plan_id) if plan_id else None
+            if previous_plan:
+                context["previous_plan"] = plan_context(previous_plan)
+                evaluation = evaluations.get(plan_id)
+                if evaluation:
+                    context["previous_evaluation"] = evaluation_context(evaluation)
+
+            contexts[(user_id, plan_id)] = context
+
+        if self.similar_case_limit > 0:
+            self._attach_similar_cases(contexts)
+
+        for context in contexts.values():
+            apply_token_budget(context, self.token_budget)
+
+        return contexts
+
+    def _attach_similar_cases(self, contexts: Dict[ContextTarget, Dict[str, Any]]) -> None:
+        """
+        障害特性・前回の目標が近い他の利用者の計画を類似ケースとして追加
+
+        類似ケース検索は参考情報のため、失敗した場合も計画提案は継続します。
+        """
+        # numpyを使う検索インデックスは類似ケースを使う場合のみ読み込む
+        from app.services.similar_case_index import similar_case_index, load_cases
+
+        try:
+            similar_case_index.ensure_fresh(self.db)
+            matches = {
+                key: similar_case_index.search(
+                    similar_case_query(context), self.similar_case_limit, exclude_user_id=key[0]
+                )
+                for key, context in contexts.items()
+            }
+            cases = load_cases(
+                self.db, {plan_id for found in matches.values() for plan_id, _, _ in found}
+            )
+        except Exception as e:
+            logger.warning("類似ケースの取得に失敗しました: %s", e)
+            return
+
+        for key, found in matches.items():
+            contexts[key]["similar_cases"] = [
+                similar_case_context(cases[plan_id], similarity)
+                for plan_id, _, similarity in found
+                if plan_id in cases
+            ]
+
+    def _load_users(self, user_ids: set) -> Dict[int, User]:
+        """利用者を取得"""
+        return {
+            user.id: user
+            for user in self.db.query(User).filter(User.id.in_(user_ids)).all()
+        }
+
+    def _load_medications(self, user_ids: set) -> Dict[int, List[Medication]]:
+        """現在服用中の薬を利用者ごとに取得"""
+        result: Dict[int, List[Medication]] = {}
+        medications = self.db.query(Medication).filter(
+            Medication.user_id.in_(user_ids),
+            Medication.is_current == True
+        ).order_by(Medication.user_id, Medication.id).all()
+        for med in medications:
+            result.setdefault(med.user_id, []).append(med)
+        return result
+
+    def _load_consultations(self, user_ids: set) -> Dict[int, List[Consultation]]:
+        """直近の相談記録を利用者ごとに取得（ウィンドウ関数で件数を制限）"""
+        ranked = self.db.query(
+            Consultation.id.label("id"),
+            func.row_number().over(
+                partition_by=Consultation.user_id,
+                order_by=(Consultation.consultation_date.desc(), Consultation.id.desc())
+            ).label("rank")
+        ).filter(
+            Consultation.user_id.in_(user_ids),
+            Consultation.is_deleted == False
+        ).subquery()
+
+        consultations = self.db.query(Consultation).join(
+            ranked, Consultation.id == ranked.c.id
+        ).filter(
+            ranked.c.rank <= self.CONSULTATION_LIMIT
+        ).order_by(
+            Consultation.user_id, Consultation.consultation_date.desc(), Consultation.id.desc()
+        ).all()
+
+        result: Dict[int, List[Consultation]] = {}
+        for cons in consultations:
+            result.setdefault(cons.user_id, []).append(cons)
+        return result
+
+    def _load_plans(self, plan_ids: set) -> Dict[int, Plan]:
+        """前回の計画を取得"""
+        if not plan_ids:
+            return {}
+        return {
+            plan.id: plan
+            for plan in self.db.query(Plan).filter(Plan.id.in_(plan_ids)).all()
+        }
+
+    def _load_latest_evaluations(self, plan_ids: set) -> Dict[int, PlanEvaluation]:
+        """計画ごとに最新の評価を取得"""
+        if not plan_ids:
+            return {}
+
+        ranked = self.db.query(
+            PlanEvaluation.id.label("id"),
+            func.row_number().over(
+                partition_by=PlanEvaluation.plan_id,
+                order_by=(PlanEvaluation.evaluation_date.desc(), PlanEvaluation.id.desc())
+            ).label("rank")
+        ).filter(
+            PlanEvaluation.plan_id.in_(plan_ids)
+        ).subquery()
+
+        evaluations = self.db.query(PlanEvaluation).join(
+            ranked, PlanEvaluation.id == ranked.c.id
+        ).filter(ranked.c.rank == 1).all()
+
+        return {evaluation.plan_id: evaluation for evaluation in evaluations}
+
+
+def build_user_context(user: User) -> Dict[str, Any]:
+    """
+    利用者の基本情報からコンテキストの骨格を作成
+
+    Args:
+        user: 利用者
+
+    Returns:
+        コンテキストデータ（服薬・相談記録・前回計画は空）
+    """
+    context = {
+        "user_profile": {
+            "name": user.name,
+            "age": user.age,
+            "gender": user.gender,
+            "disability_support_level": user.disability_support_level,
+        },
+        "disability_info": None,
+        "medications": [],
+        "consultations": [],
+        "previous_plan": None,
+        "previous_evaluation": None,
+        "similar_cases": []
+    }
+
+    # 障害特性・興味の偏り情報
+    if user.disability_characteristics or user.interest_bias:
+        context["disability_info"] = {
+            "characteristics": user.disability_characteristics,
+            "interests": user.interest_bias
+        }
+
+    return context
+
+
+def medication_context(med: Medication) -> Dict[str, Any]:
+    """服薬情報をコンテキスト形式に変換"""
+    return {
+        "name": med.medication_name,
+        "purpose": med.purpose,
+        "dosage": med.dosage,
+        "frequency": med.frequency
+    }
+
+
+def consultation_context(cons: Consultation) -> Dict[str, Any]:
+    """相談記録をコンテキスト形式に変換"""
+    return {
+        "date": cons.consultation_date.isoformat(),
+        "type": cons.consultation_type,
+        "content": cons.content
+    }
+
+
+def plan_context(plan: Plan) -> Dict[str, Any]:
+    """計画をコンテキスト形式に変換"""
+    return {
+        "start_date": plan.start_date.isoformat(),
+        "end_date": plan.end_date.isoformat(),
+        "current_situation": plan.current_situation,
+        "hopes_and_needs": plan.hopes_and_needs,
+        "support_policy": plan.support_policy,
+        "long_term_goal": plan.long_term_goal,
+        "short_term_goal": plan.short_term_goal,
+        "services": plan.services
+    }
+
+
+def evaluation_context(evaluation: PlanEvaluation) -> Dict[str, Any]:
+    """計画評価をコンテキスト形式に変換"""
+    return {
+        "achievement_status": evaluation.achievement_status,
+        "achievement_details": evaluation.achievement_details,
+        "overall_evaluation": evaluation.overall_evaluation,
+        "challenges": evaluation.challenges,
+        "next_actions": evaluation.next_actions
+    }
+
+
+def similar_case_context(case: Dict[str, Any], similarity: float) -> Dict[str, Any]:
+    """類似ケースをコンテキスト形式に変換（個人を特定できる項目は含めない）"""
+    return {
+        "similarity": round(similarity, 3),
+        "disability_characteristics": case["disability_characteristics"],
+        "long_term_goal": case["long_term_goal"],
+        "short_term_goal": case["short_term_goal"],
+        "overall_evaluation": case["overall_evaluation"]
+    }
+
+
+def similar_case_query(context: Dict[str, Any]) -> str:
+    """
+    類似ケース検索に使うテキストを作成
+
+    Args:
+        context: コンテキストデータ
+
+    Returns:
+        障害特性・興味の偏り・前回の目標を連結したテキスト
+    """
+    disability_info = context.get("disability_info") or {}
+    previous_plan = context.get("previous_plan") or {}
+    parts = (
+        disability_info.get("characteristics"),
+        disability_info.get("interests"),
+        previous_plan.get("long_term_goal"),
+        previous_plan.get("short_term_goal"),
+    )
+    return "\n".join(part for part in parts if part)
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    テキストの推定トークン数を計算
+
+    日本語などの全角文字は1文字1トークン、半角文字は4文字1トークンとして概算します。
+
+    Args:
+        text: 対象テキスト
+
+    Returns:
+        推定トークン数
+    """
+    if not text:
+        return 0
+    wide = sum(1 for ch in text if unicodedata.east_asian_width(ch) in ("W", "F"))
+    return wide + (len(text) - wide + 3) // 4
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """推定トークン数が上限に収まるようにテキストを末尾から切り詰める"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    used = 0
+    for i, ch in enumerate(text):
+        used += 1 if unicodedata.east_asian_width(ch) in ("W", "F") else 0.25
+        if used > max_tokens - 1:
+            return text[:i].rstrip() + TRUNCATION_MARK
+    return text
+
+
+def apply_token_budget(context: Dict[str, Any], token_budget: int) -> None:
+    """
+    コンテキスト中の長文項目をトークン予算内に切り詰める
+
+    相談内容・障害特性・前回計画・評価・類似ケースなどの自由記述項目の合計が予算を超える場合、
+    各項目に均等な上限を設け（短い項目は全文を残し、余りを長い項目に配分）、
+    上限を超える項目だけを切り詰めます。
+
+    Args:
+        context: コンテキストデータ（その場で更新）
+        token_budget: 推定トークン数の上限（0以下で無制限）
+    """
+    if token_budget <= 0:
+        return
+
+    fields = []
+    for cons in context.get("consultations", []):
+        fields.append((cons, "content"))
+    for case in context.get("similar_cases", []):
+        fields.extend(
+            (case, key)
+            for key in ("disability_characteristics", "long_term_goal", "short_term_goal", "overall_evaluation")
+            if case.get(key)
+        )
+    for section, keys in (
+        ("disability_info", ("characteristics", "interests")),
+        ("previous_plan", ("current_situation", "hopes_and_needs", "support_policy",
+                           "long_term_goal", "short_term_goal")),
+        ("previous_evaluation", ("achievement_details", "overall_evaluation",
+                                 "challenges", "next_actions")),
+    ):
+        data = context.get(section)
+        if data:
+            fields.extend((data, key) for key in keys if data.get(key))
+
+    sizes = [estimate_tokens(data[key]) for data, key in fields]
+    if sum(sizes) <= token_budget:
+        return
+
+    # 短い項目から順に全文を割り当て、残りの予算を長い項目で均等に分ける
+    remaining = token_budget
+    cap = 0
+    for index, size in enumerate(sorted(sizes)):
+        share = remaining // (len(sizes) - index)
+        if size > share:
+            cap = share
+            break
+        remaining -= size
+
+    for (data, key), size in zip(fields, sizes):
+        if size > cap:
+            data[key] = _truncate_to_tokens(data[key], cap)
@@ -0,0 +1,376 @@
+"""
+AI生成ジョブキューサービス
+
+ai_generation_jobs テーブルを永続キューとして使用し、AI生成処理を
+バックグラウンドのワーカースレッドで実行します。
+"""
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Callable, List
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database.connection import SessionLocal
+from app.models.ai_generation_job import AIGenerationJob
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def _run_plan_proposal(db: Session, job: AIGenerationJob) -> Dict[str, Any]:
+    """計画提案ジョブを実行"""
+    from app.services.ai_assistant_service import OllamaAIAssistantService
+
+    params = job.params
+    ai_service = OllamaAIAssistantService(db, model=params.get("model") or "llama3")
+    return ai_service.generate_plan_proposal(
+        user_id=params["user_id"],
+        previous_plan_id=params.get("previous_plan_id"),
+        force_regenerate=params.get("force_regenerate", False)
+    )
+
+
+def _run_plan_renewal(db: Session, job: AIGenerationJob) -> Dict[str, Any]:
+    """更新計画案ジョブを実行し、作成中の計画として保存"""
+    from app.models.plan import Plan
+    from app.services.ai_assistant_service import OllamaAIAssistantService
+    from app.services.plan_renewal_service import PlanRenewalService
+
+    params = job.params
+    previous_plan = db.query(Plan).filter(
+        Plan.id == params["previous_plan_id"],
+        Plan.is_deleted == False
+    ).first()
+    if not previous_plan:
+        raise ValueError(f"計画ID {params['previous_plan_id']} が見つかりません")
+
+    ai_service = OllamaAIAssistantService(db, model=params.get("model") or "llama3")
+    proposal_result = ai_service.generate_from_context(
+        user_id=previous_plan.user_id,
+        previous_plan_id=previous_plan.id,
+        context_data=params["context"]
+    )
+
+    draft = PlanRenewalService(db).create_draft(previous_plan, proposal_result["proposal"], params["staff_id"])
+
+    return {
+        "plan_id": draft.id,
+        "previous_plan_id": previous_plan.id,
+        **proposal_result
+    }
+
+
+# ジョブ種別ごとの実行関数
+JOB_HANDLERS: Dict[str, Callable[[Session, AIGenerationJob], Dict[str, Any]]] = {
+    "plan_proposal": _run_plan_proposal,
+    "plan_renewal": _run_plan_renewal,
+}
+
+
+class AIJobQueue:
+    """AI生成ジョブの登録・取り出し・状態更新を行うキュー"""
+
+    def __init__(self, db: Session):
+        """
+        初期化
+
+        Args:
+            db: データベースセッション
+        """
+        self.db = db
+
+    def submit(
+        self,
+        job_type: str,
+        params: Dict[str, Any],
+        user_id: Optional[int] = None,
+        commit: bool = True
+    ) -> AIGenerationJob:
+        """
+        ジョブを登録
+
+        Args:
+            job_type: ジョブ種別
+            params: ジョブパラメータ
+            user_id: 対象利用者ID
+            commit: Trueの場合はコミットまで行う
+
+        Returns:
+            登録されたジョブ
+
+        Raises:
+            ValueError: 未対応のジョブ種別の場合
+        """
+        if job_type not in JOB_HANDLERS:
+            raise ValueError(f"未対応のジョブ種別です: {job_type}")
+
+        job = AIGenerationJob(
+            job_type=job_type,
+            user_id=user_id,
+            params=params,
+            status=AIGenerationJob.STATUS_QUEUED,
+            attempts=0,
+            max_attempts=settings.ai_job_max_attempts,
+            available_at=datetime.utcnow()
+        )
+        self.db.add(job)
+        if commit:
+            self.db.commit()
+            self.db.refresh(job)
+        return job
+
+    def get(self, job_id: int) -> Optional[AIGenerationJob]:
+        """
+        ジョブを取得
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            ジョブ（存在しない場合はNone）
+        """
+        return self.db.query(AIGenerationJob).filter(AIGenerationJob.id == job_id).first()
+
+    def claim_next(self) -> Optional[AIGenerationJob]:
+        """
+        実行可能なジョブを1件取り出して実行中にする
+
+        条件付きUPDATE（状態・実行開始日時が取得時と同じ場合のみ更新）で状態を変更するため、
+        複数プロセスのワーカーが同じジョブを二重に取り出すことはありません。
+        タイムアウトを超えて実行中のままのジョブ（プロセス停止など）は再実行対象とし、
+        最大実行回数に達している場合は再実行せずに失敗とします。
+
+        Returns:
+            取り出したジョブ（実行可能なジョブがない場合はNone）
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=settings.ai_job_timeout_seconds)
+
+        candidates = self.db.query(
+            AIGenerationJob.id, AIGenerationJob.status, AIGenerationJob.started_at,
+            AIGenerationJob.attempts, AIGenerationJob.max_attempts
+        ).filter(
+            ((AIGenerationJob.status == AIGenerationJob.STATUS_QUEUED) & (AIGenerationJob.available_at <= now)) |
+            ((AIGenerationJob.status == AIGenerationJob.STATUS_RUNNING) & (AIGenerationJob.started_at < stale_before))
+        ).order_by(AIGenerationJob.available_at, AIGenerationJob.id).limit(5).all()
+
+        for candidate in candidates:
+            unchanged = self.db.query(AIGenerationJob).filter(
+                AIGenerationJob.id == candidate.id,
+                AIGenerationJob.status == candidate.status
+            )
+            if candidate.status == AIGenerationJob.STATUS_RUNNING:
+                # 取得後に他のワーカーが取り出した場合は started_at が変わるため更新されない
+                unchanged = unchanged.filter(AIGenerationJob.started_at == candidate.started_at)
+
+                if candidate.attempts >= candidate.max_attempts:
+                    unchanged.update(
+                        {
+                            AIGenerationJob.status: AIGenerationJob.STATUS_FAILED,
+                            AIGenerationJob.error_message: "タイムアウトしました（最大実行回数に達したため再実行しません）",
+                            AIGenerationJob.finished_at: now,
+                        },
+                        synchronize_session=False
+                    )
+                    self.db.commit()
+                    continue
+
+            claimed = unchanged.update(
+                {
+                    AIGenerationJob.status: AIGenerationJob.STATUS_RUNNING,
+                    AIGenerationJob.started_at: now,
+                    AIGenerationJob.attempts: AIGenerationJob.attempts + 1,
+                },
+                synchronize_session=False
+            )
+            self.db.commit()
+            if claimed == 1:
+                return self.get(candidate.id)
+
+        return None
+
+    def _finish(self, job_id: int, started_at: Optional[datetime], values: Dict[Any, Any]) -> bool:
+        """
+        実行中のジョブの状態を更新（条件付きUPDATE）
+
+        started_at を指定した場合は、その実行（取り出し）のままの場合のみ更新します。
+        タイムアウトで他のワーカーが再実行している場合などは更新しません。
+
+        Args:
+            job_id: ジョブID
+            started_at: 取り出し時の実行開始日時（Noneの場合は実行中であれば更新）
+            values: 更新する値
+
+        Returns:
+            更新した場合はTrue
+        """
+        query = self.db.query(AIGenerationJob).filter(
+            AIGenerationJob.id == job_id,
+            AIGenerationJob.status == AIGenerationJob.STATUS_RUNNING
+        )
+        if started_at is not None:
+            query = query.filter(AIGenerationJob.started_at == started_at)
+        updated = query.update(values, synchronize_session=False)
+        self.db.commit()
+        if not updated:
+            logger.warning("AI生成ジョブ %s は他のワーカーが再実行中または終了済みのため、結果を記録しません", job_id)
+        return updated == 1
+
+    def mark_succeeded(self, job: AIGenerationJob, result: Dict[str, Any]) -> None:
+        """
+        ジョブを完了にする
+
+        タイムアウト後に再実行されている場合も、先に完了した結果を記録します。
+
+        Args:
+            job: ジョブ
+            result: 実行結果
+        """
+        self._finish(job.id, None, {
+            AIGenerationJob.status: AIGenerationJob.STATUS_SUCCEEDED,
+            AIGenerationJob.result: result,
+            AIGenerationJob.error_message: None,
+            AIGenerationJob.finished_at: datetime.utcnow(),
+        })
+
+    def mark_failed(
+        self,
+        job: AIGenerationJob,
+        error: str,
+        retryable: bool = True,
+        started_at: Optional[datetime] = None,
+        attempts: Optional[int] = None
+    ) -> None:
+        """
+        ジョブの失敗を記録
+
+        最大実行回数に達していなければ、指数バックオフで待機後に再実行します。
+        タイムアウト後に他のワーカーが再実行している場合は記録しません。
+
+        Args:
+            job: ジョブ
+            error: エラー内容
+            retryable: Falseの場合は再実行せずに失敗とする
+            started_at: 取り出し時の実行開始日時（省略時は job.started_at）
+            attempts: 取り出し時の実行回数（省略時は job.attempts）
+        """
+        started_at = started_at if started_at is not None else job.started_at
+        attempts = attempts if attempts is not None else job.attempts
+        if retryable and attempts < job.max_attempts:
+            delay = settings.ai_job_retry_backoff_seconds * (2 ** (attempts - 1))
+            values = {
+                AIGenerationJob.status: AIGenerationJob.STATUS_QUEUED,
+                AIGenerationJob.available_at: datetime.utcnow() + timedelta(seconds=delay),
+            }
+        else:
+            values = {
+                AIGenerationJob.status: AIGenerationJob.STATUS_FAILED,
+                AIGenerationJob.finished_at: datetime.utcnow(),
+            }
+        values[AIGenerationJob.error_message] = error
+        self._finish(job.id, started_at, values)
+
+    def run_job(self, job: AIGenerationJob) -> None:
+        """
+        取り出したジョブを実行し、結果を記録
+
+        Args:
+            job: 実行中にしたジョブ
+        """
+        # 失敗時のロールバック後に再読み込みすると他のワーカーの値になる場合があるため、取り出し時の値を保持
+        started_at, attempts = job.started_at, job.attempts
+
+        handler = JOB_HANDLERS.get(job.job_type)
+        if handler is None:
+            self.mark_failed(job, f"未対応のジョブ種別です: {job.job_type}", retryable=False, started_at=started_at)
+            return
+
+        try:
+            result = handler(self.db, job)
+        except ValueError as e:
+            # 利用者が見つからないなど、再実行しても解決しないエラー
+            self.db.rollback()
+            self.mark_failed(job, str(e), retryable=False, started_at=started_at, attempts=attempts)
+        except Exception as e:
+            self.db.rollback()
+            logger.warning("AI生成ジョブ %s が失敗しました (%s回目): %s", job.id, attempts, e)
+            self.mark_failed(job, str(e), started_at=started_at, attempts=attempts)
+        else:
+            self.mark_succeeded(job, result)
+
+
+class AIJobWorkerPool:
+    """
+    AI生成ジョブのワーカープール
+
+    設定された数のワーカースレッドがキューテーブルをポーリングし、
+    ジョブを1件ずつ実行します。
+    """
+
+    def __init__(self, workers: int, poll_interval: float):
+        """
+        初期化
+
+        Args:
+            workers: ワーカースレッド数（0の場合は起動しない）
+            poll_interval: キューが空のときのポーリング間隔（秒）
+        """
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        """ワーカースレッドを起動"""
+        if self._threads:
+            return
+
+        self._stop_event.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"ai-job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        ワーカースレッドを停止
+
+        実行中の生成処理は中断できないため、timeout を過ぎたスレッドは
+        デーモンスレッドとしてプロセス終了時に破棄されます。
+        中断されたジョブはタイムアウト後に再実行されます。
+
+        Args:
+            timeout: 各スレッドの終了待ち時間（秒）
+        """
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def _run(self) -> None:
+        """ワーカースレッドのメインループ"""
+        while not self._stop_event.is_set():
+            processed = False
+            db = SessionLocal()
+            try:
+                queue = AIJobQueue(db)
+                job = queue.claim_next()
+                if job is not None:
+                    queue.run_job(job)
+                    processed = True
+            except Exception:
+                logger.exception("AI生成ジョブワーカーでエラーが発生しました")
+            finally:
+                db.close()
+
+            if not processed:
+                self._stop_event.wait(self.poll_interval)
+
+
+# アプリケーション全体で共有するワーカープール
+worker_pool = AIJobWorkerPool(
+    workers=settings.ai_job_workers,
+    poll_interval=settings.ai_job_poll_interval_seconds
+)
@@ -0,0 +1,279 @@
+"""
+カレンダーサービス
+
+計画の開始日・終了日、次回モニタリング予定日、手帳の更新日、障害支援区分の
+有効期限を、日付列のインデックスを使うUNION ALLの1回のクエリで期間ごとに取得し、
+カレンダーの予定一覧とiCalendar形式の出力を提供します。
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Optional, List, Iterable
+
+from sqlalchemy import select, union_all, literal, and_, cast, String
+from sqlalchemy.orm import Session
+
+from app.models.monitoring_schedule import MonitoringSchedule
+from app.models.notebook import Notebook
+from app.models.plan import Plan
+from app.models.user import User
+
+# 予定の種別
+EVENT_PLAN_START = "計画開始"
+EVENT_PLAN_END = "計画終了"
+EVENT_MONITORING = "モニタリング予定"
+EVENT_NOTEBOOK_RENEWAL = "手帳更新"
+EVENT_CERTIFICATION_EXPIRY = "障害支援区分有効期限"
+
+EVENT_TYPES = (
+    EVENT_PLAN_START,
+    EVENT_PLAN_END,
+    EVENT_MONITORING,
+    EVENT_NOTEBOOK_RENEWAL,
+    EVENT_CERTIFICATION_EXPIRY,
+)
+
+# 同じ日の予定の並び順
+EVENT_ORDER = {event_type: order for order, event_type in enumerate(EVENT_TYPES)}
+
+# iCalendarの製品識別子・UIDのドメイン
+ICALENDAR_PRODID = "-//keikaku-sodan//calendar//JA"
+ICALENDAR_UID_DOMAIN = "keikaku-sodan"
+
+
+class CalendarService:
+    """カレンダーサービス"""
+
+    def __init__(self, db: Session):
+        """
+        初期化
+
+        Args:
+            db: データベースセッション
+        """
+        self.db = db
+
+    def get_events(
+        self,
+        start_date: date,
+        end_date: date,
+        staff_id: Optional[int] = None,
+        event_types: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        期間内の予定を取得
+
+        予定の担当スタッフは利用者の担当スタッフとします。
+
+        Args:
+            start_date: 期間の開始日
+            end_date: 期間の終了日
+            staff_id: 担当スタッフIDで絞り込み(任意)
+            event_types: 取得する予定の種別(任意、省略時はすべて)
+
+        Returns:
+            日付順の予定一覧
+        """
+        selected = set(event_types) if event_types else set(EVENT_TYPES)
+
+        def in_window(column):
+            return and_(column >= start_date, column <= end_date)
+
+        def for_user(query):
+            query = query.where(User.is_deleted == False)
+            if staff_id:
+                query = query.where(User.assigned_staff_id == staff_id)
+            return query
+
+        queries = []
+
+        if EVENT_PLAN_START in selected:
+            queries.append(for_user(self._plan_events(Plan.start_date, EVENT_PLAN_START)).where(
+                in_window(Plan.start_date)
+            ))
+
+        if EVENT_PLAN_END in selected:
+            queries.append(for_user(self._plan_events(Plan.end_date, EVENT_PLAN_END)).where(
+                in_window(Plan.end_date)
+            ))
+
+        if EVENT_MONITORING in selected:
+            queries.append(for_user(select(
+                MonitoringSchedule.due_date.label("event_date"),
+                literal(EVENT_MONITORING).label("event_type"),
+                literal(EVENT_ORDER[EVENT_MONITORING]).label("event_order"),
+                MonitoringSchedule.plan_id.label("ref_id"),
+                User.id.label("user_id"),
+                User.name.label("user_name"),
+                User.assigned_staff_id.label("staff_id"),
+                MonitoringSchedule.basis.label("detail"),
+            ).join(
+                User, MonitoringSchedule.user_id == User.id
+            )).where(
+                in_window(MonitoringSchedule.due_date)
+            ))
+
+        if EVENT_NOTEBOOK_RENEWAL in selected:
+            queries.append(for_user(select(
+                Notebook.renewal_date,
+                literal(EVENT_NOTEBOOK_RENEWAL),
+                literal(EVENT_ORDER[EVENT_NOTEBOOK_RENEWAL]),
+                Notebook.id,
+                User.id,
+                User.name,
+                User.assigned_staff_id,
+                Notebook.notebook_type,
+            ).join(
+                User, Notebook.user_id == User.id
+            )).where(
+                Notebook.is_deleted == False,
+                in_window(Notebook.renewal_date)
+            ))
+
+        if EVENT_CERTIFICATION_EXPIRY in selected:
+            queries.append(for_user(select(
+                User.disability_support_expiry_date,
+                literal(EVENT_CERTIFICATION_EXPIRY),
+                literal(EVENT_ORDER[EVENT_CERTIFICATION_EXPIRY]),
+                User.id,
+                User.id,
+                User.name,
+                User.assigned_staff_id,
+                cast(User.disability_support_level, String),
+            )).where(
+                in_window(User.disability_support_expiry_date)
+            ))
+
+        if not queries:
+            return []
+
+        events = union_all(*queries).subquery()
+        rows = self.db.execute(
+            select(events).order_by(
+                events.c.event_date,
+                events.c.event_order,
+                events.c.user_id,
+                events.c.ref_id
+            )
+        ).all()
+
+        return [_to_event(row) for row in rows]
+
+    def _plan_events(self, date_column, event_type: str):
+        """計画の開始日・終了日の予定を取得するクエリ"""
+        return select(
+            date_column.label("event_date"),
+            literal(event_type).label("event_type"),
+            literal(EVENT_ORDER[event_type]).label("event_order"),
+            Plan.id.label("ref_id"),
+            User.id.label("user_id"),
+            User.name.label("user_name"),
+            User.assigned_staff_id.label("staff_id"),
+            Plan.plan_number.label("detail"),
+        ).join(
+            User, Plan.user_id == User.id
+        ).where(
+            Plan.is_deleted == False
+        )
+
+
+def _to_event(row: Any) -> Dict[str, Any]:
+    """クエリ結果の行を予定に変換"""
+    if row.event_type in (EVENT_PLAN_START, EVENT_PLAN_END):
+        title = f"{row.event_type}（{row.user_name}）"
+        detail = f"計画番号: {row.detail}" if row.detail else None
+        link = f"/plans/{row.ref_id}"
+    elif row.event_type == EVENT_MONITORING:
+        title = f"モニタリング（{row.user_name}）"
+        detail = f"算出根拠: {row.detail}" if row.detail else None
+        link = f"/plans/{row.ref_id}"
+    elif row.event_type == EVENT_NOTEBOOK_RENEWAL:
+        title = f"{row.detail or '手帳'}更新（{row.user_name}）"
+        detail = None
+        link = f"/users/{row.user_id}"
+    else:
+        title = f"障害支援区分有効期限（{row.user_name}）"
+        detail = f"障害支援区分: {row.detail}" if row.detail else None
+        link = f"/users/{row.user_id}"
+
+    return {
+        "date": row.event_date,
+        "event_type": row.event_type,
+        "ref_id": row.ref_id,
+        "user_id": row.user_id,
+        "user_name": row.user_name,
+        "staff_id": row.staff_id,
+        "title": title,
+        "detail": detail,
+        "link": link,
+    }
+
+
+def _escape_text(value: str) -> str:
+    """iCalendarのTEXT値をエスケープ"""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold_line(line: str) -> List[str]:
+    """iCalendarの行を75オクテット以内に折り返す（UTF-8の文字境界で分割）"""
+    folded = []
+    current, size = "", 0
+    for ch in line:
+        ch_size = len(ch.encode("utf-8"))
+        if size + ch_size > 75:
+            folded.append(current)
+            # 継続行は先頭の空白1文字分を含めて75オクテット以内
+            current, size = " ", 1
+        current += ch
+        size += ch_size
+    folded.append(current)
+    return folded
+
+
+def to_icalendar(events: List[Dict[str, Any]], calendar_name: str = "計画相談支援") -> str:
+    """
+    予定をiCalendar（RFC 5545）形式に変換
+
+    予定はすべて終日の予定として出力します。
+
+    Args:
+        events: get_events で取得した予定一覧
+        calendar_name: カレンダー名
+
+    Returns:
+        iCalendar形式の文字列
+    """
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{ICALENDAR_PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape_text(calendar_name)}",
+    ]
+
+    for event in events:
+        event_date = event["date"]
+        # 種別と対象IDで一意（日付が変わっても同じ予定として更新される）
+        uid = f"{EVENT_ORDER[event['event_type']]}-{event['ref_id']}@{ICALENDAR_UID_DOMAIN}"
+        lines.extend([
+            "BEGIN:VEVENT",
+            f"UID:{uid}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{event_date:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{event_date + timedelta(days=1):%Y%m%d}",
+            f"SUMMARY:{_escape_text(event['title'])}",
+            f"CATEGORIES:{_escape_text(event['event_type'])}",
+        ])
+        if event["detail"]:
+            lines.append(f"DESCRIPTION:{_escape_text(event['detail'])}")
+        lines.append("END:VEVENT")
+
+    lines.append("END:VCALENDAR")
+
+    return "".join(f"{folded}\r\n" for line in lines for folded in _fold_line(line))
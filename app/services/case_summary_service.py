@@ -0,0 +1,101 @@
+"""
+ケースサマリーサービス
+
+利用者詳細画面に必要な情報（基本情報・手帳・服薬・相談記録・計画・
+モニタリング・関係機関）を、関連ごとにまとめて読み込む（selectin）ことで
+利用者の記録数によらない一定のクエリ数で取得します。
+"""
+from typing import Dict, Any, Optional
+
+from sqlalchemy.orm import Session, selectinload, joinedload
+
+from app.models.consultation import Consultation
+from app.models.medication import Medication
+from app.models.monitoring import Monitoring
+from app.models.notebook import Notebook
+from app.models.plan import Plan
+from app.models.user import User
+from app.models.user_organization import UserOrganization
+from app.services.monitoring_schedule_service import MonitoringScheduleService
+
+# 相談記録・モニタリング記録の表示件数（最新のもの）
+DEFAULT_RECENT_LIMIT = 10
+
+# 服薬情報の出力項目
+MEDICATION_COLUMNS = tuple(column.key for column in Medication.__table__.columns)
+
+
+class CaseSummaryService:
+    """ケースサマリーサービス"""
+
+    def __init__(self, db: Session):
+        """
+        初期化
+
+        Args:
+            db: データベースセッション
+        """
+        self.db = db
+
+    def get_summary(self, user_id: int, recent_limit: int = DEFAULT_RECENT_LIMIT) -> Optional[Dict[str, Any]]:
+        """
+        利用者のケースサマリーを取得
+
+        関連ごとに1回のクエリ（selectin）でまとめて読み込みます。
+        相談記録・モニタリング記録は最新のものを recent_limit 件まで返し、総件数を添えます。
+
+        Args:
+            user_id: 利用者ID
+            recent_limit: 相談記録・モニタリング記録の件数上限
+
+        Returns:
+            ケースサマリー（利用者が見つからない場合はNone）
+        """
+        user = self.db.query(User).options(
+            joinedload(User.assigned_staff),
+            selectinload(User.notebooks.and_(Notebook.is_deleted == False)),
+            selectinload(User.medications).joinedload(Medication.prescribing_doctor),
+            selectinload(User.consultations.and_(Consultation.is_deleted == False)),
+            selectinload(User.plans.and_(Plan.is_deleted == False)),
+            selectinload(User.monitorings.and_(Monitoring.is_deleted == False)),
+            selectinload(
+                User.user_organizations.and_(UserOrganization.is_deleted == False)
+            ).joinedload(UserOrganization.organization),
+        ).filter(User.id == user_id).first()
+
+        if not user:
+            return None
+
+        consultations = sorted(
+            user.consultations, key=lambda c: (c.consultation_date, c.id), reverse=True
+        )
+        plans = sorted(user.plans, key=lambda p: (p.created_date, p.id), reverse=True)
+        monitorings = sorted(
+            user.monitorings, key=lambda m: (m.monitoring_date, m.id), reverse=True
+        )
+        medications = sorted(
+            user.medications,
+            key=lambda m: (m.start_date is not None, m.start_date, m.id),
+            reverse=True
+        )
+
+        return {
+            "user": user,
+            "assigned_staff_name": user.assigned_staff.name if user.assigned_staff else None,
+            "notebooks": sorted(user.notebooks, key=lambda n: n.id),
+            "medications": [
+                {
+                    **{column: getattr(med, column) for column in MEDICATION_COLUMNS},
+                    "prescribing_doctor_name": med.prescribing_doctor.name if med.prescribing_doctor else None,
+                    "prescribing_doctor_hospital": med.prescribing_doctor.hospital_name if med.prescribing_doctor else None,
+                }
+                for med in medications
+            ],
+            "consultations": consultations[:recent_limit],
+            "consultations_total": len(consultations),
+            "plans": plans,
+            "monitorings": monitorings[:recent_limit],
+            "monitorings_total": len(monitorings),
+            "next_monitoring": MonitoringScheduleService(self.db).for_user(user.id),
+        }
+
@@ -0,0 +1,197 @@
+"""
+薬品辞書サービス
+
+薬品情報の辞書ファイル（JSON/CSV）を一度だけ読み込んで索引を作成し、
+商品名・一般名・読みの前方一致と部分一致（2-gram索引）による検索を提供します。
+ひらがな/カタカナ、全角/半角の違いは正規化して吸収します。
+"""
+import csv
+import json
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Set, Tuple
+
+from app.config import get_settings
+from app.utils.kana_converter import hiragana_to_katakana
+
+# 同梱の薬品辞書
+DEFAULT_DICTIONARY_PATH = Path(__file__).resolve().parent.parent / "data" / "drug_dictionary.json"
+
+# 辞書の項目
+DRUG_FIELDS = (
+    "name", "reading", "generic_name", "effects", "side_effects",
+    "dosage_form", "manufacturer", "warnings",
+)
+
+# 検索対象の項目と一致種別ごとの順位（小さいほど上位）
+SEARCH_KEYS = ("name", "generic_name", "reading")
+RANK_EXACT = 0
+RANK_NAME_PREFIX = 1
+RANK_PREFIX = 2
+RANK_PARTIAL = 3
+
+
+def normalize_drug_text(text: Optional[str]) -> str:
+    """
+    検索用にテキストを正規化
+
+    全角英数・半角カナをNFKCで統一し、ひらがなをカタカナに、英字を小文字にして
+    空白と中黒を除去します。
+
+    Args:
+        text: 対象テキスト
+
+    Returns:
+        正規化されたテキスト
+    """
+    if not text:
+        return ""
+    normalized = hiragana_to_katakana(unicodedata.normalize("NFKC", text)).lower()
+    return "".join(ch for ch in normalized if not ch.isspace() and ch != "・")
+
+
+def _bigrams(text: str) -> Set[str]:
+    """文字2-gramの集合"""
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class DrugDictionary:
+    """
+    薬品辞書の索引
+
+    - 前方一致: 正規化したキーのソート済み配列を二分探索
+    - 部分一致: 2-gramの転置索引で候補を絞り込んでから照合
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        """
+        初期化（索引を作成）
+
+        Args:
+            entries: 薬品情報のリスト（name は必須）
+        """
+        self.entries = entries
+        self._keys: List[Tuple[str, ...]] = []
+        self._by_name: Dict[str, int] = {}
+        self._sorted_keys: List[Tuple[str, int, int]] = []
+        self._bigram_index: Dict[str, Set[int]] = {}
+
+        for entry_id, entry in enumerate(entries):
+            keys = tuple(normalize_drug_text(entry.get(key)) for key in SEARCH_KEYS)
+            self._keys.append(keys)
+            self._by_name.setdefault(keys[0], entry_id)
+            for key_index, key in enumerate(keys):
+                if not key:
+                    continue
+                self._sorted_keys.append((key, entry_id, key_index))
+                for gram in _bigrams(key):
+                    self._bigram_index.setdefault(gram, set()).add(entry_id)
+
+        self._sorted_keys.sort()
+        self._sorted_values = [key for key, _, _ in self._sorted_keys]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        商品名の完全一致で薬品を取得
+
+        Args:
+            name: 商品名
+
+        Returns:
+            薬品情報（見つからない場合はNone）
+        """
+        entry_id = self._by_name.get(normalize_drug_text(name))
+        return self.entries[entry_id] if entry_id is not None else None
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        薬品を検索
+
+        完全一致、商品名の前方一致、一般名・読みの前方一致、部分一致の順に、
+        同順位内では名称の短い順に並べます。
+
+        Args:
+            query: 検索キーワード
+            limit: 取得件数上限
+
+        Returns:
+            薬品情報のリスト
+        """
+        normalized = normalize_drug_text(query)
+        if not normalized:
+            return []
+
+        ranks: Dict[int, int] = {}
+
+        # 前方一致（ソート済みキーの範囲を二分探索）
+        position = bisect_left(self._sorted_values, normalized)
+        while position < len(self._sorted_keys) and self._sorted_values[position].startswith(normalized):
+            key, entry_id, key_index = self._sorted_keys[position]
+            if key == normalized:
+                rank = RANK_EXACT
+            elif key_index == 0:
+                rank = RANK_NAME_PREFIX
+            else:
+                rank = RANK_PREFIX
+            ranks[entry_id] = min(rank, ranks.get(entry_id, RANK_PARTIAL))
+            position += 1
+
+        # 部分一致（2-gram索引の積集合を候補とし、文字列で確認）
+        grams = _bigrams(normalized)
+        if grams:
+            postings = sorted((self._bigram_index.get(gram, set()) for gram in grams), key=len)
+            candidates = set.intersection(*postings) if postings[0] else set()
+            for entry_id in candidates:
+                if entry_id not in ranks and any(normalized in key for key in self._keys[entry_id]):
+                    ranks[entry_id] = RANK_PARTIAL
+
+        ordered = sorted(
+            ranks.items(),
+            key=lambda item: (item[1], len(self._keys[item[0]][0]), self._keys[item[0]][0])
+        )
+        return [self.entries[entry_id] for entry_id, _ in ordered[:limit]]
+
+
+def load_drug_entries(path: Path) -> List[Dict[str, Any]]:
+    """
+    辞書ファイルを読み込む
+
+    JSONは薬品情報の配列、CSVはヘッダー行に項目名（name, generic_name など）を
+    持つ形式とします。
+
+    Args:
+        path: 辞書ファイルのパス
+
+    Returns:
+        薬品情報のリスト
+
+    Raises:
+        ValueError: 未対応のファイル形式の場合
+    """
+    if path.suffix.lower() == ".json":
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)
+    elif path.suffix.lower() == ".csv":
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        raise ValueError(f"未対応の薬品辞書ファイル形式です: {path}")
+
+    return [
+        {field: (row.get(field) or None) for field in DRUG_FIELDS}
+        for row in rows
+        if row.get("name")
+    ]
+
+
+@lru_cache()
+def get_drug_dictionary() -> DrugDictionary:
+    """薬品辞書のシングルトンインスタンスを取得（初回のみファイルを読み込む）"""
+    settings = get_settings()
+    path = Path(settings.drug_dictionary_path) if settings.drug_dictionary_path else DEFAULT_DICTIONARY_PATH
+    return DrugDictionary(load_drug_entries(path))
@@ -0,0 +1,283 @@
+"""
+薬の飲み合わせチェックサービス
+
+相互作用・同種同効薬の規則表（JSON）を一度だけ読み込み、既知の薬の組み合わせごとの
+指摘事項を事前計算した表を作成します。利用者ごとの服用中の薬のチェックと、
+担当利用者全体の一括チェックを提供します。
+
+※チェック結果は参考情報です。判断は必ず医師・薬剤師に確認してください。
+"""
+import json
+import re
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, Any, Optional, List, FrozenSet, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.medication import Medication
+from app.models.user import User
+from app.services.drug_dictionary import get_drug_dictionary, normalize_drug_text
+
+# 同梱の規則表
+DEFAULT_RULES_PATH = Path(__file__).resolve().parent.parent / "data" / "drug_interaction_rules.json"
+
+# 重要度（値が大きいほど重要）
+SEVERITY_ORDER = {"低": 1, "中": 2, "高": 3}
+
+# 指摘の種別
+CATEGORY_INTERACTION = "相互作用"
+CATEGORY_DUPLICATE_CLASS = "同種同効"
+CATEGORY_DUPLICATE_DRUG = "同一成分"
+
+# 薬品名末尾の規格・剤形（一般名が未登録の場合に除去して照合する）
+STRENGTH_PATTERN = re.compile(r"[\d.]+(mg|μg|mcg|g|ml)$")
+DOSAGE_FORM_PATTERN = re.compile(r"(od錠|錠|カプセル|細粒|散|内用液|注射液|シロップ|テープ)$")
+
+
+class DrugInteractionChecker:
+    """
+    規則表から作成した飲み合わせチェッカー
+
+    既知の薬（規則表に登場する一般名）のすべての組み合わせについて、
+    該当する相互作用・同種同効の指摘を事前に計算して保持します。
+    チェック時は薬の組み合わせごとに表を引くだけです。
+    """
+
+    def __init__(self, rules: Dict[str, Any]):
+        """
+        初期化（組み合わせ表を作成）
+
+        Args:
+            rules: 規則表（classes / duplicate_classes / interactions）
+        """
+        self._classes_by_drug: Dict[str, FrozenSet[str]] = {}
+        classes: Dict[str, List[str]] = rules.get("classes", {})
+        for class_name, drugs in classes.items():
+            for drug in drugs:
+                key = normalize_drug_text(drug)
+                self._classes_by_drug[key] = self._classes_by_drug.get(key, frozenset()) | {class_name}
+
+        duplicate_rules = {rule["class"]: rule for rule in rules.get("duplicate_classes", [])}
+
+        # 規則の対象（薬効分類名または一般名）を「分類:」「薬:」の語に変換
+        interaction_rules = []
+        for rule in rules.get("interactions", []):
+            terms = tuple(
+                f"分類:{name}" if name in classes else f"薬:{normalize_drug_text(name)}"
+                for name in (rule["a"], rule["b"])
+            )
+            interaction_rules.append((terms, rule))
+            for term in terms:
+                if term.startswith("薬:"):
+                    self._classes_by_drug.setdefault(term[2:], frozenset())
+
+        self._pairs: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for drug_a, drug_b in combinations(sorted(self._classes_by_drug), 2):
+            findings = self._evaluate_pair(drug_a, drug_b, duplicate_rules, interaction_rules)
+            if findings:
+                self._pairs[(drug_a, drug_b)] = findings
+
+    @property
+    def pair_count(self) -> int:
+        """指摘のある組み合わせの数"""
+        return len(self._pairs)
+
+    def _terms(self, drug: str) -> FrozenSet[str]:
+        """薬を規則照合用の語の集合に変換"""
+        return frozenset(
+            {f"薬:{drug}"} | {f"分類:{name}" for name in self._classes_by_drug.get(drug, ())}
+        )
+
+    def _evaluate_pair(
+        self,
+        drug_a: str,
+        drug_b: str,
+        duplicate_rules: Dict[str, Dict[str, Any]],
+        interaction_rules: List[Tuple[Tuple[str, str], Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """2剤の組み合わせに該当する指摘を求める（組み合わせ表の作成時のみ使用）"""
+        findings = []
+
+        shared = self._classes_by_drug.get(drug_a, frozenset()) & self._classes_by_drug.get(drug_b, frozenset())
+        for class_name in sorted(shared):
+            rule = duplicate_rules.get(class_name)
+            if rule:
+                findings.append({
+                    "severity": rule["severity"],
+                    "category": CATEGORY_DUPLICATE_CLASS,
+                    "title": class_name,
+                    "message": rule["message"],
+                })
+
+        terms_a, terms_b = self._terms(drug_a), self._terms(drug_b)
+        for (term_1, term_2), rule in interaction_rules:
+            if (term_1 in terms_a and term_2 in terms_b) or (term_1 in terms_b and term_2 in terms_a):
+                findings.append({
+                    "severity": rule["severity"],
+                    "category": CATEGORY_INTERACTION,
+                    "title": f"{rule['a']} × {rule['b']}",
+                    "message": rule["message"],
+                })
+
+        return findings
+
+    def drug_key(self, medication_name: str, generic_name: Optional[str] = None) -> str:
+        """
+        薬を照合用のキー（正規化した一般名）に変換
+
+        一般名が未登録の場合は薬品辞書から一般名を補い、辞書にもない場合は
+        薬品名から規格・剤形を除いたものを使用します。
+
+        Args:
+            medication_name: 薬品名
+            generic_name: 一般名
+
+        Returns:
+            照合用のキー
+        """
+        if generic_name:
+            return normalize_drug_text(generic_name)
+
+        drug = get_drug_dictionary().get(medication_name)
+        if drug and drug.get("generic_name"):
+            return normalize_drug_text(drug["generic_name"])
+
+        key = STRENGTH_PATTERN.sub("", normalize_drug_text(medication_name))
+        return DOSAGE_FORM_PATTERN.sub("", key)
+
+    def check(self, medications: List[Any]) -> List[Dict[str, Any]]:
+        """
+        薬の組み合わせをチェック
+
+        Args:
+            medications: 服用中の薬（id / medication_name / generic_name を持つオブジェクト）
+
+        Returns:
+            指摘事項のリスト（重要度の高い順）
+        """
+        keyed = [
+            (med, self.drug_key(med.medication_name, med.generic_name))
+            for med in medications
+        ]
+
+        findings = []
+        for (med_a, key_a), (med_b, key_b) in combinations(keyed, 2):
+            if key_a == key_b:
+                matched = [{
+                    "severity": "中",
+                    "category": CATEGORY_DUPLICATE_DRUG,
+                    "title": med_a.generic_name or med_a.medication_name,
+                    "message": "同じ成分の薬が重複して登録されています。処方内容を確認してください。",
+                }]
+            else:
+                matched = self._pairs.get((key_a, key_b) if key_a < key_b else (key_b, key_a), [])
+
+            for finding in matched:
+                findings.append({
+                    **finding,
+                    "medication_ids": [med_a.id, med_b.id],
+                    "medication_names": [med_a.medication_name, med_b.medication_name],
+                })
+
+        findings.sort(key=lambda finding: -SEVERITY_ORDER.get(finding["severity"], 0))
+        return findings
+
+
+class DrugInteractionService:
+    """服薬中の薬の飲み合わせチェックサービス"""
+
+    def __init__(self, db: Session):
+        """
+        初期化
+
+        Args:
+            db: データベースセッション
+        """
+        self.db = db
+        self.checker = get_interaction_checker()
+
+    def check_user(self, user_id: int) -> List[Dict[str, Any]]:
+        """
+        利用者の服用中の薬をチェック
+
+        Args:
+            user_id: 利用者ID
+
+        Returns:
+            指摘事項のリスト
+        """
+        medications = self.db.query(Medication).filter(
+            Medication.user_id == user_id,
+            Medication.is_current == True
+        ).order_by(Medication.id).all()
+        return self.checker.check(medications)
+
+    def scan_caseload(
+        self,
+        staff_id: Optional[int] = None,
+        min_severity: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        利用者全体の服用中の薬を一括チェック
+
+        服用中の薬は1回のクエリでまとめて取得します。
+
+        Args:
+            staff_id: 担当スタッフIDで絞り込み(任意)
+            min_severity: この重要度以上の指摘のみ対象とする(任意)
+
+        Returns:
+            チェックした利用者数と、指摘のあった利用者ごとの結果（重要度の高い順）
+        """
+        query = self.db.query(
+            Medication.id, Medication.user_id, Medication.medication_name, Medication.generic_name,
+            User.name.label("user_name")
+        ).join(
+            User, Medication.user_id == User.id
+        ).filter(
+            Medication.is_current == True,
+            User.is_deleted == False
+        )
+        if staff_id:
+            query = query.filter(User.assigned_staff_id == staff_id)
+
+        by_user: Dict[int, List[Any]] = {}
+        user_names: Dict[int, str] = {}
+        for row in query.order_by(Medication.user_id, Medication.id).all():
+            by_user.setdefault(row.user_id, []).append(row)
+            user_names[row.user_id] = row.user_name
+
+        threshold = SEVERITY_ORDER.get(min_severity, 0)
+        results = []
+        for user_id, medications in by_user.items():
+            findings = [
+                finding for finding in self.checker.check(medications)
+                if SEVERITY_ORDER.get(finding["severity"], 0) >= threshold
+            ]
+            if findings:
+                results.append({
+                    "user_id": user_id,
+                    "user_name": user_names[user_id],
+                    "max_severity": findings[0]["severity"],
+                    "findings": findings,
+                })
+
+        results.sort(key=lambda result: (-SEVERITY_ORDER.get(result["max_severity"], 0), result["user_id"]))
+
+        return {
+            "scanned_users": len(by_user),
+            "flagged_users": len(results),
+            "results": results,
+        }
+
+
+@lru_cache()
+def get_interaction_checker() -> DrugInteractionChecker:
+    """飲み合わせチェッカーのシングルトンインスタンスを取得（初回のみ規則表を読み込む）"""
+    settings = get_settings()
+    path = Path(settings.drug_interaction_rules_path) if settings.drug_interaction_rules_path else DEFAULT_RULES_PATH
+    with open(path, encoding="utf-8") as f:
+        return DrugInteractionChecker(json.load(f))
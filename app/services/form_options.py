@@ -0,0 +1,139 @@
+"""
+入力画面の選択肢キャッシュ
+
+新規作成画面のプルダウンに表示する利用者・スタッフ・計画の選択肢を、
+IDと表示名の列だけを取得して作成し、プロセス内に保持します。
+利用者・スタッフ・計画の登録・更新・削除時に invalidate_form_options で破棄します。
+複数プロセスで動作する場合に備えて、一定時間（TTL）でも破棄します。
+"""
+import threading
+import time
+from typing import Dict, Any, List, Callable
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.plan import Plan
+from app.models.staff import Staff
+from app.models.user import User
+
+# 選択肢の種別
+OPTION_USERS = "users"
+OPTION_STAFFS = "staffs"
+OPTION_PLANS = "plans"
+
+
+def _load_users(db: Session) -> List[Dict[str, Any]]:
+    """利用者の選択肢を取得"""
+    rows = db.query(User.id, User.name).filter(
+        User.is_deleted == False
+    ).order_by(User.id).all()
+    return [{"id": row.id, "name": row.name} for row in rows]
+
+
+def _load_staffs(db: Session) -> List[Dict[str, Any]]:
+    """有効なスタッフの選択肢を取得"""
+    rows = db.query(Staff.id, Staff.name).filter(
+        Staff.is_active == True
+    ).order_by(Staff.id).all()
+    return [{"id": row.id, "name": row.name} for row in rows]
+
+
+def _load_plans(db: Session) -> List[Dict[str, Any]]:
+    """計画の選択肢を取得（表示用に利用者名を含む）"""
+    rows = db.query(Plan.id, Plan.user_id, User.name.label("user_name")).join(
+        User, Plan.user_id == User.id
+    ).filter(
+        Plan.is_deleted == False
+    ).order_by(Plan.id).all()
+    return [
+        {"id": row.id, "user_id": row.user_id, "user_name": row.user_name}
+        for row in rows
+    ]
+
+
+LOADERS: Dict[str, Callable[[Session], List[Dict[str, Any]]]] = {
+    OPTION_USERS: _load_users,
+    OPTION_STAFFS: _load_staffs,
+    OPTION_PLANS: _load_plans,
+}
+
+
+class FormOptionsCache:
+    """
+    選択肢のキャッシュ
+
+    スレッドセーフなインメモリキャッシュです。種別ごとに選択肢の一覧を保持し、
+    破棄された後の最初の参照で再取得します。
+    """
+
+    def __init__(self, ttl_seconds: int = 300):
+        """
+        初期化
+
+        Args:
+            ttl_seconds: 有効期間（秒、0の場合はキャッシュしない）
+        """
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, tuple] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, kind: str) -> List[Dict[str, Any]]:
+        """
+        選択肢を取得（キャッシュにない場合はデータベースから取得）
+
+        Args:
+            db: データベースセッション
+            kind: 選択肢の種別（users / staffs / plans）
+
+        Returns:
+            選択肢の一覧（id と表示名を持つ辞書のリスト）
+        """
+        with self._lock:
+            entry = self._entries.get(kind)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            generation = self._generation
+
+        options = LOADERS[kind](db)
+
+        if self.ttl_seconds > 0:
+            with self._lock:
+                # 取得中に破棄された場合は古い可能性があるため保持しない
+                if generation == self._generation:
+                    self._entries[kind] = (time.monotonic() + self.ttl_seconds, options)
+        return options
+
+    def get_many(self, db: Session, *kinds: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        複数の種別の選択肢をまとめて取得
+
+        Args:
+            db: データベースセッション
+            kinds: 選択肢の種別
+
+        Returns:
+            種別ごとの選択肢の一覧
+        """
+        return {kind: self.get(db, kind) for kind in kinds}
+
+    def clear(self) -> None:
+        """キャッシュをすべて破棄"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+settings = get_settings()
+
+# アプリケーション全体で共有する選択肢キャッシュ
+form_options_cache = FormOptionsCache(ttl_seconds=settings.form_options_cache_ttl_seconds)
+
+
+def invalidate_form_options() -> None:
+    """選択肢キャッシュを破棄（利用者・スタッフ・計画の変更時に呼び出す）"""
+    form_options_cache.clear()
@@ -0,0 +1,171 @@
+"""
+服薬台帳サービス
+
+事業所全体の服用中の薬を対象に、薬ごとの服用者・処方医ごとの患者数・
+多剤服用の利用者などを集計します。いずれも medications の
+(user_id, is_current) / (prescribing_doctor_id, is_current) インデックスを使用します。
+"""
+from typing import Dict, Any, List
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.models.medication import Medication
+from app.models.prescribing_doctor import PrescribingDoctor
+from app.models.user import User
+from app.utils.kana_converter import hiragana_to_katakana
+
+
+class MedicationRegistryService:
+    """服薬台帳サービス"""
+
+    def __init__(self, db: Session):
+        """
+        初期化
+
+        Args:
+            db: データベースセッション
+        """
+        self.db = db
+
+    def _current_medications(self):
+        """有効な利用者の服用中の薬のクエリ"""
+        return self.db.query(Medication).join(
+            User, Medication.user_id == User.id
+        ).filter(
+            Medication.is_current == True,
+            User.is_deleted == False
+        )
+
+    def users_on_drug(self, keyword: str, skip: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """
+        指定した薬を服用中の利用者を取得
+
+        薬品名・一般名の部分一致で検索します（ひらがなはカタカナに変換）。
+
+        Args:
+            keyword: 薬品名・一般名の検索キーワード
+            skip: スキップ件数
+            limit: 取得件数上限
+
+        Returns:
+            総件数と、利用者ごとの該当する薬の一覧（利用者名順）
+        """
+        pattern = f"%{hiragana_to_katakana(keyword)}%"
+        matched = self._current_medications().filter(
+            or_(Medication.medication_name.like(pattern), Medication.generic_name.like(pattern))
+        )
+
+        total = matched.with_entities(func.count(func.distinct(Medication.user_id))).scalar()
+
+        page = matched.with_entities(User.id, User.name).group_by(
+            User.id, User.name
+        ).order_by(User.name, User.id).offset(skip).limit(limit).all()
+
+        medications: Dict[int, List[str]] = {}
+        if page:
+            rows = matched.filter(
+                Medication.user_id.in_([user.id for user in page])
+            ).with_entities(
+                Medication.user_id, Medication.medication_name
+            ).order_by(Medication.id).all()
+            for row in rows:
+                medications.setdefault(row.user_id, []).append(row.medication_name)
+
+        return {
+            "total": total or 0,
+            "items": [
+                {
+                    "user_id": user.id,
+                    "user_name": user.name,
+                    "medications": medications.get(user.id, []),
+                }
+                for user in page
+            ]
+        }
+
+    def doctor_patient_counts(self, skip: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """
+        処方医ごとの患者数（服用中の薬がある利用者数）を取得
+
+        Args:
+            skip: スキップ件数
+            limit: 取得件数上限
+
+        Returns:
+            総件数と、患者数の多い順の処方医一覧
+        """
+        patient_count = func.count(func.distinct(Medication.user_id))
+        base = self._current_medications().filter(Medication.prescribing_doctor_id.isnot(None))
+
+        total = base.with_entities(func.count(func.distinct(Medication.prescribing_doctor_id))).scalar()
+
+        rows = base.join(
+            PrescribingDoctor, Medication.prescribing_doctor_id == PrescribingDoctor.id
+        ).with_entities(
+            PrescribingDoctor.id,
+            PrescribingDoctor.name,
+            PrescribingDoctor.hospital_name,
+            patient_count.label("patient_count"),
+            func.count(Medication.id).label("medication_count")
+        ).group_by(
+            PrescribingDoctor.id, PrescribingDoctor.name, PrescribingDoctor.hospital_name
+        ).order_by(
+            patient_count.desc(), PrescribingDoctor.id
+        ).offset(skip).limit(limit).all()
+
+        return {
+            "total": total or 0,
+            "items": [
+                {
+                    "doctor_id": row.id,
+                    "doctor_name": row.name,
+                    "hospital_name": row.hospital_name or "",
+                    "patient_count": row.patient_count,
+                    "medication_count": row.medication_count,
+                }
+                for row in rows
+            ]
+        }
+
+    def users_with_many_medications(
+        self,
+        min_count: int = 5,
+        skip: int = 0,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        服用中の薬が指定数以上の利用者（多剤服用）を取得
+
+        Args:
+            min_count: 服用中の薬の数の下限
+            skip: スキップ件数
+            limit: 取得件数上限
+
+        Returns:
+            総件数と、服用中の薬の多い順の利用者一覧
+        """
+        medication_count = func.count(Medication.id)
+        grouped = self._current_medications().with_entities(
+            User.id.label("user_id"),
+            User.name.label("user_name"),
+            medication_count.label("medication_count")
+        ).group_by(User.id, User.name).having(medication_count >= min_count)
+
+        total = self.db.query(func.count()).select_from(grouped.subquery()).scalar()
+
+        rows = grouped.order_by(
+            medication_count.desc(), User.id
+        ).offset(skip).limit(limit).all()
+
+        return {
+            "total": total or 0,
+            "items": [
+                {
+                    "user_id": row.user_id,
+                    "user_name": row.user_name,
+                    "medication_count": row.medication_count,
+                }
+                for row in rows
+            ]
+        }
@@ -0,0 +1,221 @@
+"""
+服薬タイムラインサービス
+
+服薬情報（開始・終了）と服薬変更履歴を1回のクエリで日付順のイベント列にまとめ、
+同じ日の同じ薬の変更を1件の差分にまとめて返します。履歴が多い場合は新しい方から
+上限まで返し、古い履歴の続きを取得するための日付を返します。
+"""
+import re
+from datetime import date, timedelta
+from typing import Dict, Any, Optional, List
+
+from sqlalchemy import select, union_all, literal, null
+from sqlalchemy.orm import Session
+
+from app.models.medication import Medication
+from app.models.medication_change import MedicationChange
+
+# イベント種別
+EVENT_START = "開始"
+EVENT_CHANGE = "変更"
+EVENT_END = "終了"
+
+# 同じ日のイベントの並び順
+EVENT_ORDER = {EVENT_START: 0, EVENT_CHANGE: 1, EVENT_END: 2}
+
+# 変更種別（例: 用量変更、その他の変更）から項目名を取り出す
+CHANGE_TYPE_SUFFIX = re.compile(r"の?変更$")
+
+# 服用状態の表示
+CURRENT_STATE_LABELS = {"True": "服用中", "False": "服用終了"}
+
+
+class MedicationTimelineService:
+    """服薬タイムラインサービス"""
+
+    def __init__(self, db: Session):
+        """
+        初期化
+
+        Args:
+            db: データベースセッション
+        """
+        self.db = db
+
+    def get_timeline(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        limit: int = 500
+    ) -> Dict[str, Any]:
+        """
+        利用者の服薬タイムラインを取得
+
+        服薬の開始日・終了日と変更履歴をUNION ALLで1回のクエリにまとめ、
+        期間で絞り込んで新しい順に limit 行を取得し、日付順に並べ替えます。
+        上限で切れる日の履歴は、同じ日の変更がまとめられるようその日の分をすべて含めます。
+        それより古い履歴がある場合は truncated を True にし、next_end_date に
+        続きを取得する際の end_date を返します。
+
+        Args:
+            user_id: 利用者ID
+            start_date: 期間の開始日(任意)
+            end_date: 期間の終了日(任意)
+            limit: 取得する履歴行数の上限（上限で切れる日の履歴はすべて含める）
+
+        Returns:
+            日付順のイベントのリスト（items）と、古い履歴の有無（truncated / next_end_date）
+        """
+        events = self._events_subquery(user_id)
+
+        conditions = []
+        if start_date:
+            conditions.append(events.c.event_date >= start_date)
+        if end_date:
+            conditions.append(events.c.event_date <= end_date)
+
+        sort_keys = (
+            events.c.event_date,
+            events.c.event_order,
+            events.c.medication_id,
+            events.c.change_id
+        )
+        newest = self.db.execute(
+            select(events)
+            .where(*conditions)
+            .order_by(*(key.desc() for key in sort_keys))
+            .limit(limit + 1)
+        ).all()
+
+        if len(newest) <= limit:
+            newest.reverse()
+            return {"items": compact_events(newest), "truncated": False, "next_end_date": None}
+
+        # 上限で切れる日（境界の日）の履歴はすべて取得し、それより古い履歴の有無を確認
+        boundary = newest[limit - 1].event_date
+        rows = self.db.execute(
+            select(events)
+            .where(*conditions, events.c.event_date >= boundary)
+            .order_by(*sort_keys)
+        ).all()
+        truncated = self.db.execute(
+            select(literal(1))
+            .select_from(events)
+            .where(*conditions, events.c.event_date < boundary)
+            .limit(1)
+        ).first() is not None
+
+        return {
+            "items": compact_events(rows),
+            "truncated": truncated,
+            "next_end_date": boundary - timedelta(days=1) if truncated else None,
+        }
+
+    def _events_subquery(self, user_id: int):
+        """服薬の開始・終了と変更履歴を1つの履歴行にまとめるサブクエリ"""
+        started = select(
+            Medication.id.label("medication_id"),
+            Medication.medication_name.label("medication_name"),
+            Medication.start_date.label("event_date"),
+            literal(EVENT_START).label("event_type"),
+            literal(EVENT_ORDER[EVENT_START]).label("event_order"),
+            literal(0).label("change_id"),
+            null().label("change_type"),
+            null().label("previous_value"),
+            null().label("new_value"),
+            null().label("reason"),
+        ).where(
+            Medication.user_id == user_id,
+            Medication.start_date.isnot(None)
+        )
+
+        ended = select(
+            Medication.id,
+            Medication.medication_name,
+            Medication.end_date,
+            literal(EVENT_END),
+            literal(EVENT_ORDER[EVENT_END]),
+            literal(0),
+            null(),
+            null(),
+            null(),
+            null(),
+        ).where(
+            Medication.user_id == user_id,
+            Medication.end_date.isnot(None)
+        )
+
+        changed = select(
+            MedicationChange.medication_id,
+            Medication.medication_name,
+            MedicationChange.change_date,
+            literal(EVENT_CHANGE),
+            literal(EVENT_ORDER[EVENT_CHANGE]),
+            MedicationChange.id,
+            MedicationChange.change_type,
+            MedicationChange.previous_value,
+            MedicationChange.new_value,
+            MedicationChange.reason,
+        ).join(
+            Medication, MedicationChange.medication_id == Medication.id
+        ).where(
+            Medication.user_id == user_id
+        )
+
+        return union_all(started, ended, changed).subquery()
+
+
+def compact_events(rows: List[Any]) -> List[Dict[str, Any]]:
+    """
+    履歴行をイベントにまとめる
+
+    同じ日・同じ薬の変更履歴は1件のイベントにまとめ、項目ごとの差分
+    （field / from / to）の一覧にします。
+
+    Args:
+        rows: 日付順の履歴行
+
+    Returns:
+        イベントのリスト
+    """
+    events: List[Dict[str, Any]] = []
+    for row in rows:
+        last = events[-1] if events else None
+        if (
+            row.event_type == EVENT_CHANGE
+            and last is not None
+            and last["event"] == EVENT_CHANGE
+            and last["date"] == row.event_date
+            and last["medication_id"] == row.medication_id
+        ):
+            event = last
+        else:
+            event = {
+                "date": row.event_date,
+                "medication_id": row.medication_id,
+                "medication_name": row.medication_name,
+                "event": row.event_type,
+                "changes": [],
+                "reasons": [],
+            }
+            events.append(event)
+
+        if row.event_type == EVENT_CHANGE:
+            field = CHANGE_TYPE_SUFFIX.sub("", row.change_type) or row.change_type
+            event["changes"].append({
+                "field": field,
+                "from": _display_value(field, row.previous_value),
+                "to": _display_value(field, row.new_value),
+            })
+            if row.reason and row.reason not in event["reasons"]:
+                event["reasons"].append(row.reason)
+
+    return events
+
+
+def _display_value(field: str, value: Optional[str]) -> Optional[str]:
+    """変更履歴の値を表示用に変換"""
+    if field == "服用状態":
+        return CURRENT_STATE_LABELS.get(value, value)
+    return value
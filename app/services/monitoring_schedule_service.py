@@ -0,0 +1,406 @@
+"""
+モニタリング予定サービス
+
+利用者ごとの有効な計画（承認済み/実施中のうち開始日が最新のもの）と、その計画の
+最新のモニタリング記録から次回モニタリング予定日を算出し、monitoring_schedule に
+保持します。期限の検索は (staff_id, due_date) / (due_date) インデックスの範囲検索のみで行います。
+"""
+import calendar
+from datetime import date, timedelta
+from typing import Dict, Any, Optional, List, Iterable, Tuple
+
+from sqlalchemy import select, func, and_, insert, update, delete
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.monitoring import Monitoring
+from app.models.monitoring_schedule import MonitoringSchedule
+from app.models.plan import Plan
+from app.models.user import User
+
+# 予定の対象とする計画の承認状況
+ACTIVE_PLAN_STATUSES = ("承認済み", "実施中")
+
+# 初回計画で短い周期を適用する期間（計画開始からの月数）
+INITIAL_PERIOD_MONTHS = 3
+
+# 予定の比較項目（変更があった行のみ更新する）
+SCHEDULE_FIELDS = (
+    "plan_id", "staff_id", "last_monitoring_id", "due_date",
+    "last_monitoring_date", "interval_months", "basis",
+)
+
+
+def add_months(base: date, months: int) -> date:
+    """
+    日付に月数を加算（月末を超える場合は月末日）
+
+    Args:
+        base: 基準日
+        months: 加算する月数
+
+    Returns:
+        加算後の日付
+    """
+    month_index = base.month - 1 + months
+    year, month = base.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(base.day, calendar.monthrange(year, month)[1]))
+
+
+def compute_due_date(
+    plan_type: str,
+    plan_start_date: date,
+    plan_end_date: date,
+    last_monitoring_date: Optional[date] = None,
+    next_monitoring_date: Optional[date] = None
+) -> Tuple[date, int, str]:
+    """
+    次回モニタリング予定日を算出
+
+    最新のモニタリング記録に次回予定日があればそれを使用し、なければ前回実施日
+    （記録がない場合は計画開始日）に周期を加算します。初回計画の開始から3ヶ月間は
+    短い周期を適用し、予定日は計画終了日を超えないようにします。
+
+    Args:
+        plan_type: 計画種別（初回/更新）
+        plan_start_date: 計画開始日
+        plan_end_date: 計画終了日
+        last_monitoring_date: 最新のモニタリング実施日
+        next_monitoring_date: 最新のモニタリング記録の次回予定日
+
+    Returns:
+        (予定日, 周期（月）, 算出根拠)
+    """
+    settings = get_settings()
+    base_date = last_monitoring_date or plan_start_date
+
+    interval = settings.monitoring_interval_months
+    if plan_type == "初回" and base_date < add_months(plan_start_date, INITIAL_PERIOD_MONTHS):
+        interval = settings.monitoring_initial_interval_months
+
+    if next_monitoring_date:
+        due_date, basis = next_monitoring_date, MonitoringSchedule.BASIS_NEXT_DATE
+    elif last_monitoring_date:
+        due_date, basis = add_months(last_monitoring_date, interval), MonitoringSchedule.BASIS_INTERVAL
+    else:
+        due_date, basis = add_months(plan_start_date, interval), MonitoringSchedule.BASIS_PLAN_START
+
+    if due_date > plan_end_date:
+        due_date, basis = plan_end_date, MonitoringSchedule.BASIS_PLAN_END
+
+    return due_date, interval, basis
+
+
+class MonitoringScheduleService:
+    """モニタリング予定サービス"""
+
+    def __init__(self, db: Session):
+        """
+        初期化
+
+        Args:
+            db: データベースセッション
+        """
+        self.db = db
+
+    def refresh(self, user_ids: Optional[Iterable[int]] = None, commit: bool = True) -> Dict[str, int]:
+        """
+        モニタリング予定を再計算
+
+        有効な計画と最新のモニタリング記録を1回のクエリで取得し、予定を
+        まとめて登録・更新します。有効な計画がなくなった利用者の予定は削除します。
+        モニタリング記録・計画・利用者の更新時は、その利用者のみを対象に呼び出します。
+
+        Args:
+            user_ids: 対象の利用者ID（省略時は全利用者）
+            commit: 最後にコミットするか（呼び出し元のトランザクションに含める場合はFalse）
+
+        Returns:
+            登録・更新・削除の件数
+        """
+        user_ids = list(set(user_ids)) if user_ids is not None else None
+
+        # セッションは autoflush=False のため、呼び出し元の未反映の変更を先に反映
+        self.db.flush()
+
+        existing = {
+            schedule.user_id: schedule
+            for schedule in self._scoped(
+                self.db.query(
+                    MonitoringSchedule.id,
+                    MonitoringSchedule.user_id,
+                    *(getattr(MonitoringSchedule, field) for field in SCHEDULE_FIELDS)
+                ),
+                user_ids
+            )
+        }
+
+        inserts, updates = [], []
+        seen = set()
+        for row in self.db.execute(self._source_query(user_ids)).all():
+            due_date, interval, basis = compute_due_date(
+                row.plan_type, row.start_date, row.end_date,
+                row.monitoring_date, row.next_monitoring_date
+            )
+            values = {
+                "user_id": row.user_id,
+                "plan_id": row.plan_id,
+                "staff_id": row.staff_id,
+                "last_monitoring_id": row.monitoring_id,
+                "due_date": due_date,
+                "last_monitoring_date": row.monitoring_date,
+                "interval_months": interval,
+                "basis": basis,
+            }
+            seen.add(row.user_id)
+
+            current = existing.get(row.user_id)
+            if current is None:
+                inserts.append(values)
+            elif any(getattr(current, field) != values[field] for field in SCHEDULE_FIELDS):
+                updates.append({"id": current.id, **values})
+
+        removed_ids = [schedule.id for user_id, schedule in existing.items() if user_id not in seen]
+
+        if inserts:
+            self.db.execute(insert(MonitoringSchedule), inserts)
+        if updates:
+            self.db.execute(update(MonitoringSchedule), updates)
+        if removed_ids:
+            self.db.execute(
+                delete(MonitoringSchedule).where(MonitoringSchedule.id.in_(removed_ids)),
+                execution_options={"synchronize_session": False}
+            )
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
+
+        return {
+            "inserted": len(inserts),
+            "updated": len(updates),
+            "removed": len(removed_ids),
+        }
+
+    def refresh_user(self, user_id: int, commit: bool = True) -> Dict[str, int]:
+        """
+        利用者1人のモニタリング予定を再計算
+
+        Args:
+            user_id: 利用者ID
+            commit: 最後にコミットするか
+
+        Returns:
+            登録・更新・削除の件数
+        """
+        return self.refresh([user_id], commit=commit)
+
+    def _scoped(self, query, user_ids: Optional[List[int]]):
+        """利用者IDが指定されている場合は絞り込む"""
+        if user_ids is not None:
+            query = query.filter(MonitoringSchedule.user_id.in_(user_ids))
+        return query
+
+    def _source_query(self, user_ids: Optional[List[int]]):
+        """利用者ごとの有効な計画と、その計画の最新のモニタリング記録を取得するクエリ"""
+        plan_rank = func.row_number().over(
+            partition_by=Plan.user_id,
+            order_by=(Plan.start_date.desc(), Plan.id.desc())
+        ).label("plan_rank")
+        plans = select(
+            Plan.id.label("plan_id"),
+            Plan.user_id,
+            Plan.plan_type,
+            Plan.start_date,
+            Plan.end_date,
+            User.assigned_staff_id.label("staff_id"),
+            plan_rank
+        ).join(
+            User, Plan.user_id == User.id
+        ).where(
+            Plan.is_deleted == False,
+            Plan.approval_status.in_(ACTIVE_PLAN_STATUSES),
+            User.is_deleted == False
+        )
+
+        monitoring_rank = func.row_number().over(
+            partition_by=Monitoring.plan_id,
+            order_by=(Monitoring.monitoring_date.desc(), Monitoring.id.desc())
+        ).label("monitoring_rank")
+        monitorings = select(
+            Monitoring.id.label("monitoring_id"),
+            Monitoring.plan_id,
+            Monitoring.monitoring_date,
+            Monitoring.next_monitoring_date,
+            monitoring_rank
+        ).where(
+            Monitoring.is_deleted == False
+        )
+
+        if user_ids is not None:
+            plans = plans.where(Plan.user_id.in_(user_ids))
+            monitorings = monitorings.where(Monitoring.user_id.in_(user_ids))
+
+        plans = plans.subquery()
+        monitorings = monitorings.subquery()
+
+        return select(
+            plans.c.plan_id,
+            plans.c.user_id,
+            plans.c.plan_type,
+            plans.c.start_date,
+            plans.c.end_date,
+            plans.c.staff_id,
+            monitorings.c.monitoring_id,
+            monitorings.c.monitoring_date,
+            monitorings.c.next_monitoring_date,
+        ).outerjoin(
+            monitorings,
+            and_(
+                monitorings.c.plan_id == plans.c.plan_id,
+                monitorings.c.monitoring_rank == 1
+            )
+        ).where(
+            plans.c.plan_rank == 1
+        )
+
+    def for_user(self, user_id: int, today: Optional[date] = None) -> Optional[Dict[str, Any]]:
+        """
+        利用者のモニタリング予定を取得
+
+        Args:
+            user_id: 利用者ID
+            today: 基準日（省略時は今日、残り日数の計算に使用）
+
+        Returns:
+            モニタリング予定（有効な計画がない場合はNone）
+        """
+        row = self.db.query(
+            MonitoringSchedule, User.name.label("user_name")
+        ).join(
+            User, MonitoringSchedule.user_id == User.id
+        ).filter(
+            MonitoringSchedule.user_id == user_id
+        ).first()
+        return _to_item(*row, today or date.today()) if row else None
+
+    def due_between(
+        self,
+        start_date: Optional[date],
+        end_date: date,
+        staff_id: Optional[int] = None,
+        today: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        指定期間に予定日があるモニタリング予定を取得
+
+        Args:
+            start_date: 期間の開始日（Noneの場合は期限超過分も含む）
+            end_date: 期間の終了日
+            staff_id: 担当スタッフIDで絞り込み(任意)
+            today: 基準日（省略時は今日、残り日数の計算に使用）
+
+        Returns:
+            予定日順の予定一覧
+        """
+        today = today or date.today()
+
+        query = self.db.query(
+            MonitoringSchedule, User.name.label("user_name")
+        ).join(
+            User, MonitoringSchedule.user_id == User.id
+        ).filter(
+            MonitoringSchedule.due_date <= end_date
+        )
+        if start_date:
+            query = query.filter(MonitoringSchedule.due_date >= start_date)
+        if staff_id:
+            query = query.filter(MonitoringSchedule.staff_id == staff_id)
+
+        rows = query.order_by(MonitoringSchedule.due_date, MonitoringSchedule.user_id).all()
+
+        return [_to_item(schedule, user_name, today) for schedule, user_name in rows]
+
+    def due_this_week(
+        self,
+        staff_id: Optional[int] = None,
+        today: Optional[date] = None,
+        include_overdue: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        今週（月曜〜日曜）が予定日のモニタリングを取得
+
+        Args:
+            staff_id: 担当スタッフIDで絞り込み(任意)
+            today: 基準日（省略時は今日）
+            include_overdue: 今週より前の期限超過分を含むか
+
+        Returns:
+            予定日順の予定一覧
+        """
+        today = today or date.today()
+        week_start = today - timedelta(days=today.weekday())
+        week_end = week_start + timedelta(days=6)
+        return self.due_between(
+            None if include_overdue else week_start, week_end, staff_id=staff_id, today=today
+        )
+
+    def overdue(self, staff_id: Optional[int] = None, today: Optional[date] = None) -> List[Dict[str, Any]]:
+        """
+        予定日を過ぎたモニタリング予定を取得
+
+        Args:
+            staff_id: 担当スタッフIDで絞り込み(任意)
+            today: 基準日（省略時は今日）
+
+        Returns:
+            予定日順の予定一覧
+        """
+        today = today or date.today()
+        return self.due_between(None, today - timedelta(days=1), staff_id=staff_id, today=today)
+
+    def month_calendar(self, year: int, month: int, staff_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        月間のモニタリング予定カレンダーを取得
+
+        Args:
+            year: 年
+            month: 月
+            staff_id: 担当スタッフIDで絞り込み(任意)
+
+        Returns:
+            月の各日の予定一覧
+        """
+        first_day = date(year, month, 1)
+        last_day = date(year, month, calendar.monthrange(year, month)[1])
+
+        by_date: Dict[date, List[Dict[str, Any]]] = {}
+        items = self.due_between(first_day, last_day, staff_id=staff_id)
+        for item in items:
+            by_date.setdefault(item["due_date"], []).append(item)
+
+        return {
+            "year": year,
+            "month": month,
+            "total": len(items),
+            "days": [
+                {"date": day, "items": by_date.get(day, [])}
+                for day in (first_day + timedelta(days=offset) for offset in range(last_day.day))
+            ]
+        }
+
+
+def _to_item(schedule: MonitoringSchedule, user_name: str, today: date) -> Dict[str, Any]:
+    """モニタリング予定を出力用の辞書に変換"""
+    return {
+        "user_id": schedule.user_id,
+        "user_name": user_name,
+        "plan_id": schedule.plan_id,
+        "staff_id": schedule.staff_id,
+        "due_date": schedule.due_date,
+        "days_remaining": (schedule.due_date - today).days,
+        "last_monitoring_id": schedule.last_monitoring_id,
+        "last_monitoring_date": schedule.last_monitoring_date,
+        "interval_months": schedule.interval_months,
+        "basis": schedule.basis,
+    }
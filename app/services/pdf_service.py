@@ -4,6 +4,7 @@ PDF生成サービス
 利用者情報、計画、モニタリング記録のPDF出力機能を提供します。
 """
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
 from typing import Optional
 
@@ -754,3 +755,9 @@ class PDFService:
         doc.build(story, onFirstPage=add_page_decorations, onLaterPages=add_page_decorations)
         buffer.seek(0)
         return buffer
+
+
+@lru_cache()
+def get_pdf_service() -> PDFService:
+    """PDF生成サービスのシングルトンインスタンスを取得（初回のみフォントを登録する）"""
+    return PDFService()
@@ -0,0 +1,220 @@
+"""
+計画一括更新サービス
+
+計画終了日が近い計画をまとめて抽出し、AIによる更新計画案の生成を
+ジョブキューに登録します。生成された計画案は「作成中」の計画として保存します。
+"""
+import re
+from datetime import date, timedelta
+from typing import Dict, Any, Optional, List
+
+from sqlalchemy import exists
+from sqlalchemy.orm import Session, aliased
+
+from app.models.plan import Plan
+from app.models.user import User
+from app.services.ai_context_loader import AIContextLoader
+from app.services.ai_job_queue import AIJobQueue
+
+# 推奨サービス行の先頭の番号・記号
+SERVICE_PREFIX_PATTERN = re.compile(r'^(\d+\.|-|•)\s*')
+
+
+class PlanRenewalService:
+    """計画一括更新サービス"""
+
+    def __init__(self, db: Session):
+        """
+        初期化
+
+        Args:
+            db: データベースセッション
+        """
+        self.db = db
+
+    def find_expiring_plans(
+        self,
+        start_date: date,
+        end_date: date,
+        staff_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Plan]:
+        """
+        指定期間内に終了する更新対象の計画を取得
+
+        作成中の計画と、同じ利用者により新しい計画が既に作成されている計画は除外します。
+
+        Args:
+            start_date: 計画終了日の範囲（開始）
+            end_date: 計画終了日の範囲（終了）
+            staff_id: 作成者スタッフIDで絞り込み(任意)
+            limit: 取得件数上限(任意)
+
+        Returns:
+            更新対象の計画一覧（終了日の昇順）
+        """
+        newer_plan = aliased(Plan)
+        has_newer_plan = exists().where(
+            newer_plan.user_id == Plan.user_id,
+            newer_plan.is_deleted == False,
+            newer_plan.start_date > Plan.start_date
+        )
+
+        query = self.db.query(Plan).join(User).filter(
+            Plan.is_deleted == False,
+            User.is_deleted == False,
+            Plan.approval_status != "作成中",
+            Plan.end_date >= start_date,
+            Plan.end_date <= end_date,
+            ~has_newer_plan
+        )
+
+        if staff_id:
+            query = query.filter(Plan.staff_id == staff_id)
+
+        query = query.order_by(Plan.end_date.asc(), Plan.id.asc())
+        if limit:
+            query = query.limit(limit)
+
+        return query.all()
+
+    def submit_renewal_batch(
+        self,
+        start_date: date,
+        end_date: date,
+        staff_id: int,
+        model: str = "llama3",
+        filter_staff_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        更新対象の計画を抽出し、更新計画案の生成ジョブを一括登録
+
+        コンテキストデータは対象件数にかかわらず一括で取得し、ジョブに保存します。
+        生成の同時実行数はジョブワーカー数（AI_JOB_WORKERS）で制限されます。
+
+        Args:
+            start_date: 計画終了日の範囲（開始）
+            end_date: 計画終了日の範囲（終了）
+            staff_id: 更新計画の作成者スタッフID
+            model: 使用するOllamaモデル名
+            filter_staff_id: 対象計画を作成者スタッフIDで絞り込み(任意)
+            limit: 対象件数上限(任意)
+
+        Returns:
+            登録されたジョブの一覧
+        """
+        plans = self.find_expiring_plans(start_date, end_date, staff_id=filter_staff_id, limit=limit)
+        contexts = AIContextLoader(self.db).load([(plan.user_id, plan.id) for plan in plans])
+
+        queue = AIJobQueue(self.db)
+        submitted = []
+        for plan in plans:
+            context = contexts.get((plan.user_id, plan.id))
+            if context is None:
+                continue
+            job = queue.submit(
+                "plan_renewal",
+                params={
+                    "previous_plan_id": plan.id,
+                    "user_id": plan.user_id,
+                    "staff_id": staff_id,
+                    "model": model,
+                    "context": context,
+                },
+                user_id=plan.user_id,
+                commit=False
+            )
+            submitted.append((plan, job))
+
+        self.db.commit()
+
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "total": len(submitted),
+            "jobs": [
+                {
+                    "job_id": job.id,
+                    "previous_plan_id": plan.id,
+                    "user_id": plan.user_id,
+                    "end_date": plan.end_date,
+                }
+                for plan, job in submitted
+            ]
+        }
+
+    def create_draft(
+        self,
+        previous_plan: Plan,
+        proposal: Dict[str, Any],
+        staff_id: int
+    ) -> Plan:
+        """
+        AI計画提案から更新計画を「作成中」として保存
+
+        前回計画の翌日から同じ期間で作成します。同じ前回計画に対する
+        更新計画が既に存在する場合は、その計画を返します。
+
+        Args:
+            previous_plan: 前回の計画
+            proposal: パースされた計画提案
+            staff_id: 作成者スタッフID
+
+        Returns:
+            作成された（または既存の）更新計画
+        """
+        start_date = previous_plan.end_date + timedelta(days=1)
+        end_date = start_date + (previous_plan.end_date - previous_plan.start_date)
+        plan_number = f"{start_date.year}-R{previous_plan.id:05d}"
+
+        existing = self.db.query(Plan).filter(Plan.plan_number == plan_number).first()
+        if existing:
+            return existing
+
+        services = [
+            _service_from_recommendation(line)
+            for line in proposal.get("recommended_services", [])
+        ] or previous_plan.services
+
+        plan = Plan(
+            user_id=previous_plan.user_id,
+            staff_id=staff_id,
+            plan_type="更新",
+            plan_number=plan_number,
+            created_date=date.today(),
+            start_date=start_date,
+            end_date=end_date,
+            current_situation=proposal.get("current_situation") or None,
+            hopes_and_needs=proposal.get("hopes_and_needs") or None,
+            support_policy=proposal.get("support_policy") or None,
+            long_term_goal=proposal.get("long_term_goal") or None,
+            long_term_goal_period=previous_plan.long_term_goal_period,
+            short_term_goal=proposal.get("short_term_goal") or None,
+            short_term_goal_period=previous_plan.short_term_goal_period,
+            services=services,
+            approval_status="作成中"
+        )
+        self.db.add(plan)
+        self.db.commit()
+        self.db.refresh(plan)
+        return plan
+
+
+def _service_from_recommendation(line: str) -> Dict[str, Any]:
+    """
+    推奨サービス行（例: "1. 生活介護 - 日中活動の場"）をサービス内容に変換
+
+    Args:
+        line: 推奨サービス行
+
+    Returns:
+        サービス内容（事業所は未定のため空欄）
+    """
+    text = SERVICE_PREFIX_PATTERN.sub('', line.strip())
+    service_type, _, purpose = text.partition(' - ')
+    return {
+        "service_type": service_type.strip(),
+        "provider": "",
+        "purpose": purpose.strip() or None,
+    }
@@ -0,0 +1,92 @@
+"""
+AI計画提案キャッシュ
+
+同一プロンプト・モデル・生成オプションによる計画提案の生成結果を
+TTLとLRU方式で一定期間保持します。
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from app.config import get_settings
+
+
+class ProposalCache:
+    """
+    TTL付きLRUキャッシュ
+
+    スレッドセーフなインメモリキャッシュです。上限件数を超えた場合は
+    最も長く参照されていないエントリから削除します。
+    """
+
+    def __init__(self, max_entries: int = 128, ttl_seconds: int = 3600):
+        """
+        初期化
+
+        Args:
+            max_entries: 最大保持件数
+            ttl_seconds: 有効期間（秒）
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        キャッシュを取得
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            キャッシュされた値のコピー（未登録・期限切れの場合はNone）
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return copy.deepcopy(value)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        キャッシュを登録
+
+        Args:
+            key: キャッシュキー
+            value: 保持する値
+        """
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """キャッシュをすべて削除"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+settings = get_settings()
+
+# アプリケーション全体で共有する計画提案キャッシュ
+proposal_cache = ProposalCache(
+    max_entries=settings.ai_proposal_cache_max_entries,
+    ttl_seconds=settings.ai_proposal_cache_ttl_seconds,
+)
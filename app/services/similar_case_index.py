@@ -0,0 +1,485 @@
+"""
+類似ケース検索サービス
+
+過去の計画（長期目標・短期目標）、利用者の障害特性、計画評価の総合評価を
+ベクトル化し、NumPy行列として保持する埋め込みインデックスを提供します。
+計画作成時に、障害特性や目標が近い過去のケースをコサイン類似度で検索します。
+"""
+import logging
+import math
+import os
+import threading
+import time
+import unicodedata
+import zlib
+from collections import Counter
+from typing import Dict, Any, Optional, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.user import User
+from app.models.plan import Plan
+from app.models.plan_evaluation import PlanEvaluation
+from app.utils.kana_converter import hiragana_to_katakana
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# IN句1回あたりの件数（SQLiteのパラメータ数上限対策）
+QUERY_CHUNK_SIZE = 500
+
+
+class HashingEmbedder:
+    """
+    文字n-gramのハッシュによる埋め込み
+
+    外部モデルを使わずに、正規化した文字2-gram・3-gramを固定次元に
+    ハッシュして集計します。日本語の表記ゆれ（全角/半角、ひらがな/カタカナ）は
+    正規化で吸収します。
+    """
+
+    NGRAM_SIZES = (2, 3)
+
+    def __init__(self, dim: int = 512):
+        """
+        初期化
+
+        Args:
+            dim: ベクトルの次元数
+        """
+        self.dim = dim
+        self.name = f"hashing-ngram-{dim}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        テキストをベクトル化
+
+        Args:
+            texts: テキストのリスト
+
+        Returns:
+            L2正規化済みのベクトル（件数 × 次元数、float32）
+        """
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for gram, count in _ngram_counts(text, self.NGRAM_SIZES).items():
+                hashed = zlib.crc32(gram.encode("utf-8"))
+                sign = 1.0 if hashed & 0x80000000 else -1.0
+                vectors[row, hashed % self.dim] += sign * (1.0 + math.log(count))
+        return _normalize(vectors)
+
+
+class OllamaEmbedder:
+    """Ollamaの埋め込みモデルによる埋め込み"""
+
+    def __init__(self, model: str):
+        """
+        初期化
+
+        Args:
+            model: Ollamaの埋め込みモデル名（例: nomic-embed-text）
+        """
+        self.model = model
+        self.name = f"ollama-{model}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        テキストをベクトル化
+
+        Args:
+            texts: テキストのリスト
+
+        Returns:
+            L2正規化済みのベクトル（件数 × 次元数、float32）
+        """
+        import ollama
+
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        response = ollama.embed(model=self.model, input=list(texts))
+        return _normalize(np.asarray(response["embeddings"], dtype=np.float32))
+
+
+class SimilarCaseIndex:
+    """
+    類似ケースの埋め込みインデックス
+
+    計画1件を1行とするL2正規化済みの行列を保持し、計画・利用者・評価の
+    更新日時を記録しておくことで、変更のあった計画だけを差分で再計算します。
+    インデックスはファイルに保存し、プロセス起動時に読み込みます。
+    """
+
+    def __init__(self, embedder, path: Optional[str] = None, refresh_interval: float = 300):
+        """
+        初期化
+
+        Args:
+            embedder: 埋め込み器（HashingEmbedder または OllamaEmbedder）
+            path: インデックスの保存先（Noneの場合は保存しない）
+            refresh_interval: ensure_fresh でDBと差分同期する最小間隔（秒）
+        """
+        self.embedder = embedder
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._last_refresh: Optional[float] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        """空のインデックスにする"""
+        self.plan_ids = np.zeros(0, dtype=np.int64)
+        self.user_ids = np.zeros(0, dtype=np.int64)
+        self.versions = np.zeros(0, dtype=np.float64)
+        self.matrix: Optional[np.ndarray] = None
+        self._positions: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.plan_ids)
+
+    def clear(self) -> None:
+        """インデックスを空にする（次回の refresh で全件を再計算）"""
+        with self._lock:
+            self._reset()
+            self._loaded = True
+            self._last_refresh = None
+
+    def load(self) -> None:
+        """保存済みのインデックスを読み込む（埋め込み方式が異なる場合は破棄）"""
+        with self._lock:
+            self._loaded = True
+            if not self.path or not os.path.exists(self.path):
+                return
+            try:
+                with np.load(self.path, allow_pickle=False) as data:
+                    if str(data["embedder"]) != self.embedder.name:
+                        logger.info("類似ケースインデックスの埋め込み方式が異なるため再構築します")
+                        return
+                    self.plan_ids = data["plan_ids"]
+                    self.user_ids = data["user_ids"]
+                    self.versions = data["versions"]
+                    self.matrix = data["matrix"]
+            except Exception:
+                logger.exception("類似ケースインデックスの読み込みに失敗しました: %s", self.path)
+                self._reset()
+                return
+            self._positions = {int(plan_id): row for row, plan_id in enumerate(self.plan_ids)}
+
+    def save(self) -> None:
+        """インデックスをファイルに保存（一時ファイル経由で置き換え）"""
+        if not self.path or self.matrix is None:
+            return
+        with self._lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    embedder=np.array(self.embedder.name),
+                    plan_ids=self.plan_ids,
+                    user_ids=self.user_ids,
+                    versions=self.versions,
+                    matrix=self.matrix
+                )
+            os.replace(tmp_path, self.path)
+
+    def upsert(
+        self,
+        plan_ids: Sequence[int],
+        user_ids: Sequence[int],
+        versions: Sequence[float],
+        vectors: np.ndarray
+    ) -> None:
+        """
+        計画のベクトルを追加・更新
+
+        Args:
+            plan_ids: 計画IDのリスト
+            user_ids: 利用者IDのリスト
+            versions: 更新日時（UNIX時刻）のリスト
+            vectors: L2正規化済みのベクトル（件数 × 次元数）
+        """
+        if not len(plan_ids):
+            return
+
+        with self._lock:
+            if self.matrix is None:
+                self.matrix = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+
+            new_rows = []
+            for i, plan_id in enumerate(plan_ids):
+                row = self._positions.get(plan_id)
+                if row is None:
+                    new_rows.append(i)
+                else:
+                    self.matrix[row] = vectors[i]
+                    self.user_ids[row] = user_ids[i]
+                    self.versions[row] = versions[i]
+
+            if new_rows:
+                start = len(self.plan_ids)
+                self.plan_ids = np.concatenate([self.plan_ids, np.asarray(plan_ids, dtype=np.int64)[new_rows]])
+                self.user_ids = np.concatenate([self.user_ids, np.asarray(user_ids, dtype=np.int64)[new_rows]])
+                self.versions = np.concatenate([self.versions, np.asarray(versions, dtype=np.float64)[new_rows]])
+                self.matrix = np.vstack([self.matrix, vectors[new_rows].astype(np.float32)])
+                for offset, i in enumerate(new_rows):
+                    self._positions[plan_ids[i]] = start + offset
+
+    def remove(self, plan_ids: Sequence[int]) -> None:
+        """
+        計画をインデックスから削除
+
+        Args:
+            plan_ids: 計画IDのリスト
+        """
+        with self._lock:
+            if not len(self.plan_ids):
+                return
+            keep = ~np.isin(self.plan_ids, np.asarray(list(plan_ids), dtype=np.int64))
+            if keep.all():
+                return
+            self.plan_ids = self.plan_ids[keep]
+            self.user_ids = self.user_ids[keep]
+            self.versions = self.versions[keep]
+            self.matrix = self.matrix[keep]
+            self._positions = {int(plan_id): row for row, plan_id in enumerate(self.plan_ids)}
+
+    def refresh(self, db: Session) -> Dict[str, int]:
+        """
+        データベースと差分同期
+
+        計画・利用者・計画評価の更新日時を比較し、変更のあった計画だけを
+        再ベクトル化します。削除された計画はインデックスから除外します。
+
+        Args:
+            db: データベースセッション
+
+        Returns:
+            追加・更新件数（updated）と削除件数（removed）
+        """
+        with self._lock:
+            if not self._loaded:
+                self.load()
+
+            current = _load_case_versions(db)
+            stale = [
+                plan_id for plan_id, (_, version) in current.items()
+                if plan_id not in self._positions or self.versions[self._positions[plan_id]] < version
+            ]
+            removed = [int(plan_id) for plan_id in self.plan_ids if int(plan_id) not in current]
+
+            if stale:
+                cases = load_cases(db, stale)
+                plan_ids = [plan_id for plan_id in stale if plan_id in cases]
+                vectors = self.embedder.embed([case_text(cases[plan_id]) for plan_id in plan_ids])
+                self.upsert(
+                    plan_ids,
+                    [current[plan_id][0] for plan_id in plan_ids],
+                    [current[plan_id][1] for plan_id in plan_ids],
+                    vectors
+                )
+            if removed:
+                self.remove(removed)
+            if stale or removed:
+                self.save()
+
+            self._last_refresh = time.monotonic()
+            return {"updated": len(stale), "removed": len(removed)}
+
+    def ensure_fresh(self, db: Session) -> None:
+        """
+        前回の同期から refresh_interval 秒以上経過していれば差分同期
+
+        Args:
+            db: データベースセッション
+        """
+        if self._last_refresh is not None and time.monotonic() - self._last_refresh < self.refresh_interval:
+            return
+        self.refresh(db)
+
+    def search(
+        self,
+        text: str,
+        top_k: int = 5,
+        exclude_user_id: Optional[int] = None
+    ) -> List[Tuple[int, int, float]]:
+        """
+        テキストに類似した計画をコサイン類似度の高い順に検索
+
+        Args:
+            text: 検索テキスト（障害特性・目標など）
+            top_k: 取得件数
+            exclude_user_id: 除外する利用者ID（本人の過去計画を除く場合）
+
+        Returns:
+            (計画ID, 利用者ID, 類似度) のリスト
+        """
+        if not text or not text.strip() or top_k <= 0:
+            return []
+
+        query = self.embedder.embed([text])[0]
+        with self._lock:
+            if self.matrix is None or not len(self.plan_ids):
+                return []
+            scores = self.matrix @ query
+            if exclude_user_id is not None:
+                scores = np.where(self.user_ids == exclude_user_id, -np.inf, scores)
+
+            k = min(top_k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            return [
+                (int(self.plan_ids[row]), int(self.user_ids[row]), float(scores[row]))
+                for row in top
+                if scores[row] > 0
+            ]
+
+
+def case_text(case: Dict[str, Any]) -> str:
+    """
+    類似ケース検索に使うテキストを作成
+
+    Args:
+        case: load_cases が返すケース情報
+
+    Returns:
+        障害特性・長期目標・短期目標・総合評価を連結したテキスト
+    """
+    parts = (
+        case.get("disability_characteristics"),
+        case.get("long_term_goal"),
+        case.get("short_term_goal"),
+        case.get("overall_evaluation"),
+    )
+    return "\n".join(part for part in parts if part)
+
+
+def load_cases(db: Session, plan_ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    計画・利用者の障害特性・最新の総合評価をまとめて取得
+
+    Args:
+        db: データベースセッション
+        plan_ids: 計画IDのリスト
+
+    Returns:
+        計画IDをキーとしたケース情報
+    """
+    cases: Dict[int, Dict[str, Any]] = {}
+    plan_ids = list(plan_ids)
+    for i in range(0, len(plan_ids), QUERY_CHUNK_SIZE):
+        chunk = plan_ids[i:i + QUERY_CHUNK_SIZE]
+
+        ranked = db.query(
+            PlanEvaluation.plan_id.label("plan_id"),
+            PlanEvaluation.overall_evaluation.label("overall_evaluation"),
+            func.row_number().over(
+                partition_by=PlanEvaluation.plan_id,
+                order_by=(PlanEvaluation.evaluation_date.desc(), PlanEvaluation.id.desc())
+            ).label("rank")
+        ).filter(PlanEvaluation.plan_id.in_(chunk)).subquery()
+
+        rows = db.query(
+            Plan.id, Plan.user_id, Plan.plan_number, Plan.start_date, Plan.end_date,
+            Plan.long_term_goal, Plan.short_term_goal,
+            User.disability_characteristics,
+            ranked.c.overall_evaluation
+        ).join(
+            User, Plan.user_id == User.id
+        ).outerjoin(
+            ranked, (ranked.c.plan_id == Plan.id) & (ranked.c.rank == 1)
+        ).filter(Plan.id.in_(chunk)).all()
+
+        for row in rows:
+            cases[row.id] = {
+                "plan_id": row.id,
+                "user_id": row.user_id,
+                "plan_number": row.plan_number,
+                "start_date": row.start_date,
+                "end_date": row.end_date,
+                "long_term_goal": row.long_term_goal,
+                "short_term_goal": row.short_term_goal,
+                "disability_characteristics": row.disability_characteristics,
+                "overall_evaluation": row.overall_evaluation,
+            }
+    return cases
+
+
+def _load_case_versions(db: Session) -> Dict[int, Tuple[int, float]]:
+    """
+    インデックス対象の計画と更新日時を取得
+
+    目標が記入された有効な計画を対象とし、計画・利用者・計画評価のうち
+    最も新しい更新日時をその計画の更新日時とします。
+
+    Returns:
+        計画IDをキーとした (利用者ID, 更新日時のUNIX時刻)
+    """
+    latest_evaluation = db.query(
+        PlanEvaluation.plan_id.label("plan_id"),
+        func.max(PlanEvaluation.updated_at).label("updated_at")
+    ).group_by(PlanEvaluation.plan_id).subquery()
+
+    rows = db.query(
+        Plan.id, Plan.user_id, Plan.updated_at, User.updated_at.label("user_updated_at"),
+        latest_evaluation.c.updated_at.label("evaluation_updated_at")
+    ).join(
+        User, Plan.user_id == User.id
+    ).outerjoin(
+        latest_evaluation, latest_evaluation.c.plan_id == Plan.id
+    ).filter(
+        Plan.is_deleted == False,
+        User.is_deleted == False,
+        or_(Plan.long_term_goal.isnot(None), Plan.short_term_goal.isnot(None))
+    ).all()
+
+    return {
+        row.id: (
+            row.user_id,
+            max(
+                timestamp.timestamp()
+                for timestamp in (row.updated_at, row.user_updated_at, row.evaluation_updated_at)
+                if timestamp is not None
+            )
+        )
+        for row in rows
+    }
+
+
+def _ngram_counts(text: str, sizes: Sequence[int]) -> Counter:
+    """正規化したテキストの文字n-gramを数える"""
+    normalized = hiragana_to_katakana(unicodedata.normalize("NFKC", text or "")).lower()
+    normalized = "".join(normalized.split())
+    counts: Counter = Counter()
+    for size in sizes:
+        counts.update(normalized[i:i + size] for i in range(len(normalized) - size + 1))
+    if not counts and normalized:
+        counts.update(normalized)
+    return counts
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """各行をL2正規化（ゼロベクトルはそのまま）"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _create_embedder():
+    """設定に応じた埋め込み器を作成"""
+    if settings.ai_embedding_model:
+        return OllamaEmbedder(settings.ai_embedding_model)
+    return HashingEmbedder(settings.ai_embedding_dim)
+
+
+# アプリケーション全体で共有する類似ケースインデックス
+similar_case_index = SimilarCaseIndex(
+    _create_embedder(),
+    path=settings.ai_similar_case_index_path or None,
+    refresh_interval=settings.ai_similar_case_refresh_seconds
+)
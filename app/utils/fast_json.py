@@ -0,0 +1,135 @@
+"""
+一覧レスポンスの高速シリアライズ
+
+一覧APIでORMオブジェクトを生成してPydanticモデルで1行ずつ検証する代わりに、
+レスポンススキーマの項目だけを列指定で取得し、行から直接辞書を作成して
+orjson（未インストールの場合は標準のjson）でJSONに変換します。
+
+出力はレスポンススキーマ（response_model）で変換した場合と同じJSONになります
+（benchmarks/bench_list_serialization.py で確認できます）。
+"""
+import json
+from datetime import date, datetime, time
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Type
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Query
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """標準のjsonで変換できない値を変換"""
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    JSONに変換
+
+    FastAPIの JSONResponse と同じ形式（非ASCII文字はそのまま、区切りの空白なし）で出力します。
+
+    Args:
+        content: 変換する値
+
+    Returns:
+        UTF-8のJSON
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """dumps でJSONに変換するレスポンス"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ListProjection:
+    """
+    レスポンススキーマに対応する列指定の取得と辞書への変換
+
+    スキーマの項目のうちモデルの列はそのまま取得し、モデルのプロパティ
+    （User.age、Plan.is_active など）は取得した行に対してプロパティの処理を
+    そのまま適用して求めます。プロパティが参照する列はスキーマに含まれている
+    必要があります（含まれない場合は extra_columns で指定）。
+    """
+
+    def __init__(self, model: Type[Any], schema: Type[BaseModel], extra_columns: Sequence[str] = ()):
+        """
+        初期化
+
+        Args:
+            model: SQLAlchemyのモデルクラス
+            schema: レスポンススキーマ
+            extra_columns: プロパティの計算のために追加で取得する列名
+        """
+        self.fields: List[str] = list(schema.model_fields)
+
+        self._computed: Dict[str, Callable[[Any], Any]] = {}
+        column_names: List[str] = []
+        for name in self.fields:
+            attribute = getattr(model, name, None)
+            if isinstance(attribute, property):
+                self._computed[name] = attribute.fget
+            elif attribute is not None:
+                column_names.append(name)
+            else:
+                raise ValueError(f"{model.__name__} に {name} がありません")
+
+        column_names.extend(name for name in extra_columns if name not in column_names)
+        self.columns = [getattr(model, name).label(name) for name in column_names]
+
+    def apply(self, query: Query) -> Query:
+        """
+        クエリを列指定に変更
+
+        Args:
+            query: モデルを取得するクエリ（絞り込み・並び替え済み）
+
+        Returns:
+            スキーマの項目だけを取得するクエリ
+        """
+        return query.with_entities(*self.columns)
+
+    def to_dicts(self, rows: Iterable[Any]) -> List[Dict[str, Any]]:
+        """
+        取得した行をレスポンスの辞書に変換
+
+        Args:
+            rows: apply したクエリの結果
+
+        Returns:
+            スキーマの項目順の辞書のリスト
+        """
+        fields, computed = self.fields, self._computed
+        items = []
+        for row in rows:
+            mapping = row._mapping
+            items.append({
+                name: computed[name](row) if name in computed else mapping[name]
+                for name in fields
+            })
+        return items
+
+    def response(self, query: Query) -> FastJSONResponse:
+        """
+        一覧のレスポンスを作成
+
+        Args:
+            query: モデルを取得するクエリ（絞り込み・並び替え・件数指定済み）
+
+        Returns:
+            JSONレスポンス
+        """
+        return FastJSONResponse(self.to_dicts(self.apply(query).all()))
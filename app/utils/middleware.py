@@ -0,0 +1,301 @@
+"""
+HTTPレスポンス用のミドルウェア
+
+- ETagMiddleware: GETのJSONレスポンスに弱いETagを付け、If-None-Matchが一致すれば304を返す
+- CompressionMiddleware: 一定サイズ以上のレスポンスをAccept-Encodingに応じてbrotli / gzipで圧縮する
+
+どちらもレスポンス本文を1回で送るレスポンス（JSONResponse / HTMLResponse など）のみを対象とし、
+StreamingResponse（PDF・CSV・Server-Sent Events）は分割されたまま変更せずに送ります。
+"""
+import gzip
+import hashlib
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 圧縮対象のContent-Type
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+# 圧縮しないContent-Type（逐次送信のため）
+UNCOMPRESSIBLE_TYPES = ("text/event-stream",)
+
+
+def _content_type(headers: MutableHeaders) -> str:
+    """Content-Typeのメディアタイプ部分を取得"""
+    return headers.get("content-type", "").split(";")[0].strip().lower()
+
+
+def accepted_encodings(scope: Scope) -> List[str]:
+    """
+    Accept-Encodingヘッダーで受け入れ可能な圧縮形式を取得
+
+    Args:
+        scope: ASGIスコープ
+
+    Returns:
+        圧縮形式の一覧（q=0 の形式は除く）
+    """
+    accepted = []
+    for item in Headers(scope=scope).get("accept-encoding", "").split(","):
+        name, _, params = item.partition(";")
+        key, _, value = params.partition("=")
+        if key.strip() == "q":
+            try:
+                if float(value) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.append(name.strip().lower())
+    return accepted
+
+
+def _add_vary(headers: MutableHeaders, value: str) -> None:
+    """Varyヘッダーに値を追加（重複しない）"""
+    current = [item.strip() for item in headers.get("vary", "").split(",") if item.strip()]
+    if value.lower() not in (item.lower() for item in current):
+        current.append(value)
+    headers["Vary"] = ", ".join(current)
+
+
+def make_etag(body: bytes) -> str:
+    """
+    レスポンス本文から弱いETagを作成
+
+    Args:
+        body: レスポンス本文（圧縮前）
+
+    Returns:
+        弱いETag（例: W/"1a2b..."）
+    """
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    If-None-Matchヘッダーが ETag と一致するかどうか（弱い比較）
+
+    Args:
+        if_none_match: If-None-Matchヘッダーの値
+        etag: レスポンスのETag
+
+    Returns:
+        一致する場合はTrue
+    """
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
+
+
+class _BufferedResponse:
+    """
+    レスポンス開始メッセージと最初の本文を保持し、本文が1回で送られる場合のみ加工するための補助
+
+    サブクラスの process で本文を加工します。本文が分割されている場合は加工せずに送ります。
+    """
+
+    def __init__(self, send: Send):
+        self.send = send
+        self.start: Optional[Message] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+
+        if message["type"] != "http.response.body" or self.start is None:
+            # 本文以外のメッセージ（ファイルの直接送信など）の場合は加工しない
+            self.passthrough = True
+            if self.start is not None:
+                await self.send(self.start)
+            await self.send(message)
+            return
+
+        if message.get("more_body", False):
+            # 逐次送信のレスポンスはそのまま送る
+            self.passthrough = True
+            await self.send(self.start)
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        headers = MutableHeaders(raw=self.start["headers"])
+        processed = await self.process(self.start, headers, body)
+        if processed is not None:
+            body = processed
+            if "content-length" in headers:
+                headers["Content-Length"] = str(len(body))
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": body})
+
+    async def process(self, start: Message, headers: MutableHeaders, body: bytes) -> Optional[bytes]:
+        """
+        本文を加工
+
+        Args:
+            start: レスポンス開始メッセージ（ステータスを変更可能）
+            headers: レスポンスヘッダー（変更可能）
+            body: レスポンス本文
+
+        Returns:
+            加工後の本文（変更しない場合はNone）
+        """
+        raise NotImplementedError
+
+
+class ETagMiddleware:
+    """
+    GETのJSONレスポンスに弱いETagを付けるミドルウェア
+
+    If-None-MatchがETagと一致する場合は本文なしの304を返します。
+    利用者情報を含むため Cache-Control は private（毎回再検証）とします。
+    """
+
+    def __init__(self, app: ASGIApp, path_prefix: str = "/api"):
+        """
+        初期化
+
+        Args:
+            app: ASGIアプリケーション
+            path_prefix: 対象とするパスの接頭辞
+        """
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        await self.app(scope, receive, _ETagResponder(send, if_none_match))
+
+
+class _ETagResponder(_BufferedResponse):
+    """ETagを付けてレスポンスを送る"""
+
+    def __init__(self, send: Send, if_none_match: Optional[str]):
+        super().__init__(send)
+        self.if_none_match = if_none_match
+
+    async def process(self, start: Message, headers: MutableHeaders, body: bytes) -> Optional[bytes]:
+        if start["status"] != 200 or _content_type(headers) != "application/json" or "etag" in headers:
+            return None
+
+        etag = make_etag(body)
+        headers["ETag"] = etag
+        headers.setdefault("Cache-Control", "private, no-cache")
+
+        if self.if_none_match and etag_matches(self.if_none_match, etag):
+            start["status"] = 304
+            for name in ("content-length", "content-type"):
+                if name in headers:
+                    del headers[name]
+            return b""
+        return None
+
+
+class CompressionMiddleware:
+    """
+    レスポンスを圧縮するミドルウェア
+
+    クライアントが受け入れる場合は brotli（brotliモジュールがある場合）、次に gzip で圧縮します。
+    minimum_size 未満の本文や、すでに圧縮済み（Content-Encodingあり）のレスポンスは圧縮しません。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4
+    ):
+        """
+        初期化
+
+        Args:
+            app: ASGIアプリケーション
+            minimum_size: 圧縮する本文の最小サイズ（バイト）
+            gzip_level: gzipの圧縮レベル（1〜9）
+            brotli_quality: brotliの圧縮品質（0〜11）
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = accepted_encodings(scope)
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        else:
+            encoding = None
+
+        await self.app(scope, receive, _CompressionResponder(send, self, encoding))
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        """本文を指定した形式で圧縮"""
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+
+class _CompressionResponder(_BufferedResponse):
+    """本文を圧縮してレスポンスを送る"""
+
+    def __init__(self, send: Send, middleware: CompressionMiddleware, encoding: Optional[str]):
+        super().__init__(send)
+        self.middleware = middleware
+        self.encoding = encoding
+
+    async def process(self, start: Message, headers: MutableHeaders, body: bytes) -> Optional[bytes]:
+        content_type = _content_type(headers)
+        if (
+            "content-encoding" in headers
+            or content_type in UNCOMPRESSIBLE_TYPES
+            or not content_type.startswith(COMPRESSIBLE_TYPES)
+            or len(body) < self.middleware.minimum_size
+        ):
+            return None
+
+        _add_vary(headers, "Accept-Encoding")
+        if self.encoding is None:
+            return None
+
+        compressed = self.middleware.compress(body, self.encoding)
+        if len(compressed) >= len(body):
+            return None
+
+        headers["Content-Encoding"] = self.encoding
+        return compressed
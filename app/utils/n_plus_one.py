@@ -0,0 +1,310 @@
+"""
+N+1クエリの検出（開発・CI用）
+
+1リクエストの中で同じ形のSELECT（パラメータの値だけが異なるSQL）が繰り返し実行された場合に、
+N+1クエリの可能性として警告または例外を発生させます。ループ内で遅延読み込みのリレーション
+（user.assigned_staff、plan.user など）を参照した場合は、そのリレーション名も記録します。
+
+- install_n_plus_one_hooks: SQLAlchemyのイベントでSELECTの実行回数を数える
+- NPlusOneMiddleware: リクエストごとに検出を行う（ルートは /api/users/{user_id} の形で記録）
+- detect_n_plus_one: リクエスト以外（サービスの単体実行やテスト）で検出を行うコンテキストマネージャー
+- n_plus_one_registry: 検出結果の集計（ルート・リレーションごと、format_report でレポート出力）
+
+モード:
+    off: 検出しない
+    warn: NPlusOneWarning の警告とログを出力（pytest の -W error::... で失敗扱いにできる）
+    raise: NPlusOneError を発生させる（テストでは500エラーとして検出される）
+"""
+import json
+import logging
+import re
+import threading
+import warnings
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.request_metrics import route_template
+
+logger = logging.getLogger("app.n_plus_one")
+
+MODES = ("off", "warn", "raise")
+
+# SQLの表示の最大長
+STATEMENT_PREVIEW_LENGTH = 300
+
+_WHITESPACE = re.compile(r"\s+")
+# IN (?, ?, ?) のようにパラメータの数だけが異なる形をまとめる
+_PARAMETER_LIST = re.compile(r"\(\s*(\?|%s|%\(\w+\)s|:\w+|\$\d+)(\s*,\s*(\?|%s|%\(\w+\)s|:\w+|\$\d+))+\s*\)")
+
+
+class NPlusOneWarning(UserWarning):
+    """N+1クエリの可能性がある場合の警告"""
+
+
+class NPlusOneError(RuntimeError):
+    """N+1クエリの可能性がある場合の例外（raiseモード）"""
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    SQLの形を比較用に正規化
+
+    Args:
+        statement: 実行したSQL（パラメータはプレースホルダーのまま）
+
+    Returns:
+        空白とパラメータリストをまとめたSQL
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return _PARAMETER_LIST.sub("(?)", statement)
+
+
+class QueryTracker:
+    """1リクエスト（または detect_n_plus_one の範囲）分のSELECTの実行回数"""
+
+    def __init__(self, label: str, mode: str, threshold: int, scope: Optional[Scope] = None):
+        """
+        初期化
+
+        Args:
+            label: 検出結果に記録する名前（ルート以外で使う場合）
+            mode: warn / raise
+            threshold: 同じ形のSELECTをこの回数実行した時点で検出
+            scope: リクエストのASGIスコープ（ルート名の取得に使用）
+        """
+        self.label = label
+        self.mode = mode
+        self.threshold = threshold
+        self.scope = scope
+        self.counts: Dict[str, int] = {}
+        self.relationships: Dict[str, str] = {}
+        self.detected: List[str] = []
+        self.pending_relationship: Optional[str] = None
+
+    @property
+    def route(self) -> str:
+        """検出結果に記録するルート"""
+        if self.scope is not None:
+            return f'{self.scope["method"]} {route_template(self.scope)}'
+        return self.label
+
+    def record(self, statement: str) -> None:
+        """
+        実行したSQLを記録し、しきい値に達した場合は検出する
+
+        Args:
+            statement: 実行したSQL
+        """
+        relationship, self.pending_relationship = self.pending_relationship, None
+        if statement.lstrip()[:6].upper() != "SELECT":
+            return
+
+        shape = normalize_statement(statement)
+        count = self.counts.get(shape, 0) + 1
+        self.counts[shape] = count
+        if relationship and shape not in self.relationships:
+            self.relationships[shape] = relationship
+
+        if count == self.threshold:
+            self.detected.append(shape)
+            message = self.describe(shape)
+            if self.mode == "raise":
+                raise NPlusOneError(message)
+            warnings.warn(message, NPlusOneWarning, stacklevel=2)
+
+    def describe(self, shape: str) -> str:
+        """
+        検出内容の説明
+
+        Args:
+            shape: 正規化したSQL
+
+        Returns:
+            ルート・リレーション・SQLを含む説明
+        """
+        relationship = self.relationships.get(shape)
+        target = f"リレーション {relationship} の遅延読み込み" if relationship else "同じ形のSELECT"
+        return (
+            f"N+1クエリの可能性: {self.route} で{target}が{self.threshold}回以上実行されました"
+            f"（SQL: {shape[:STATEMENT_PREVIEW_LENGTH]}）"
+        )
+
+
+# 実行中のリクエストの検出対象（同期エンドポイントのスレッドにも引き継がれる）
+_current_tracker: ContextVar[Optional[QueryTracker]] = ContextVar("n_plus_one_tracker", default=None)
+
+
+def _do_orm_execute(orm_execute_state) -> None:
+    tracker = _current_tracker.get()
+    if tracker is not None and orm_execute_state.is_relationship_load:
+        path = orm_execute_state.loader_strategy_path
+        prop = getattr(path, "prop", None) if path is not None else None
+        tracker.pending_relationship = str(prop) if prop is not None else None
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    tracker = _current_tracker.get()
+    if tracker is not None:
+        tracker.record(statement)
+
+
+def install_n_plus_one_hooks(engine: Engine, session_factory) -> None:
+    """
+    N+1クエリの検出に使うイベントを登録（登録済みの場合は何もしない）
+
+    Args:
+        engine: SQLAlchemyエンジン
+        session_factory: セッションファクトリー（遅延読み込みのリレーション名の取得に使用）
+    """
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    if not event.contains(session_factory, "do_orm_execute", _do_orm_execute):
+        event.listen(session_factory, "do_orm_execute", _do_orm_execute)
+
+
+class NPlusOneRegistry:
+    """検出結果をルート・リレーション（またはSQL）ごとに集計"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._incidents: Dict[Tuple[str, str], dict] = {}
+
+    def add(self, tracker: QueryTracker) -> List[dict]:
+        """
+        検出結果を記録
+
+        Args:
+            tracker: 処理が終わった検出対象
+
+        Returns:
+            今回の検出結果（ルート・リレーション・SQL・実行回数）
+        """
+        found = []
+        route = tracker.route
+        with self._lock:
+            for shape in tracker.detected:
+                relationship = tracker.relationships.get(shape)
+                count = tracker.counts[shape]
+                incident = self._incidents.get((route, shape))
+                if incident is None:
+                    incident = {
+                        "route": route,
+                        "relationship": relationship,
+                        "statement": shape[:STATEMENT_PREVIEW_LENGTH],
+                        "occurrences": 0,
+                        "max_count": 0,
+                    }
+                    self._incidents[(route, shape)] = incident
+                incident["occurrences"] += 1
+                incident["max_count"] = max(incident["max_count"], count)
+                found.append({
+                    "route": route,
+                    "relationship": relationship,
+                    "statement": shape[:STATEMENT_PREVIEW_LENGTH],
+                    "count": count,
+                })
+        return found
+
+    def report(self) -> List[dict]:
+        """
+        集計結果を取得
+
+        Returns:
+            検出結果の一覧（実行回数の多い順）
+        """
+        with self._lock:
+            incidents = [dict(incident) for incident in self._incidents.values()]
+        return sorted(incidents, key=lambda item: (-item["max_count"], item["route"]))
+
+    def format_report(self) -> str:
+        """
+        集計結果をテキストで出力
+
+        Returns:
+            ルートごとの検出結果（検出がない場合は空文字列）
+        """
+        lines = []
+        for incident in self.report():
+            target = incident["relationship"] or incident["statement"]
+            lines.append(
+                f'{incident["route"]}: {target}'
+                f'（最大{incident["max_count"]}回、{incident["occurrences"]}リクエスト）'
+            )
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        """記録した結果をすべて削除"""
+        with self._lock:
+            self._incidents.clear()
+
+
+n_plus_one_registry = NPlusOneRegistry()
+
+
+def _finish(tracker: QueryTracker) -> None:
+    """検出結果を集計に記録し、ログを出力"""
+    for incident in n_plus_one_registry.add(tracker):
+        logger.warning(json.dumps({"event": "n_plus_one", **incident}, ensure_ascii=False))
+
+
+@contextmanager
+def detect_n_plus_one(label: str = "<block>", mode: str = "raise", threshold: int = 5) -> Iterator[QueryTracker]:
+    """
+    範囲内でN+1クエリを検出するコンテキストマネージャー
+
+    使用例:
+        with detect_n_plus_one("dashboard.alerts"):
+            DashboardService(db).get_alerts()
+
+    Args:
+        label: 検出結果に記録する名前
+        mode: warn / raise
+        threshold: 同じ形のSELECTをこの回数実行した時点で検出
+
+    Yields:
+        検出対象（counts・detected で実行回数と検出結果を参照できる）
+    """
+    tracker = QueryTracker(label, mode, threshold)
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
+        _finish(tracker)
+
+
+class NPlusOneMiddleware:
+    """リクエストごとにN+1クエリを検出するミドルウェア"""
+
+    def __init__(self, app: ASGIApp, mode: str = "warn", threshold: int = 5):
+        """
+        初期化
+
+        Args:
+            app: ASGIアプリケーション
+            mode: warn / raise
+            threshold: 同じ形のSELECTをこの回数実行した時点で検出
+        """
+        if mode not in MODES:
+            raise ValueError(f"N+1クエリの検出モードが不正です: {mode}")
+        self.app = app
+        self.mode = mode
+        self.threshold = threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.mode == "off":
+            await self.app(scope, receive, send)
+            return
+
+        tracker = QueryTracker(scope["path"], self.mode, self.threshold, scope=scope)
+        token = _current_tracker.set(tracker)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_tracker.reset(token)
+            _finish(tracker)
@@ -0,0 +1,310 @@
+"""
+リクエストごとの処理時間・SQL実行回数の計測
+
+- install_sql_hooks: SQLAlchemyのイベントでSQLの実行回数と実行時間を、実行中のリクエストに記録する
+- RequestMetricsMiddleware: リクエストごとに処理時間・DB時間・SQL実行回数を計測し、
+  Server-Timingヘッダー、構造化ログ（JSON 1行）、メトリクス（MetricsRegistry）に出力する
+- MetricsRegistry: ルートごとのヒストグラムを保持し、Prometheusのテキスト形式で出力する（/metrics）
+
+メトリクスはワーカープロセスごとに集計されます（複数ワーカーの場合はワーカーごとの値）。
+"""
+import json
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+request_logger = logging.getLogger("app.requests")
+
+# ヒストグラムの区切り（秒）
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# ヒストグラムの区切り（SQL実行回数）
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# ルートに一致しなかったリクエストのラベル（パスをそのまま使うと種類が増え続けるため）
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestStats:
+    """1リクエスト分のSQL実行回数・実行時間"""
+
+    __slots__ = ("statements", "db_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+
+
+# 実行中のリクエストの計測値（同期エンドポイントのスレッドにも引き継がれる）
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """
+    実行中のリクエストの計測値を取得
+
+    Returns:
+        計測値（リクエストの処理中でない場合はNone）
+    """
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        context._request_metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started = getattr(context, "_request_metrics_started", None)
+    if stats is not None and started is not None:
+        stats.statements += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+def install_sql_hooks(engine: Engine) -> None:
+    """
+    SQLの実行回数・実行時間を記録するイベントを登録（登録済みの場合は何もしない）
+
+    Args:
+        engine: SQLAlchemyエンジン
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class _Histogram:
+    """区切りごとの件数・合計・件数"""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, buckets: Sequence[float], value: float) -> None:
+        for index, bound in enumerate(buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.total += value
+        self.count += 1
+
+
+def _escape_label(value: str) -> str:
+    """Prometheusのラベル値をエスケープ"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    return ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs)
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """
+    ルートごとのリクエスト件数とヒストグラム
+
+    - http_requests_total: メソッド・ルート・ステータスごとの件数
+    - http_request_duration_seconds: 処理時間
+    - http_request_db_seconds: SQLの実行時間の合計
+    - http_request_db_statements: SQLの実行回数
+    """
+
+    HISTOGRAMS = (
+        ("http_request_duration_seconds", "リクエストの処理時間（秒）", DURATION_BUCKETS),
+        ("http_request_db_seconds", "リクエスト内のSQL実行時間の合計（秒）", DURATION_BUCKETS),
+        ("http_request_db_statements", "リクエスト内のSQL実行回数", STATEMENT_BUCKETS),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str, str], int] = {}
+        self._histograms: Dict[Tuple[str, str], List[_Histogram]] = {}
+
+    def observe(self, method: str, route: str, status: int, duration: float, db_seconds: float, statements: int) -> None:
+        """
+        1リクエスト分の計測値を記録
+
+        Args:
+            method: HTTPメソッド
+            route: ルートのパス（例: /api/users/{user_id}）
+            status: ステータスコード
+            duration: 処理時間（秒）
+            db_seconds: SQLの実行時間の合計（秒）
+            statements: SQLの実行回数
+        """
+        with self._lock:
+            key = (method, route, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+            histograms = self._histograms.get((method, route))
+            if histograms is None:
+                histograms = [_Histogram(len(buckets)) for _, _, buckets in self.HISTOGRAMS]
+                self._histograms[(method, route)] = histograms
+            for (_, _, buckets), histogram, value in zip(
+                self.HISTOGRAMS, histograms, (duration, db_seconds, statements)
+            ):
+                histogram.observe(buckets, value)
+
+    def render(self) -> str:
+        """
+        Prometheusのテキスト形式で出力
+
+        Returns:
+            メトリクスのテキスト
+        """
+        with self._lock:
+            lines = [
+                "# HELP http_requests_total リクエスト件数",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), count in sorted(self._requests.items()):
+                labels = _labels((("method", method), ("route", route), ("status", status)))
+                lines.append(f"http_requests_total{{{labels}}} {count}")
+
+            for index, (name, description, buckets) in enumerate(self.HISTOGRAMS):
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} histogram")
+                for (method, route), histograms in sorted(self._histograms.items()):
+                    histogram = histograms[index]
+                    labels = _labels((("method", method), ("route", route)))
+                    cumulative = 0
+                    for bound, count in zip(buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{labels},le="{_format_number(bound)}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{name}_sum{{{labels}}} {_format_number(histogram.total)}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """記録した値をすべて削除"""
+        with self._lock:
+            self._requests.clear()
+            self._histograms.clear()
+
+
+metrics_registry = MetricsRegistry()
+
+
+def route_template(scope: Scope) -> str:
+    """
+    リクエストが一致したルートのパス（パラメータはそのまま）を取得
+
+    Args:
+        scope: 処理後のASGIスコープ
+
+    Returns:
+        ルートのパス（一致しなかった場合は UNMATCHED_ROUTE）
+    """
+    # FastAPIのincluded routerでは scope["route"] のパスにプレフィックスが含まれないため、
+    # プレフィックス込みのルート（effective_route_context）があればそちらを使う
+    fastapi_scope = scope.get("fastapi")
+    route = fastapi_scope.get("effective_route_context") if isinstance(fastapi_scope, dict) else None
+    path = getattr(route or scope.get("route"), "path", None)
+    return path or UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """
+    リクエストごとの処理時間・DB時間・SQL実行回数を計測するミドルウェア
+
+    レスポンスには Server-Timing ヘッダー（app: 処理時間、db: SQLの実行時間と回数）を付け、
+    処理の完了後に構造化ログを出力してメトリクスに記録します。Server-Timingの値は
+    レスポンス開始までの計測値で、ログ・メトリクスは本文の送信完了までの計測値です。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        registry: Optional[MetricsRegistry] = None,
+        exclude_prefixes: Sequence[str] = ("/static",),
+        log_enabled: bool = True,
+        log_slow_ms: float = 0
+    ):
+        """
+        初期化
+
+        Args:
+            app: ASGIアプリケーション
+            registry: 記録先（省略時は metrics_registry）
+            exclude_prefixes: 計測しないパスの接頭辞
+            log_enabled: 構造化ログを出力するかどうか
+            log_slow_ms: この時間（ミリ秒）以上のリクエストのみログを出力（0で全件）
+        """
+        self.app = app
+        self.registry = registry or metrics_registry
+        self.exclude_prefixes = tuple(exclude_prefixes)
+        self.log_enabled = log_enabled
+        self.log_slow_ms = log_slow_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'app;dur={elapsed_ms:.1f}, '
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} queries"'
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            duration = time.perf_counter() - started
+            route = route_template(scope)
+            self.registry.observe(
+                scope["method"], route, status_code, duration, stats.db_seconds, stats.statements
+            )
+            if self.log_enabled and duration * 1000 >= self.log_slow_ms:
+                request_logger.info(json.dumps({
+                    "event": "request",
+                    "method": scope["method"],
+                    "route": route,
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round(duration * 1000, 2),
+                    "db_ms": round(stats.db_seconds * 1000, 2),
+                    "db_statements": stats.statements,
+                }, ensure_ascii=False))
+
+
+def configure_request_logger() -> None:
+    """
+    構造化ログ（app.requests）を標準エラー出力に出力する設定
+
+    ハンドラーが設定済みの場合（ログ設定ファイルなどで設定した場合）は変更しません。
+    """
+    if request_logger.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    request_logger.addHandler(handler)
+    request_logger.setLevel(logging.INFO)
+    request_logger.propagate = False
@@ -0,0 +1,249 @@
+"""
+スロークエリの記録と実行計画の取得
+
+しきい値以上の時間がかかったSQLを、パラメータ（個人情報はマスク）・実行時間・実行元のルート・
+実行計画（SQLiteは EXPLAIN QUERY PLAN、それ以外は EXPLAIN）とともにリングバッファに記録します。
+記録した内容は管理者用API（GET /api/admin/slow-queries）で確認できます。
+
+- install_slow_query_log: SQLAlchemyのイベントでSQLの実行時間を計測する
+- SlowQueryMiddleware: 実行中のリクエストのルートを記録に使えるようにする
+- slow_query_log: 記録先（ワーカープロセスごと）
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from datetime import date, datetime, time as time_of_day
+from typing import Any, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.request_metrics import route_template
+
+logger = logging.getLogger("app.slow_queries")
+
+# 実行計画を保持するSQLの最大数（同じSQLでは実行計画を再取得しない）
+EXPLAIN_CACHE_SIZE = 200
+
+# 実行中のリクエストのASGIスコープ（同期エンドポイントのスレッドにも引き継がれる）
+_current_scope: ContextVar[Optional[Scope]] = ContextVar("slow_query_scope", default=None)
+
+
+def mask_parameter(value: Any) -> Any:
+    """
+    SQLのパラメータの個人情報をマスク
+
+    氏名・住所・生年月日などが含まれるため、文字列と日付は型と長さのみ残します。
+    数値（ID・件数など）と真偽値・NULLはそのまま残します。
+
+    Args:
+        value: パラメータの値
+
+    Returns:
+        マスクした値
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return f"<str len={len(value)}>"
+    if isinstance(value, (datetime, date, time_of_day)):
+        return f"<{type(value).__name__}>"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<bytes len={len(value)}>"
+    if isinstance(value, dict):
+        return {key: mask_parameter(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [mask_parameter(item) for item in value]
+    return f"<{type(value).__name__}>"
+
+
+class SlowQueryLog:
+    """
+    スロークエリの記録（リングバッファ）
+
+    直近の max_entries 件のみ保持し、古いものから削除します。
+    """
+
+    def __init__(self, threshold_ms: float = 200, max_entries: int = 100, explain: bool = True):
+        """
+        初期化
+
+        Args:
+            threshold_ms: この時間（ミリ秒）以上かかったSQLを記録
+            max_entries: 保持する最大件数
+            explain: 実行計画を取得するかどうか
+        """
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self._lock = threading.Lock()
+        self._entries: deque = deque(maxlen=max_entries)
+        self._plans: "OrderedDict[str, List[str]]" = OrderedDict()
+
+    @property
+    def max_entries(self) -> int:
+        """保持する最大件数"""
+        return self._entries.maxlen
+
+    def configure(self, threshold_ms: float, max_entries: int, explain: bool) -> None:
+        """
+        設定を変更（保持件数を変更した場合は新しい順に残す）
+
+        Args:
+            threshold_ms: この時間（ミリ秒）以上かかったSQLを記録
+            max_entries: 保持する最大件数
+            explain: 実行計画を取得するかどうか
+        """
+        with self._lock:
+            self.threshold_ms = threshold_ms
+            self.explain = explain
+            if max_entries != self._entries.maxlen:
+                self._entries = deque(self._entries, maxlen=max_entries)
+
+    def _explain(self, conn, statement: str, parameters, executemany: bool) -> Optional[List[str]]:
+        """
+        実行計画を取得（SELECTのみ。取得できない場合はNone）
+
+        SQLAlchemyのイベントが再度発生しないよう、DBAPIのカーソルで直接実行します。
+        """
+        keyword = statement.lstrip()[:6].upper()
+        if not self.explain or executemany or not (keyword == "SELECT" or keyword.startswith("WITH")):
+            return None
+
+        with self._lock:
+            plan = self._plans.get(statement)
+            if plan is not None:
+                self._plans.move_to_end(statement)
+                return plan
+
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(prefix + statement, parameters)
+                plan = [
+                    " ".join(str(column) for column in row) if conn.dialect.name != "sqlite" else str(row[-1])
+                    for row in cursor.fetchall()
+                ]
+            finally:
+                cursor.close()
+        except Exception as e:
+            logger.debug("実行計画を取得できませんでした: %s", e)
+            return None
+
+        with self._lock:
+            self._plans[statement] = plan
+            while len(self._plans) > EXPLAIN_CACHE_SIZE:
+                self._plans.popitem(last=False)
+        return plan
+
+    def record(self, conn, statement: str, parameters, duration: float, executemany: bool) -> Optional[dict]:
+        """
+        SQLの実行時間を確認し、しきい値以上の場合は記録
+
+        Args:
+            conn: SQLAlchemyの接続
+            statement: 実行したSQL
+            parameters: パラメータ
+            duration: 実行時間（秒）
+            executemany: 複数行をまとめて実行した場合はTrue
+
+        Returns:
+            記録した内容（しきい値未満の場合はNone）
+        """
+        duration_ms = duration * 1000
+        if self.threshold_ms <= 0 or duration_ms < self.threshold_ms:
+            return None
+
+        scope = _current_scope.get()
+        entry = {
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "duration_ms": round(duration_ms, 2),
+            "route": f'{scope["method"]} {route_template(scope)}' if scope is not None else None,
+            "statement": statement,
+            "parameters": (
+                f"<executemany rows={len(parameters)}>" if executemany else mask_parameter(parameters)
+            ),
+            "plan": self._explain(conn, statement, parameters, executemany),
+        }
+        with self._lock:
+            self._entries.append(entry)
+        logger.warning(json.dumps({
+            "event": "slow_query",
+            "duration_ms": entry["duration_ms"],
+            "route": entry["route"],
+            "statement": " ".join(statement.split())[:300],
+        }, ensure_ascii=False))
+        return entry
+
+    def entries(self) -> List[dict]:
+        """
+        記録した内容を取得
+
+        Returns:
+            記録の一覧（新しい順）
+        """
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        """記録した内容をすべて削除"""
+        with self._lock:
+            self._entries.clear()
+            self._plans.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._slow_query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_slow_query_started", None)
+    if started is not None:
+        slow_query_log.record(conn, statement, parameters, time.perf_counter() - started, executemany)
+
+
+def install_slow_query_log(engine: Engine, threshold_ms: float, max_entries: int, explain: bool = True) -> None:
+    """
+    スロークエリを記録するイベントを登録（登録済みの場合は設定のみ変更）
+
+    Args:
+        engine: SQLAlchemyエンジン
+        threshold_ms: この時間（ミリ秒）以上かかったSQLを記録
+        max_entries: 保持する最大件数
+        explain: 実行計画を取得するかどうか
+    """
+    slow_query_log.configure(threshold_ms, max_entries, explain)
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class SlowQueryMiddleware:
+    """実行中のリクエストのルートをスロークエリの記録に使えるようにするミドルウェア"""
+
+    def __init__(self, app: ASGIApp):
+        """
+        初期化
+
+        Args:
+            app: ASGIアプリケーション
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
@@ -0,0 +1,134 @@
+"""
+静的ファイルの配信ユーティリティ
+
+scripts/build_static.py で作成した、内容のハッシュ付きファイル名の縮小済み静的ファイル
+（app/static/dist）の参照と配信を行います。
+
+- static_url: テンプレートから元のパスを指定してハッシュ付きのURLを取得
+- PrecompressedStaticFiles: 事前圧縮したファイル（.br / .gz）をAccept-Encodingに応じて配信し、
+  ハッシュ付きのファイルには長期間のキャッシュ（immutable）を指定
+
+ビルドしていない場合は元のファイルをそのまま配信します。
+"""
+import json
+import mimetypes
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from app.utils.middleware import accepted_encodings
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+DIST_DIRNAME = "dist"
+MANIFEST_FILENAME = "manifest.json"
+STATIC_URL_PREFIX = "/static"
+
+# ハッシュ付きファイル名（例: js/main.1a2b3c4d5e.js）
+HASHED_NAME_PATTERN = re.compile(r"\.[0-9a-f]{10}\.[A-Za-z0-9]+$")
+
+# 事前圧縮ファイルの拡張子（優先順）
+ENCODINGS: List[Tuple[str, str]] = [("br", ".br"), ("gzip", ".gz")]
+
+# ハッシュ付きファイルは内容が変わるとファイル名も変わるため、1年間キャッシュさせる
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# ハッシュなしのファイルは毎回再検証させる（変更がなければ304）
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+@lru_cache()
+def load_manifest() -> Dict[str, str]:
+    """
+    ビルド結果のマニフェスト（元のパス → ハッシュ付きのパス）を取得
+
+    Returns:
+        マニフェスト（ビルドしていない場合は空）
+    """
+    path = STATIC_DIR / DIST_DIRNAME / MANIFEST_FILENAME
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def static_url(path: str) -> str:
+    """
+    静的ファイルのURLを取得（テンプレート用）
+
+    Args:
+        path: app/static からの相対パス（例: js/main.js）
+
+    Returns:
+        ハッシュ付きファイルのURL（ビルドしていない場合は元のファイルのURL）
+    """
+    path = path.lstrip("/")
+    hashed = load_manifest().get(path)
+    if hashed:
+        return f"{STATIC_URL_PREFIX}/{DIST_DIRNAME}/{hashed}"
+    return f"{STATIC_URL_PREFIX}/{path}"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    事前圧縮したファイルを配信する静的ファイルハンドラー
+
+    要求されたファイルと同じ場所に .br / .gz のファイルがあり、クライアントが
+    その形式を受け入れる場合は圧縮済みのファイルを返します。
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        """
+        静的ファイルのレスポンスを作成
+
+        Args:
+            path: 要求されたパス
+            scope: ASGIスコープ
+
+        Returns:
+            レスポンス
+        """
+        immutable = path.startswith(DIST_DIRNAME + "/") and bool(HASHED_NAME_PATTERN.search(path))
+
+        response = None
+        if immutable:
+            response = self._precompressed_response(path, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+            if immutable:
+                response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    def _precompressed_response(self, path: str, scope: Scope) -> Optional[Response]:
+        """受け入れ可能な事前圧縮ファイルがあればそのレスポンスを作成"""
+        accepted = accepted_encodings(scope)
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            full_path, stat_result = self.lookup_path(path + suffix)
+            if stat_result is None:
+                continue
+            response = self.file_response(full_path, stat_result, scope)
+            # 元のファイルの種類で返す（.gz / .br の種類にしない）
+            response.headers["Content-Type"] = _media_type(path)
+            response.headers["Content-Encoding"] = encoding
+            return response
+        return None
+
+
+def _media_type(path: str) -> str:
+    """ファイルの拡張子からContent-Typeを取得"""
+    media_type, _ = mimetypes.guess_type(os.path.basename(path))
+    if media_type is None:
+        return "application/octet-stream"
+    if media_type.startswith("text/") or media_type == "application/javascript":
+        return f"{media_type}; charset=utf-8"
+    return media_type
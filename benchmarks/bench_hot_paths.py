@@ -0,0 +1,495 @@
+"""
+主要処理のマイクロベンチマーク
+
+よく呼ばれる処理の所要時間を計測し、保存したベースラインと比較します。
+
+- hiragana_to_katakana（利用者検索のかな変換）
+- OllamaAIAssistantService._parse_response（大きなレスポンス）・_build_prompt
+- _get_org_node_type（ネットワーク図のノード種別の判定）
+- PDFService.generate_*（各PDF出力）
+- User.age（大量の利用者）
+- user_csv_row（利用者CSVの行作成）
+
+各ケースは1回の計測が --min-time 秒以上になるように実行回数を調整し、
+--repeat 回計測した1回あたりの中央値・最小値を記録します。
+
+結果は benchmarks/results/hot_paths.json に出力し、履歴として
+benchmarks/results/hot_paths_history.jsonl に追記します。ベースライン
+（benchmarks/baselines/<名前>.json）がある場合は比較結果を表示し、中央値が
+--tolerance を超えて遅くなったケースがあれば終了コード1で終了します。
+ベースラインは計測した環境に依存するため、同じ環境の結果同士で比較してください。
+
+使い方:
+    python benchmarks/bench_hot_paths.py --save-baseline          # ベースラインを保存
+    python benchmarks/bench_hot_paths.py                          # ベースラインと比較
+    python benchmarks/bench_hot_paths.py --filter pdf --repeat 3  # 名前に pdf を含むケースのみ
+    python benchmarks/bench_hot_paths.py --baseline ci --tolerance 0.5
+"""
+import argparse
+import base64
+import csv
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import app.models  # noqa: F401  （全テーブルを登録）
+import app.models.plan_evaluation  # noqa: F401  （Plan のリレーション先）
+from app.models import Consultation, Medication, Monitoring, Plan, PrescribingDoctor, Staff, User
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# ケース名 → 計測対象の関数を作成する関数（準備の時間は計測しない）
+CASES: Dict[str, Callable[[], Callable[[], Any]]] = {}
+
+
+def case(name: str):
+    """ベンチマークケースを登録するデコレーター"""
+    def register(setup: Callable[[], Callable[[], Any]]):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+# ---------------------------------------------------------------------------
+# テストデータ
+# ---------------------------------------------------------------------------
+
+def _staff() -> Staff:
+    return Staff(id=1, username="bench", password_hash="x", name="山田 花子", role="staff")
+
+
+def _users(count: int) -> List[User]:
+    """計測用の利用者（データベースには保存しない）"""
+    rng = random.Random(0)
+    staff = _staff()
+    created = datetime(2026, 4, 1, 9, 30)
+    users = []
+    for i in range(count):
+        level = rng.choice([None, 1, 2, 3, 4, 5, 6])
+        users.append(User(
+            id=i + 1,
+            name=f"{rng.choice(['山田', '佐藤', '鈴木'])} {rng.choice(['太郎', '花子', '一郎'])}",
+            name_kana="ヤマダ タロウ",
+            birth_date=date(1950, 1, 1) + timedelta(days=rng.randint(0, 25000)),
+            gender=rng.choice(["男性", "女性"]),
+            postal_code="803-0814",
+            address="福岡県北九州市小倉北区大手町12-3",
+            phone="093-521-1234",
+            disability_support_level=level,
+            disability_support_certified_date=date(2025, 4, 1) if level else None,
+            disability_support_expiry_date=date(2028, 3, 31) if level else None,
+            guardian_type="成年後見人" if i % 7 == 0 else None,
+            guardian_name="小林 太郎" if i % 7 == 0 else None,
+            assigned_staff=staff,
+            created_at=created,
+            updated_at=created,
+        ))
+    return users
+
+
+def _plan(user: User, staff: Staff) -> Plan:
+    return Plan(
+        id=1,
+        user=user,
+        staff=staff,
+        plan_type="更新",
+        plan_number="2026-001",
+        created_date=date(2026, 3, 20),
+        start_date=date(2026, 4, 1),
+        end_date=date(2027, 3, 31),
+        current_situation="日中は生活介護事業所に通所し、週末は家族と過ごしている。" * 5,
+        hopes_and_needs="一人暮らしに向けて家事の練習をしたい。" * 5,
+        support_policy="本人の意向を尊重し、段階的に自立した生活を目指す。" * 5,
+        long_term_goal="グループホームで安定した生活を送る",
+        long_term_goal_period="1年",
+        short_term_goal="週2回の調理実習に参加する",
+        short_term_goal_period="6ヶ月",
+        services=[
+            {"service_type": "生活介護", "provider": "生活支援センター門司", "frequency": "週5回"},
+            {"service_type": "短期入所", "provider": "グループホーム小倉南", "frequency": "月2回"},
+        ],
+        approval_status="実施中",
+        approval_date=date(2026, 3, 25),
+    )
+
+
+def _medications(user: User, count: int) -> List[Medication]:
+    doctor = PrescribingDoctor(id=1, name="木村 医師")
+    return [
+        Medication(
+            id=i + 1,
+            user=user,
+            prescribing_doctor=doctor,
+            medication_name=f"リスペリドン錠{i + 1}mg",
+            generic_name="リスペリドン",
+            dosage="1錠",
+            frequency="1日2回",
+            timing="朝夕食後",
+            start_date=date(2025, 1, 1),
+            end_date=None if i % 3 else date(2025, 12, 31),
+            is_current=bool(i % 3),
+            purpose="統合失調症",
+        )
+        for i in range(count)
+    ]
+
+
+def _png_base64(width: int = 800, height: int = 600) -> str:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (240, 244, 248)).save(buffer, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def _large_response(sections: int = 20) -> str:
+    """大きな計画提案レスポンス（見出しと本文の繰り返し）"""
+    paragraph = "本人は日中活動に安定して参加しており、生活リズムも整ってきている。" * 4
+    parts = []
+    for _ in range(sections):
+        parts.extend([
+            "【現在の状況】", paragraph, paragraph,
+            "【本人・家族の希望やニーズ】", paragraph,
+            "【総合的な援助方針】", paragraph, paragraph,
+            "【長期目標】", paragraph,
+            "【短期目標】", paragraph,
+            "【推奨サービス】",
+            *[f"{i}. 生活介護 - 日中の活動の場を提供し、生活リズムを整える" for i in range(1, 6)],
+            "",
+        ])
+    return "\n".join(parts)
+
+
+def _prompt_context() -> Dict[str, Any]:
+    return {
+        "user_profile": {"age": 34, "gender": "男性", "disability_support_level": 4},
+        "disability_info": {
+            "characteristics": "自閉スペクトラム症。予定の変更が苦手で、事前の説明が必要。" * 10,
+            "interests": "電車、時刻表、路線図" * 5,
+        },
+        "medications": [
+            {"name": f"薬品{i}", "purpose": "統合失調症", "dosage": "1錠", "frequency": "1日2回"}
+            for i in range(10)
+        ],
+        "consultations": [
+            {"date": f"2026-0{i + 1}-15", "content": "日中活動の様子について聞き取りを行った。" * 20}
+            for i in range(5)
+        ],
+        "previous_plan": {
+            "start_date": "2025-04-01", "end_date": "2026-03-31",
+            "current_situation": "通所は安定している。" * 10,
+            "long_term_goal": "グループホームで安定した生活を送る",
+            "short_term_goal": "週2回の調理実習に参加する",
+        },
+        "previous_evaluation": {
+            "achievement_status": "一部達成",
+            "achievement_details": "調理実習には毎回参加できた。" * 5,
+            "challenges": "金銭管理に課題がある。" * 5,
+            "next_actions": "金銭管理の練習を計画に加える。" * 5,
+        },
+        "similar_cases": [
+            {
+                "similarity": 0.9 - i * 0.05,
+                "disability_characteristics": "自閉スペクトラム症",
+                "long_term_goal": "一人暮らしを始める",
+                "short_term_goal": "家事の練習をする",
+                "overall_evaluation": "良好",
+            }
+            for i in range(5)
+        ],
+    }
+
+
+# ---------------------------------------------------------------------------
+# ケース
+# ---------------------------------------------------------------------------
+
+@case("kana.hiragana_to_katakana.short")
+def _kana_short():
+    from app.utils.kana_converter import hiragana_to_katakana
+    return lambda: hiragana_to_katakana("やまだ たろう")
+
+
+@case("kana.hiragana_to_katakana.10k_chars")
+def _kana_long():
+    from app.utils.kana_converter import hiragana_to_katakana
+    text = ("やまだ たろう ヤマダ 山田 abc " * 500)[:10000]
+    return lambda: hiragana_to_katakana(text)
+
+
+@case("ai._parse_response.large")
+def _parse_response():
+    from app.services.ai_assistant_service import OllamaAIAssistantService
+    service = OllamaAIAssistantService(db=None)
+    response = _large_response()
+    return lambda: service._parse_response(response)
+
+
+@case("ai._build_prompt.full_context")
+def _build_prompt():
+    from app.services.ai_assistant_service import OllamaAIAssistantService
+    service = OllamaAIAssistantService(db=None)
+    context = _prompt_context()
+    return lambda: service._build_prompt(context)
+
+
+@case("network._get_org_node_type.1k_pairs")
+def _org_node_type():
+    from app.api.network import _get_org_node_type
+    relationships = ["通所", "主治医", "後見人", "入院", "相談", "", "サービス利用", "訪問看護"]
+    organizations = ["サービス事業所", "医療機関", "後見人", "その他", "障害者支援施設", "クリニック", ""]
+    rng = random.Random(0)
+    pairs = [(rng.choice(relationships), rng.choice(organizations)) for _ in range(1000)]
+    return lambda: [_get_org_node_type(rel, org) for rel, org in pairs]
+
+
+@case("user.age.10k_users")
+def _user_age():
+    users = _users(10000)
+    return lambda: [user.age for user in users]
+
+
+@case("users.user_csv_row.10k_users")
+def _csv_rows():
+    from app.api.users import USER_CSV_HEADER, user_csv_row
+    users = _users(10000)
+
+    def run():
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(USER_CSV_HEADER)
+        writer.writerows(user_csv_row(user) for user in users)
+        return output.getvalue().encode("shift_jis", errors="replace")
+
+    return run
+
+
+def _pdf_service():
+    """PDFService を作成（フォントの登録は計測しない）"""
+    from app.services.pdf_service import PDFService
+    return PDFService()
+
+
+@case("pdf.generate_user_profile_pdf")
+def _pdf_user():
+    pdf, user = _pdf_service(), _users(1)[0]
+    return lambda: pdf.generate_user_profile_pdf(user)
+
+
+@case("pdf.generate_plan_pdf")
+def _pdf_plan():
+    pdf, plan = _pdf_service(), _plan(_users(1)[0], _staff())
+    return lambda: pdf.generate_plan_pdf(plan)
+
+
+@case("pdf.generate_monitoring_pdf")
+def _pdf_monitoring():
+    pdf, user, staff = _pdf_service(), _users(1)[0], _staff()
+    monitoring = Monitoring(
+        id=1, plan=_plan(user, staff), user=user, staff=staff,
+        monitoring_date=date(2026, 9, 1), monitoring_type="定期",
+        service_usage_status="予定どおり通所している。" * 5,
+        goal_achievement="調理実習に毎回参加できている。" * 5,
+        satisfaction="満足", changes_in_needs="特になし", issues_and_concerns="金銭管理に課題がある。",
+        future_policy="現在の支援を継続する。", plan_revision_needed=False,
+        next_monitoring_date=date(2026, 12, 1),
+    )
+    return lambda: pdf.generate_monitoring_pdf(monitoring)
+
+
+@case("pdf.generate_consultation_pdf")
+def _pdf_consultation():
+    pdf = _pdf_service()
+    consultation = Consultation(
+        id=1, user=_users(1)[0], staff=_staff(), consultation_date=date(2026, 9, 1),
+        consultation_type="来所", content="日中活動の様子について聞き取りを行った。" * 30,
+        response="次回の面談で状況を確認することとした。" * 5,
+    )
+    return lambda: pdf.generate_consultation_pdf(consultation)
+
+
+@case("pdf.generate_network_pdf")
+def _pdf_network():
+    pdf, image = _pdf_service(), _png_base64()
+    return lambda: pdf.generate_network_pdf(image, "山田 太郎")
+
+
+@case("pdf.generate_medications_pdf")
+def _pdf_medications():
+    pdf, user = _pdf_service(), _users(1)[0]
+    medications = _medications(user, 20)
+    return lambda: pdf.generate_medications_pdf(user, medications)
+
+
+# ---------------------------------------------------------------------------
+# 計測・比較
+# ---------------------------------------------------------------------------
+
+def measure(func: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, Any]:
+    """
+    1回あたりの所要時間を計測
+
+    Args:
+        func: 計測対象
+        repeat: 計測回数
+        min_time: 1回の計測の最小時間（秒）。これを超えるまで実行回数を増やす
+
+    Returns:
+        実行回数・1回あたりの中央値・最小値（マイクロ秒）
+    """
+    func()  # 初回の読み込み・キャッシュ作成を除外
+
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    timings = [elapsed / loops]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter() - started) / loops)
+
+    return {
+        "loops": loops,
+        "median_us": round(statistics.median(timings) * 1_000_000, 3),
+        "min_us": round(min(timings) * 1_000_000, 3),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    ベースラインと比較して結果に変化率を追加
+
+    Args:
+        results: ケースごとの計測結果（change・status を追加）
+        baseline: ベースラインのケースごとの計測結果
+        tolerance: 遅くなったとみなす変化率（0.25 = 25%）
+
+    Returns:
+        遅くなったケース名の一覧
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if "error" in result or not base or "error" in base:
+            continue
+        change = result["median_us"] / base["median_us"] - 1
+        result["baseline_median_us"] = base["median_us"]
+        result["change"] = round(change, 4)
+        if change > tolerance:
+            result["status"] = "slower"
+            regressions.append(name)
+        elif change < -tolerance:
+            result["status"] = "faster"
+        else:
+            result["status"] = "same"
+    return regressions
+
+
+def _format_us(value: float) -> str:
+    """マイクロ秒を読みやすい単位で表示"""
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:.2f}s"
+    if value >= 1000:
+        return f"{value / 1000:.2f}ms"
+    return f"{value:.2f}µs"
+
+
+STATUS_MARKS = {"slower": "❌ 遅化", "faster": "🚀 高速化", "same": "✅"}
+
+
+def main():
+    """ベンチマークを実行"""
+    parser = argparse.ArgumentParser(description="主要処理のマイクロベンチマークを実行します")
+    parser.add_argument("--filter", help="名前にこの文字列を含むケースのみ実行")
+    parser.add_argument("--repeat", type=int, default=5, help="計測回数（既定: 5）")
+    parser.add_argument("--min-time", type=float, default=0.2, help="1回の計測の最小秒数（既定: 0.2）")
+    parser.add_argument("--baseline", default="local", help="ベースラインの名前（既定: local）")
+    parser.add_argument("--save-baseline", action="store_true", help="結果をベースラインとして保存")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="遅化とみなす変化率（既定: 0.25）")
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "hot_paths.json", help="結果の出力先")
+    parser.add_argument("--list", action="store_true", help="ケースの一覧を表示")
+    args = parser.parse_args()
+
+    names = [name for name in CASES if not args.filter or args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        return
+
+    baseline_path = BASELINE_DIR / f"{args.baseline}.json"
+    baseline: Optional[Dict[str, Any]] = None
+    if baseline_path.exists() and not args.save_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+
+    print(f"📊 主要処理のマイクロベンチマーク（{len(names)}件、{args.repeat}回計測の中央値）")
+    results: Dict[str, Any] = {}
+    for name in names:
+        try:
+            results[name] = measure(CASES[name](), args.repeat, args.min_time)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+
+    regressions = compare(results, baseline["cases"], args.tolerance) if baseline else []
+
+    width = max(len(name) for name in names) if names else 0
+    for name, result in results.items():
+        if "error" in result:
+            print(f"   {name:<{width}}  ⚠️  {result['error']}")
+            continue
+        line = f"   {name:<{width}}  {_format_us(result['median_us']):>10}（最小 {_format_us(result['min_us'])}）"
+        if "change" in result:
+            line += (f"  ベースライン {_format_us(result['baseline_median_us'])} "
+                     f"{result['change']:+.1%} {STATUS_MARKS[result['status']]}")
+        print(line)
+
+    report = {
+        "measured_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "baseline": args.baseline if baseline else None,
+        "tolerance": args.tolerance,
+        "cases": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    with open(args.output.with_name(args.output.stem + "_history.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps(report, ensure_ascii=False) + "\n")
+    print(f"\n📂 結果: {args.output}")
+
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+        # 絞り込んで実行した場合は、既存のベースラインの他のケースを残す
+        saved = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {"cases": {}}
+        saved.update({key: value for key, value in report.items() if key not in ("cases", "baseline")})
+        saved["cases"].update({name: result for name, result in results.items() if "error" not in result})
+        baseline_path.write_text(json.dumps(saved, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+        print(f"💾 ベースラインを保存しました: {baseline_path}")
+    elif baseline is None:
+        print(f"ℹ️  ベースライン（{baseline_path}）がありません。--save-baseline で保存できます")
+
+    if regressions:
+        print(f"❌ {len(regressions)}件のケースがベースラインより {args.tolerance:.0%} 以上遅くなりました")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
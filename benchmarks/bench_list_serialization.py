@@ -0,0 +1,185 @@
+"""
+一覧レスポンスのシリアライズ ベンチマーク
+
+利用者・計画・モニタリングの一覧について、次の2つの方法でレスポンス本文を作成し、
+出力が同じであることを確認したうえで所要時間を比較します。
+
+- 従来: ORMオブジェクトを取得し、response_model（Pydantic）で検証・変換して標準のjsonで出力
+- 高速: ListProjection で列指定で取得し、行から辞書を作成して orjson で出力
+
+データはメモリ上のSQLiteに作成するため、既存のデータベースには影響しません。
+
+使い方:
+    python benchmarks/bench_list_serialization.py
+    python benchmarks/bench_list_serialization.py --rows 500 --repeat 30
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, List
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.responses import JSONResponse
+
+from app.database.connection import Base
+import app.models  # noqa: F401  （全テーブルを登録）
+import app.models.plan_evaluation  # noqa: F401  （Plan のリレーション先）
+from app.models.monitoring import Monitoring
+from app.models.plan import Plan
+from app.models.staff import Staff
+from app.models.user import User
+from app.schemas.monitoring import MonitoringResponse
+from app.schemas.plan import PlanResponse
+from app.schemas.user import UserListResponse
+from app.utils import fast_json
+from app.utils.fast_json import ListProjection
+
+FAMILY_NAMES = ["山田", "佐藤", "鈴木", "高橋", "田中", "伊藤", "渡辺", "中村"]
+GIVEN_NAMES = ["太郎", "花子", "一郎", "美咲", "健太", "由美", "翔", "さくら"]
+
+
+def seed(db, rows: int) -> None:
+    """ベンチマーク用のデータを作成"""
+    rng = random.Random(0)
+    staff = Staff(username="bench", password_hash="x", name="ベンチ職員", role="staff")
+    db.add(staff)
+    db.flush()
+
+    now = datetime(2026, 4, 1, 9, 30, 15, 123456)
+    for i in range(rows):
+        user = User(
+            name=f"{rng.choice(FAMILY_NAMES)} {rng.choice(GIVEN_NAMES)}",
+            name_kana="ヤマダ タロウ",
+            birth_date=date(1960, 1, 1) + timedelta(days=rng.randint(0, 20000)),
+            gender=rng.choice(["男性", "女性", None]),
+            phone="093-000-0000" if i % 3 else None,
+            assigned_staff_id=staff.id,
+            disability_support_level=rng.choice([None, 1, 2, 3, 4, 5, 6]),
+        )
+        db.add(user)
+        db.flush()
+
+        start = date(2026, 1, 1) + timedelta(days=rng.randint(0, 300))
+        plan = Plan(
+            user_id=user.id,
+            staff_id=staff.id,
+            plan_type=rng.choice(["初回", "更新"]),
+            plan_number=f"B-{i:06d}",
+            created_date=start - timedelta(days=7),
+            start_date=start,
+            end_date=start + timedelta(days=365),
+            current_situation="日中は生活介護事業所に通所し、週末は家族と過ごしている。" * 3,
+            hopes_and_needs="一人暮らしに向けて家事の練習をしたい。",
+            support_policy="本人の意向を尊重し、段階的に自立した生活を目指す。",
+            long_term_goal="グループホームで安定した生活を送る",
+            long_term_goal_period="1年",
+            short_term_goal="週2回の調理実習に参加する",
+            short_term_goal_period="6ヶ月",
+            services=[{"service_type": "生活介護", "provider": "北九州ケアセンター", "frequency": "週5回"}],
+            approval_status=rng.choice(["作成中", "承認済み", "実施中"]),
+            approval_date=start if i % 2 else None,
+            created_at=now,
+            updated_at=now,
+        )
+        db.add(plan)
+        db.flush()
+
+        db.add(Monitoring(
+            plan_id=plan.id,
+            user_id=user.id,
+            staff_id=staff.id,
+            monitoring_date=start + timedelta(days=90),
+            monitoring_type=rng.choice(["定期", "随時"]),
+            service_usage_status="予定どおり通所している。",
+            goal_achievement="調理実習に毎回参加できている。",
+            satisfaction=rng.choice(["満足", "普通", None]),
+            plan_revision_needed=bool(i % 5 == 0),
+            next_monitoring_date=start + timedelta(days=180) if i % 4 else None,
+            created_at=now,
+            updated_at=now,
+        ))
+    db.commit()
+
+
+def render_with_schema(objects: List[Any], adapter: TypeAdapter) -> bytes:
+    """従来の方法（response_model による検証・変換と標準のjson）でレスポンス本文を作成"""
+    validated = adapter.validate_python(objects, from_attributes=True)
+    return JSONResponse(adapter.dump_python(validated, mode="json")).body
+
+
+def measure(func: Callable[[], bytes], repeat: int) -> float:
+    """中央値の所要時間（ミリ秒）を計測"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    """ベンチマークを実行"""
+    parser = argparse.ArgumentParser(description="一覧レスポンスのシリアライズを比較します")
+    parser.add_argument("--rows", type=int, default=500, help="一覧の件数（既定: 500）")
+    parser.add_argument("--repeat", type=int, default=20, help="計測の繰り返し回数（既定: 20）")
+    args = parser.parse_args()
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    seed(db, args.rows)
+
+    targets = [
+        ("利用者一覧", User, UserListResponse, User.id),
+        ("計画一覧", Plan, PlanResponse, Plan.id),
+        ("モニタリング一覧", Monitoring, MonitoringResponse, Monitoring.id),
+    ]
+
+    encoder = "orjson" if fast_json.orjson is not None else "json（orjson未インストール）"
+    print(f"📊 一覧レスポンスのシリアライズ（{args.rows}件、{args.repeat}回の中央値、高速側: {encoder}）")
+
+    failed = False
+    for label, model, schema, order in targets:
+        adapter = TypeAdapter(List[schema])
+        projection = ListProjection(model, schema)
+
+        def baseline() -> bytes:
+            db.expunge_all()
+            return render_with_schema(db.query(model).order_by(order).all(), adapter)
+
+        def fast() -> bytes:
+            return projection.response(db.query(model).order_by(order)).body
+
+        identical = baseline() == fast()
+        failed = failed or not identical
+
+        baseline_ms = measure(baseline, args.repeat)
+        fast_ms = measure(fast, args.repeat)
+        print(
+            f"   {label}: 従来 {baseline_ms:.1f}ms / 高速 {fast_ms:.1f}ms "
+            f"（{baseline_ms / fast_ms:.1f}倍） 出力一致: {'✅' if identical else '❌'}"
+        )
+
+    db.close()
+
+    if failed:
+        print("❌ 出力がレスポンススキーマと一致しない一覧があります")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+起動時間・インポート時間 ベンチマーク
+
+次の項目を計測し、JSON形式のレポートを出力します。目安（startup_budget.json）を
+超えた項目がある場合は終了コード1で終了するため、起動が遅くなる変更を検出できます。
+
+- モジュールごとのインポート時間（毎回新しいPythonプロセスで計測した中央値）
+  app.main、PDF出力・AI計画作成支援のサービス
+- app.main のインポートに含まれる各APIルーターのインポート時間と、自身の処理時間が
+  長いモジュール（python -X importtime）
+  ※ app.api パッケージは全ルーターを読み込むため、ルーターは個別のプロセスではなく
+    app.main のインポート内での時間（子を含む）で比較します
+- uvicorn（--workers 指定）の起動から /health が最初に応答するまでの時間と、
+  全ワーカーの起動完了（Application startup complete）までの時間
+- ワーカーごとのメモリ使用量（RSS）
+
+使い方:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --workers 2 --repeat 5 --output startup.json
+    python benchmarks/bench_startup.py --skip-server   # インポート時間のみ計測
+"""
+import argparse
+import fnmatch
+import json
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+DEFAULT_BUDGET = Path(__file__).parent / "startup_budget.json"
+DEFAULT_OUTPUT = Path(__file__).parent / "results" / "startup.json"
+
+# 新しいプロセスでインポート時間を計測するモジュール
+BASE_MODULES = [
+    "app.main",
+    "app.services.pdf_service",
+    "app.services.ai_assistant_service",
+]
+
+# 新しいプロセスで1つのモジュールをインポートし、所要時間（秒）を出力するコード
+IMPORT_SNIPPET = (
+    "import importlib, sys, time\n"
+    "started = time.perf_counter()\n"
+    "importlib.import_module(sys.argv[1])\n"
+    "print(time.perf_counter() - started)\n"
+)
+
+# uvicorn のワーカー起動完了のログ
+STARTUP_COMPLETE = "Application startup complete"
+
+
+def measure_import(module: str, repeat: int) -> Dict[str, Any]:
+    """
+    モジュールのインポート時間を計測
+
+    Args:
+        module: モジュール名
+        repeat: 計測回数（毎回新しいプロセスで計測）
+
+    Returns:
+        中央値・最小・最大（秒）
+    """
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET, module],
+            cwd=project_root, capture_output=True, text=True, check=True,
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return {
+        "median": round(statistics.median(timings), 4),
+        "min": round(min(timings), 4),
+        "max": round(max(timings), 4),
+    }
+
+
+def import_profile(module: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    python -X importtime でインポートされる各モジュールの処理時間を計測
+
+    Args:
+        module: インポートするモジュール名
+        repeat: 計測回数（毎回新しいプロセスで計測）
+
+    Returns:
+        モジュール名ごとの自身の処理時間・子を含む処理時間（秒、中央値）
+    """
+    samples: Dict[str, Dict[str, List[float]]] = {}
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=project_root, capture_output=True, text=True, check=True,
+        )
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            sample = samples.setdefault(name.strip(), {"self": [], "cumulative": []})
+            sample["self"].append(int(self_us) / 1_000_000)
+            sample["cumulative"].append(int(cumulative_us) / 1_000_000)
+    return {
+        name: {key: round(statistics.median(values), 4) for key, values in sample.items()}
+        for name, sample in samples.items()
+    }
+
+
+def _free_port() -> int:
+    """空いているポート番号を取得"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _children(pid: int) -> List[int]:
+    """子プロセスのIDを取得"""
+    if psutil is not None:
+        return [child.pid for child in psutil.Process(pid).children()]
+    children = []
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # "pid (comm) state ppid ..." の comm に空白や括弧が含まれる場合があるため、最後の ")" 以降を使う
+        if int(stat.rsplit(")", 1)[1].split()[1]) == pid:
+            children.append(int(entry.name))
+    return children
+
+
+def _cmdline(pid: int) -> str:
+    """プロセスのコマンドラインを取得"""
+    if psutil is not None:
+        return " ".join(psutil.Process(pid).cmdline())
+    return Path(f"/proc/{pid}/cmdline").read_bytes().replace(b"\0", b" ").decode(errors="replace")
+
+
+def _rss_mb(pid: int) -> float:
+    """プロセスのメモリ使用量（RSS、MB）を取得"""
+    if psutil is not None:
+        return round(psutil.Process(pid).memory_info().rss / 1024 / 1024, 1)
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return round(int(line.split()[1]) / 1024, 1)
+    raise OSError(f"VmRSS を取得できません（pid={pid}）")
+
+
+def measure_server(workers: int, timeout: float, warmup_requests: int) -> Dict[str, Any]:
+    """
+    uvicorn を起動して応答までの時間とワーカーのメモリ使用量を計測
+
+    Args:
+        workers: ワーカー数
+        timeout: 起動を待つ最大時間（秒）
+        warmup_requests: メモリ使用量の計測前に /health へ送るリクエスト数
+
+    Returns:
+        計測結果
+    """
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+        ],
+        cwd=project_root, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+
+    # ログを読み続け、ワーカーの起動完了の時刻を記録
+    ready_times: List[float] = []
+    log_tail: List[str] = []
+
+    def read_log():
+        for line in process.stderr:
+            log_tail.append(line.rstrip())
+            del log_tail[:-20]
+            if STARTUP_COMPLETE in line:
+                ready_times.append(time.perf_counter() - started)
+
+    reader = threading.Thread(target=read_log, daemon=True)
+    reader.start()
+
+    try:
+        first_response = None
+        deadline = started + timeout
+        while time.perf_counter() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError("uvicorn が終了しました:\n" + "\n".join(log_tail))
+            try:
+                # ポートの待ち受け開始後はワーカーが応答するまで接続が待たされるため、期限まで待つ
+                with urllib.request.urlopen(url, timeout=max(deadline - time.perf_counter(), 0.1)) as response:
+                    if response.status == 200:
+                        first_response = time.perf_counter() - started
+                        break
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                pass
+            time.sleep(0.02)
+        if first_response is None:
+            raise RuntimeError(f"{timeout}秒以内に /health が応答しませんでした:\n" + "\n".join(log_tail))
+
+        # 全ワーカーの起動完了を待つ（ワーカー1つの場合はメインプロセスが起動完了を出力する）
+        while len(ready_times) < workers and time.perf_counter() < deadline:
+            time.sleep(0.02)
+        all_ready = ready_times[workers - 1] if len(ready_times) >= workers else None
+
+        for _ in range(warmup_requests):
+            with urllib.request.urlopen(url, timeout=5) as response:
+                response.read()
+
+        worker_pids = [pid for pid in _children(process.pid) if "spawn_main" in _cmdline(pid)]
+        return {
+            "workers": workers,
+            "first_response_seconds": round(first_response, 4),
+            "all_workers_ready_seconds": round(all_ready, 4) if all_ready is not None else None,
+            "master_rss_mb": _rss_mb(process.pid),
+            "worker_rss_mb": [_rss_mb(pid) for pid in worker_pids] or [_rss_mb(process.pid)],
+        }
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def check_budget(report: Dict[str, Any], budget: Dict[str, Any]) -> List[str]:
+    """
+    計測結果を目安と比較
+
+    Args:
+        report: 計測結果
+        budget: 目安（import_seconds・router_import_seconds はモジュール名のパターンごとの秒数。
+                最初に一致したパターンの目安を使う）
+
+    Returns:
+        目安を超えた項目の説明の一覧
+    """
+    violations = []
+    for section, budget_key in (("imports", "import_seconds"), ("routers", "router_import_seconds")):
+        for module, seconds in report.get(section, {}).items():
+            for pattern, limit in budget.get(budget_key, {}).items():
+                if fnmatch.fnmatchcase(module, pattern):
+                    if seconds > limit:
+                        violations.append(f"{module} のインポート: {seconds:.3f}秒 > {limit}秒")
+                    break
+
+    server = report.get("server")
+    if server:
+        for key, label in (
+            ("first_response_seconds", "/health の最初の応答"),
+            ("all_workers_ready_seconds", "全ワーカーの起動完了"),
+        ):
+            limit = budget.get(key)
+            if limit is None:
+                continue
+            if server[key] is None:
+                violations.append(f"{label}: 計測できませんでした")
+            elif server[key] > limit:
+                violations.append(f"{label}: {server[key]:.3f}秒 > {limit}秒")
+
+        limit = budget.get("worker_rss_mb")
+        if limit is not None:
+            for index, rss in enumerate(server["worker_rss_mb"], 1):
+                if rss > limit:
+                    violations.append(f"ワーカー{index}のメモリ使用量: {rss}MB > {limit}MB")
+    return violations
+
+
+def main():
+    """ベンチマークを実行"""
+    parser = argparse.ArgumentParser(description="起動時間・インポート時間を計測します")
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn のワーカー数（既定: 2）")
+    parser.add_argument("--repeat", type=int, default=3, help="インポート時間の計測回数（既定: 3）")
+    parser.add_argument("--top", type=int, default=15, help="処理時間が長いインポートの表示件数（既定: 15）")
+    parser.add_argument("--timeout", type=float, default=60.0, help="サーバーの起動を待つ最大秒数（既定: 60）")
+    parser.add_argument("--budget", type=Path, default=DEFAULT_BUDGET, help="目安のJSONファイル")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="レポートの出力先")
+    parser.add_argument("--skip-server", action="store_true", help="サーバーの起動を計測しない")
+    args = parser.parse_args()
+
+    budget = json.loads(args.budget.read_text(encoding="utf-8")) if args.budget.exists() else {}
+
+    report: Dict[str, Any] = {
+        "measured_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "imports": {},
+    }
+
+    print(f"📊 インポート時間（新しいプロセスで{args.repeat}回計測した中央値）")
+    for module in BASE_MODULES:
+        timing = measure_import(module, args.repeat)
+        report["imports"][module] = timing["median"]
+        print(f"   {module}: {timing['median'] * 1000:.0f}ms（最小 {timing['min'] * 1000:.0f}ms / 最大 {timing['max'] * 1000:.0f}ms）")
+
+    profile = import_profile("app.main", args.repeat)
+    report["routers"] = {
+        name: timing["cumulative"] for name, timing in sorted(profile.items())
+        if name.startswith("app.api.") and name.count(".") == 2
+    }
+    print("\n🧭 APIルーターのインポート時間（app.main のインポート内、子を含む）")
+    for name, seconds in sorted(report["routers"].items(), key=lambda item: item[1], reverse=True):
+        print(f"   {name}: {seconds * 1000:.1f}ms")
+
+    slowest = sorted(profile.items(), key=lambda item: item[1]["self"], reverse=True)[:args.top]
+    report["slowest_imports"] = [{"module": name, **timing} for name, timing in slowest]
+    print(f"\n🐢 app.main のインポートで処理時間が長いモジュール（上位{args.top}件、自身の処理時間）")
+    for name, timing in slowest:
+        print(f"   {name}: {timing['self'] * 1000:.1f}ms（子を含む: {timing['cumulative'] * 1000:.1f}ms）")
+
+    server: Optional[Dict[str, Any]] = None
+    if not args.skip_server:
+        print(f"\n🚀 uvicorn（--workers {args.workers}）の起動")
+        server = measure_server(args.workers, args.timeout, warmup_requests=10)
+        report["server"] = server
+        all_ready = server["all_workers_ready_seconds"]
+        print(f"   /health の最初の応答: {server['first_response_seconds'] * 1000:.0f}ms")
+        print(f"   全ワーカーの起動完了: {'計測不可' if all_ready is None else f'{all_ready * 1000:.0f}ms'}")
+        print(f"   メモリ使用量（RSS）: メイン {server['master_rss_mb']}MB / ワーカー "
+              + ", ".join(f"{rss}MB" for rss in server["worker_rss_mb"]))
+
+    violations = check_budget(report, budget)
+    report["budget"] = budget
+    report["violations"] = violations
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n📂 レポート: {args.output}")
+
+    if violations:
+        print("❌ 目安を超えた項目があります")
+        for violation in violations:
+            print(f"   - {violation}")
+        sys.exit(1)
+    print("✅ すべての項目が目安の範囲内です")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+"""
+API負荷試験
+
+起動中のサーバーに対して、スタッフの操作を模したセッションを複数同時に実行し、
+エンドポイントごとの応答時間（p50/p95/p99）とスループットを計測します。
+
+1セッションの流れ:
+    ログイン → ダッシュボード（統計・アラート） → 次の操作を --actions 回
+    - 利用者一覧（ランダムなページ）
+    - 利用者検索（カナ・ひらがなの姓）
+    - 利用者詳細（一覧・検索で表示された利用者のケースサマリー）
+    - 計画書PDF（詳細で表示された計画）
+
+本番規模のデータは scripts/generate_load_data.py で作成できます。
+
+使い方:
+    python scripts/generate_load_data.py --users 50000
+    uvicorn app.main:app --workers 2
+    python benchmarks/load_test.py --concurrency 10 --duration 60
+    python benchmarks/load_test.py --base-url http://127.0.0.1:8000 --output load.json
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+# 操作の種類と選ばれる割合
+ACTION_WEIGHTS = {
+    "list": 30,
+    "search": 20,
+    "detail": 40,
+    "pdf": 10,
+}
+
+# 検索に使う姓（generate_load_data.py の利用者の姓）
+SEARCH_TERMS = ["ヤマダ", "サトウ", "スズキ", "たかはし", "たなか", "イトウ", "わたなべ", "ナカムラ"]
+
+# 一覧の1ページの件数
+PAGE_SIZE = 50
+
+# スタッフ一覧の取得件数（APIの上限）
+STAFF_PAGE_SIZE = 500
+
+
+def percentile(sorted_values: List[float], rate: float) -> float:
+    """
+    百分位数を計算（線形補間）
+
+    Args:
+        sorted_values: 昇順に並べた値
+        rate: 百分位（0〜100）
+
+    Returns:
+        百分位数
+    """
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * rate / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class Recorder:
+    """エンドポイントごとの応答時間とエラーを記録（スレッドセーフ）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.error_samples: List[str] = []
+
+    def add(self, endpoint: str, seconds: float, error: Optional[str] = None) -> None:
+        """
+        1件の結果を記録
+
+        Args:
+            endpoint: エンドポイント（例: GET /api/users/{id}/summary）
+            seconds: 応答時間（秒）
+            error: エラーの内容（成功時はNone）
+        """
+        with self._lock:
+            self.timings[endpoint].append(seconds)
+            if error is not None:
+                self.errors[endpoint] += 1
+                if len(self.error_samples) < 10:
+                    self.error_samples.append(f"{endpoint}: {error}")
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        """
+        集計結果を作成
+
+        Args:
+            elapsed: 計測時間（秒）
+
+        Returns:
+            エンドポイントごと・全体の件数、エラー数、スループット、応答時間（ミリ秒）
+        """
+        endpoints = {}
+        all_timings = []
+        for endpoint, timings in sorted(self.timings.items()):
+            ordered = sorted(timings)
+            all_timings.extend(ordered)
+            endpoints[endpoint] = self._stats(ordered, self.errors.get(endpoint, 0), elapsed)
+        return {
+            "endpoints": endpoints,
+            "total": self._stats(sorted(all_timings), sum(self.errors.values()), elapsed),
+            "error_samples": self.error_samples,
+        }
+
+    @staticmethod
+    def _stats(ordered: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+        """件数・スループット・応答時間の統計を作成"""
+        count = len(ordered)
+        return {
+            "requests": count,
+            "errors": errors,
+            "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(sum(ordered) / count * 1000, 1) if count else 0.0,
+            "p50_ms": round(percentile(ordered, 50) * 1000, 1),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 1),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 1),
+            "max_ms": round(ordered[-1] * 1000, 1) if count else 0.0,
+        }
+
+
+class StaffSession:
+    """スタッフ1人分の操作を実行"""
+
+    def __init__(self, args: argparse.Namespace, recorder: Recorder, rng: random.Random, total_users: int):
+        """
+        初期化
+
+        Args:
+            args: コマンドライン引数
+            recorder: 結果の記録先
+            rng: 乱数（セッションごとに異なるシード）
+            total_users: 利用者総数（一覧のページの選択に使用）
+        """
+        self.args = args
+        self.recorder = recorder
+        self.rng = rng
+        self.total_users = total_users
+        self.user_ids: List[int] = []
+        self.plan_ids: List[int] = []
+
+    def request(self, client: httpx.Client, method: str, endpoint: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        """リクエストを送信して応答時間を記録（エラー時はNone）"""
+        started = time.perf_counter()
+        try:
+            response = client.request(method, url, **kwargs)
+            response.read()
+        except httpx.HTTPError as e:
+            self.recorder.add(endpoint, time.perf_counter() - started, f"{type(e).__name__}: {e}")
+            return None
+        elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            self.recorder.add(endpoint, elapsed, f"HTTP {response.status_code}")
+            return None
+        self.recorder.add(endpoint, elapsed)
+        return response
+
+    def run(self, deadline: float) -> None:
+        """期限までセッションを繰り返す"""
+        while time.perf_counter() < deadline:
+            with httpx.Client(base_url=self.args.base_url, timeout=self.args.timeout) as client:
+                if not self.login(client):
+                    time.sleep(1)
+                    continue
+                self.request(client, "GET", "GET /api/dashboard/stats", "/api/dashboard/stats")
+                self.request(client, "GET", "GET /api/dashboard/alerts", "/api/dashboard/alerts")
+                for _ in range(self.args.actions):
+                    if time.perf_counter() >= deadline:
+                        return
+                    self.think()
+                    action = self.rng.choices(list(ACTION_WEIGHTS), weights=list(ACTION_WEIGHTS.values()))[0]
+                    getattr(self, f"action_{action}")(client)
+
+    def think(self) -> None:
+        """操作の間隔を空ける"""
+        if self.args.think_time > 0:
+            time.sleep(self.rng.uniform(0, self.args.think_time * 2))
+
+    def login(self, client: httpx.Client) -> bool:
+        """負荷試験用スタッフのいずれかでログイン"""
+        username = f"{self.args.username_prefix}{self.rng.randint(1, self.args.staff_count):02d}"
+        response = self.request(
+            client, "POST", "POST /api/auth/login", "/api/auth/login",
+            json={"username": username, "password": self.args.password},
+        )
+        return response is not None
+
+    def _remember_users(self, response: Optional[httpx.Response]) -> None:
+        """一覧・検索で表示された利用者IDを記録"""
+        if response is not None:
+            self.user_ids = [user["id"] for user in response.json()] or self.user_ids
+
+    def action_list(self, client: httpx.Client) -> None:
+        """利用者一覧のランダムなページを表示"""
+        skip = self.rng.randrange(0, max(self.total_users - PAGE_SIZE, 0) + 1, PAGE_SIZE)
+        self._remember_users(self.request(
+            client, "GET", "GET /api/users", "/api/users", params={"skip": skip, "limit": PAGE_SIZE}
+        ))
+
+    def action_search(self, client: httpx.Client) -> None:
+        """利用者を姓で検索"""
+        self._remember_users(self.request(
+            client, "GET", "GET /api/users?search", "/api/users",
+            params={"search": self.rng.choice(SEARCH_TERMS), "limit": PAGE_SIZE},
+        ))
+
+    def action_detail(self, client: httpx.Client) -> None:
+        """利用者詳細（ケースサマリー）を表示"""
+        if not self.user_ids:
+            self.action_list(client)
+            return
+        user_id = self.rng.choice(self.user_ids)
+        response = self.request(
+            client, "GET", "GET /api/users/{id}/summary", f"/api/users/{user_id}/summary"
+        )
+        if response is not None:
+            self.plan_ids = [plan["id"] for plan in response.json()["plans"]] or self.plan_ids
+
+    def action_pdf(self, client: httpx.Client) -> None:
+        """計画書PDFを出力"""
+        if not self.plan_ids:
+            self.action_detail(client)
+            return
+        plan_id = self.rng.choice(self.plan_ids)
+        self.request(client, "GET", "GET /api/pdf/plans/{id}", f"/api/pdf/plans/{plan_id}")
+
+
+def fetch_environment(args: argparse.Namespace) -> Tuple[int, int]:
+    """
+    ダッシュボードの統計から利用者総数、スタッフ一覧からログインできるスタッフ数を取得
+
+    generate_load_data.py は利用者数に応じた人数（load01〜）のスタッフを作成するため、
+    実際に作成されている連番のスタッフ数を数えます。
+
+    Returns:
+        (利用者総数, スタッフ数)
+    """
+    with httpx.Client(base_url=args.base_url, timeout=args.timeout) as client:
+        response = client.post(
+            "/api/auth/login",
+            json={"username": f"{args.username_prefix}01", "password": args.password},
+        )
+        response.raise_for_status()
+        response = client.get("/api/dashboard/stats")
+        response.raise_for_status()
+        total_users = int(response.json().get("total_users", 0))
+
+        usernames = set()
+        skip = 0
+        while True:
+            response = client.get(
+                "/api/staffs",
+                params={"search": args.username_prefix, "skip": skip, "limit": STAFF_PAGE_SIZE},
+            )
+            response.raise_for_status()
+            staffs = response.json()
+            usernames.update(staff["username"] for staff in staffs if staff["is_active"])
+            if len(staffs) < STAFF_PAGE_SIZE:
+                break
+            skip += STAFF_PAGE_SIZE
+        staff_count = 0
+        while f"{args.username_prefix}{staff_count + 1:02d}" in usernames:
+            staff_count += 1
+        return total_users, max(staff_count, 1)
+
+
+def main():
+    """負荷試験を実行"""
+    parser = argparse.ArgumentParser(description="スタッフの操作を模した負荷試験を実行します")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="サーバーのURL")
+    parser.add_argument("--concurrency", type=int, default=10, help="同時に操作するスタッフ数（既定: 10）")
+    parser.add_argument("--duration", type=float, default=60.0, help="計測時間（秒、既定: 60）")
+    parser.add_argument("--actions", type=int, default=8, help="1セッションあたりの操作数（既定: 8）")
+    parser.add_argument("--think-time", type=float, default=0.0, help="操作の間隔の平均（秒、既定: 0）")
+    parser.add_argument("--timeout", type=float, default=30.0, help="リクエストのタイムアウト（秒）")
+    parser.add_argument("--username-prefix", default="load", help="スタッフのユーザー名の接頭辞（既定: load）")
+    parser.add_argument(
+        "--staff-count", type=int,
+        help="ログインに使うスタッフ数（load01〜、既定: サーバーに登録済みの人数）",
+    )
+    parser.add_argument("--password", default="load123", help="スタッフのパスワード")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    parser.add_argument("--output", type=Path, help="JSONレポートの出力先")
+    args = parser.parse_args()
+
+    try:
+        total_users, staff_count = fetch_environment(args)
+    except httpx.HTTPError as e:
+        print(f"❌ サーバーに接続できないか、ログインできません: {e}")
+        print("   scripts/generate_load_data.py で負荷試験用データを作成し、サーバーを起動してください")
+        sys.exit(1)
+
+    if args.staff_count is None:
+        args.staff_count = staff_count
+    elif args.staff_count > staff_count:
+        print(f"⚠️  --staff-count {args.staff_count} に対し、登録済みのスタッフは {staff_count}人のため {staff_count}人でログインします")
+        args.staff_count = staff_count
+
+    print(f"🚀 負荷試験を開始します（{args.base_url}、{args.concurrency}並列、{args.duration:.0f}秒、利用者 {total_users:,}人、スタッフ {args.staff_count}人）")
+    recorder = Recorder()
+    started = time.perf_counter()
+    deadline = started + args.duration
+    threads = [
+        threading.Thread(
+            target=StaffSession(args, recorder, random.Random(args.seed + index), total_users).run,
+            args=(deadline,),
+            daemon=True,
+        )
+        for index in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    summary = recorder.summary(elapsed)
+    print(f"\n📊 結果（{elapsed:.1f}秒）")
+    print(f"   {'requests':>8} {'errors':>6} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8}  エンドポイント")
+    for endpoint, stats in list(summary["endpoints"].items()) + [("全体", summary["total"])]:
+        print(
+            f"   {stats['requests']:>8} {stats['errors']:>6} {stats['throughput_rps']:>7.1f}"
+            f" {stats['p50_ms']:>6.0f}ms {stats['p95_ms']:>6.0f}ms {stats['p99_ms']:>6.0f}ms  {endpoint}"
+        )
+    if summary["error_samples"]:
+        print("\n⚠️  エラーの例:")
+        for sample in summary["error_samples"]:
+            print(f"   - {sample}")
+
+    if args.output:
+        report = {
+            "measured_at": datetime.now().isoformat(timespec="seconds"),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration_seconds": round(elapsed, 2),
+            "total_users": total_users,
+            **summary,
+        }
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n📂 レポート: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+類似ケースインデックス構築スクリプト
+
+計画・利用者・計画評価から類似ケース検索用のインデックスを作成します。
+通常はAI計画提案時に差分で自動同期されますが、初回やデータ移行後に
+まとめて作成しておくと、最初の提案が速くなります。
+
+使い方:
+    python scripts/build_similar_case_index.py            # 差分同期
+    python scripts/build_similar_case_index.py --rebuild  # 全件再構築
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.database.connection import SessionLocal
+from app.services.similar_case_index import similar_case_index
+
+
+def main():
+    """インデックスを同期して保存"""
+    parser = argparse.ArgumentParser(description="類似ケースインデックス構築")
+    parser.add_argument("--rebuild", action="store_true", help="既存のインデックスを破棄して全件再構築")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        similar_case_index.clear()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        result = similar_case_index.refresh(db)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+
+    print(f"✅ 類似ケースインデックスを更新しました（{similar_case_index.embedder.name}）")
+    print(f"   更新: {result['updated']}件 / 削除: {result['removed']}件 / 登録数: {len(similar_case_index)}件")
+    print(f"   所要時間: {elapsed:.2f}秒 / 保存先: {similar_case_index.path}")
+
+
+if __name__ == "__main__":
+    main()
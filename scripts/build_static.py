@@ -0,0 +1,265 @@
+"""
+静的ファイルビルドスクリプト
+
+app/static の JavaScript / CSS を縮小し、内容のハッシュを付けたファイル名で
+app/static/dist に出力します。あわせて gzip（brotliモジュールがあれば brotli も）で
+事前圧縮したファイルと、元のパスからハッシュ付きのパスを引くマニフェストを作成します。
+
+テンプレートは static_url() でマニフェストを参照するため、ビルド後はサーバーを
+再起動してください。
+
+使い方:
+    python scripts/build_static.py
+    python scripts/build_static.py --no-minify   # 縮小せずにハッシュ付け・圧縮のみ行う
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import shutil
+import sys
+from pathlib import Path
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils.static_assets import STATIC_DIR, DIST_DIRNAME, MANIFEST_FILENAME
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# ビルド対象の拡張子
+TARGET_SUFFIXES = (".js", ".css")
+
+# この長さ未満のファイルは圧縮しない
+MIN_COMPRESS_BYTES = 256
+
+# 直前がこれらの文字・キーワードの場合、"/" は正規表現リテラルの開始とみなす
+REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+REGEX_KEYWORDS = ("return", "typeof", "case", "do", "else", "in", "of", "void", "yield", "await")
+
+
+def minify_js(source: str) -> str:
+    """
+    JavaScriptを縮小
+
+    コメントと行頭・行末の空白、空行を取り除き、連続する空白を1文字にまとめます。
+    改行は残すため、自動セミコロン挿入に依存したコードの動作は変わりません。
+    文字列・テンプレートリテラル・正規表現リテラルの中身はそのまま残します。
+
+    Args:
+        source: JavaScriptのソース
+
+    Returns:
+        縮小したソース
+    """
+    out = []
+    i, length = 0, len(source)
+    last_significant = ""
+    # テンプレートリテラルの ${...} の入れ子（各要素は式の中の波括弧の深さ）
+    template_stack = []
+
+    def emit_space(newline: bool):
+        if not out:
+            return
+        if newline:
+            if out[-1] == " ":
+                out.pop()
+            if out and out[-1] != "\n":
+                out.append("\n")
+        elif out[-1] not in (" ", "\n"):
+            out.append(" ")
+
+    while i < length:
+        ch = source[i]
+        nxt = source[i + 1] if i + 1 < length else ""
+
+        if ch == "`" or (ch == "}" and template_stack and template_stack[-1] == 0):
+            # テンプレートリテラルの文字列部分（次の ${ または閉じる ` まで）をそのまま出力
+            if ch == "}":
+                template_stack.pop()
+            end = i + 1
+            while end < length:
+                if source[end] == "\\":
+                    end += 2
+                    continue
+                if source[end] == "`":
+                    break
+                if source[end] == "$" and source[end + 1:end + 2] == "{":
+                    template_stack.append(0)
+                    end += 1
+                    break
+                end += 1
+            out.append(source[i:end + 1])
+            last_significant = source[end:end + 1] or ch
+            i = end + 1
+            continue
+
+        if ch in ("'", '"'):
+            end = i + 1
+            while end < length and source[end] != ch and source[end] != "\n":
+                end += 2 if source[end] == "\\" else 1
+            out.append(source[i:end + 1])
+            last_significant = ch
+            i = end + 1
+            continue
+
+        if ch == "/" and nxt == "/":
+            while i < length and source[i] != "\n":
+                i += 1
+            continue
+
+        if ch == "/" and nxt == "*":
+            end = source.find("*/", i + 2)
+            end = length if end < 0 else end + 2
+            emit_space("\n" in source[i:end])
+            i = end
+            continue
+
+        if ch == "/" and _starts_regex(out, last_significant):
+            end, in_class = i + 1, False
+            while end < length and source[end] != "\n":
+                if source[end] == "\\":
+                    end += 2
+                    continue
+                if source[end] == "[":
+                    in_class = True
+                elif source[end] == "]":
+                    in_class = False
+                elif source[end] == "/" and not in_class:
+                    break
+                end += 1
+            out.append(source[i:end + 1])
+            last_significant = "/"
+            i = end + 1
+            continue
+
+        if ch.isspace():
+            end = i
+            while end < length and source[end].isspace():
+                end += 1
+            emit_space("\n" in source[i:end])
+            i = end
+            continue
+
+        if template_stack:
+            if ch == "{":
+                template_stack[-1] += 1
+            elif ch == "}":
+                template_stack[-1] -= 1
+
+        out.append(ch)
+        last_significant = ch
+        i += 1
+
+    return "".join(out).strip() + "\n"
+
+
+def _starts_regex(out, last_significant: str) -> bool:
+    """"/" が正規表現リテラルの開始かどうか"""
+    if not last_significant or last_significant in REGEX_PRECEDERS:
+        return True
+    tail = "".join(out[-8:]).rstrip()
+    for keyword in REGEX_KEYWORDS:
+        before = tail[:-len(keyword)][-1:]
+        if tail.endswith(keyword) and not (before.isalnum() or before in ("_", "$", ".")):
+            return True
+    return False
+
+
+def minify_css(source: str) -> str:
+    """
+    CSSを縮小
+
+    コメントを取り除き、空白をまとめて、区切り記号の前後の空白を除去します。
+
+    Args:
+        source: CSSのソース
+
+    Returns:
+        縮小したソース
+    """
+    code = re.sub(r"/\*.*?\*/", "", source, flags=re.S)
+    code = re.sub(r"\s+", " ", code)
+    code = re.sub(r"\s*([{};,>])\s*", r"\1", code)
+    code = code.replace(";}", "}")
+    return code.strip() + "\n"
+
+
+MINIFIERS = {".js": minify_js, ".css": minify_css}
+
+
+def build(minify: bool = True) -> dict:
+    """
+    静的ファイルをビルド
+
+    Args:
+        minify: 縮小するかどうか
+
+    Returns:
+        マニフェスト（元のパス → ハッシュ付きのパス）
+    """
+    dist_dir = STATIC_DIR / DIST_DIRNAME
+    if dist_dir.exists():
+        shutil.rmtree(dist_dir)
+
+    manifest = {}
+    for source_path in sorted(STATIC_DIR.rglob("*")):
+        if not source_path.is_file() or source_path.suffix not in TARGET_SUFFIXES:
+            continue
+        relative = source_path.relative_to(STATIC_DIR)
+        if relative.parts[0] == DIST_DIRNAME:
+            continue
+
+        text = source_path.read_text(encoding="utf-8")
+        if minify:
+            text = MINIFIERS[source_path.suffix](text)
+        data = text.encode("utf-8")
+
+        digest = hashlib.sha256(data).hexdigest()[:10]
+        hashed = relative.with_name(f"{relative.stem}.{digest}{relative.suffix}")
+        output_path = dist_dir / hashed
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(data)
+
+        sizes = {"raw": source_path.stat().st_size, "min": len(data)}
+        if len(data) >= MIN_COMPRESS_BYTES:
+            # mtime=0 で同じ内容からは同じ圧縮ファイルを作成する
+            gz = gzip.compress(data, compresslevel=9, mtime=0)
+            output_path.with_name(output_path.name + ".gz").write_bytes(gz)
+            sizes["gzip"] = len(gz)
+            if brotli is not None:
+                br = brotli.compress(data, quality=11)
+                output_path.with_name(output_path.name + ".br").write_bytes(br)
+                sizes["br"] = len(br)
+
+        manifest[relative.as_posix()] = hashed.as_posix()
+        print(f"   {relative.as_posix()} → {hashed.as_posix()} " + " / ".join(
+            f"{name}: {size:,}B" for name, size in sizes.items()
+        ))
+
+    with open(dist_dir / MANIFEST_FILENAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    return manifest
+
+
+def main():
+    """静的ファイルをビルド"""
+    parser = argparse.ArgumentParser(description="静的ファイルを縮小・ハッシュ付け・事前圧縮します")
+    parser.add_argument("--no-minify", action="store_true", help="縮小せずにハッシュ付け・圧縮のみ行う")
+    args = parser.parse_args()
+
+    print("📦 静的ファイルをビルドしています...")
+    manifest = build(minify=not args.no_minify)
+    print(f"✅ {len(manifest)}件のファイルを {STATIC_DIR / DIST_DIRNAME} に出力しました")
+    if brotli is None:
+        print("   ※ brotliモジュールがないため、gzipのみ作成しました（pip install brotli）")
+
+
+if __name__ == "__main__":
+    main()
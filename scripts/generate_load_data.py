@@ -0,0 +1,467 @@
+"""
+負荷試験用データ生成スクリプト
+
+本番規模の負荷試験（benchmarks/load_test.py）のために、大量の架空データを
+一括挿入（INSERT ... の複数行実行）で作成します。利用者数を指定すると、
+相談記録・計画・モニタリング記録・服薬情報・手帳・関係機関との関係を
+利用者数に比例した件数で作成します。すべてのデータは架空のものです。
+
+既存のデータは変更せず、各テーブルの最大IDの後ろに追加します。
+負荷試験用のスタッフ（load01, load02, ... / パスワード: load123）も作成します。
+
+使い方:
+    python scripts/generate_load_data.py --users 50000
+    python scripts/generate_load_data.py --users 1000 --seed 1 --batch-size 5000
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import bcrypt
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import func, insert
+
+from app.database.connection import SessionLocal
+import app.models.plan_evaluation  # noqa: F401  （Plan のリレーション先）
+from app.models import (
+    Consultation, Medication, Monitoring, Notebook, Organization, Plan, Staff, User, UserOrganization
+)
+from app.services.monitoring_schedule_service import MonitoringScheduleService
+
+# 負荷試験用スタッフのユーザー名の接頭辞とパスワード
+STAFF_USERNAME_PREFIX = "load"
+STAFF_PASSWORD = "load123"
+
+# 利用者1人あたりの平均件数
+CONSULTATIONS_PER_USER = 6
+PLANS_PER_USER = 2
+MONITORINGS_PER_PLAN = 3
+MEDICATIONS_PER_USER = 1.5
+ORGANIZATIONS_PER_USER = 2
+NOTEBOOK_RATE = 0.6
+
+# 利用者の人数に対するスタッフ・関係機関の数（1人あたりの担当数・利用者数）
+USERS_PER_STAFF = 40
+USERS_PER_ORGANIZATION = 50
+
+FAMILY_NAMES = [
+    ("山田", "ヤマダ"), ("佐藤", "サトウ"), ("鈴木", "スズキ"), ("高橋", "タカハシ"),
+    ("田中", "タナカ"), ("伊藤", "イトウ"), ("渡辺", "ワタナベ"), ("中村", "ナカムラ"),
+    ("小林", "コバヤシ"), ("加藤", "カトウ"), ("吉田", "ヨシダ"), ("松本", "マツモト"),
+]
+GIVEN_NAMES = [
+    ("太郎", "タロウ"), ("花子", "ハナコ"), ("一郎", "イチロウ"), ("美咲", "ミサキ"),
+    ("健太", "ケンタ"), ("由美", "ユミ"), ("翔", "ショウ"), ("さくら", "サクラ"),
+    ("大輔", "ダイスケ"), ("直子", "ナオコ"), ("誠", "マコト"), ("陽子", "ヨウコ"),
+]
+WARDS = [
+    ("門司区", "801"), ("小倉北区", "803"), ("小倉南区", "802"), ("若松区", "808"),
+    ("八幡東区", "805"), ("八幡西区", "806"), ("戸畑区", "804"),
+]
+CHARACTERISTICS = [
+    "自閉スペクトラム症。予定の変更が苦手で、事前の説明が必要。",
+    "知的障害（中度）。簡単な言葉と写真での説明が有効。",
+    "統合失調症。服薬管理と生活リズムの維持が課題。",
+    "うつ病。体調に波があり、無理のない通所計画が必要。",
+    "身体障害（下肢）。移動に車いすを使用。",
+]
+INTERESTS = ["電車", "音楽", "絵を描くこと", "料理", "パソコン", "散歩", "アニメ", "手芸"]
+ORGANIZATION_TYPES = [
+    ("サービス事業所", ["就労継続支援B型事業所", "生活介護事業所", "共同生活援助事業所", "就労移行支援事業所"]),
+    ("医療機関", ["精神科クリニック", "総合病院", "訪問看護ステーション"]),
+    ("後見人", ["成年後見業務対応"]),
+    ("その他", ["基幹相談支援センター", "地域活動支援センター"]),
+]
+RELATIONSHIP_TYPES = {"サービス事業所": "通所", "医療機関": "主治医", "後見人": "後見人", "その他": "相談"}
+CONSULTATION_TYPES = ["来所", "訪問", "電話", "その他"]
+CONSULTATION_CONTENTS = [
+    "日中活動の様子について本人・家族から聞き取りを行った。通所は安定している。",
+    "グループホームでの生活について相談があった。同居者との関係に悩んでいる。",
+    "就労に向けた意欲が高まっており、就労移行支援の見学を希望している。",
+    "体調不良が続き、通所を休みがちになっている。主治医への相談を勧めた。",
+    "家族の高齢化に伴い、将来の住まいについて相談があった。",
+]
+SERVICES = [
+    {"service_type": "生活介護", "provider": "生活支援センター門司", "frequency": "週5回"},
+    {"service_type": "就労継続支援B型", "provider": "ワークセンター北九州", "frequency": "週4回"},
+    {"service_type": "共同生活援助", "provider": "グループホーム小倉南", "frequency": "毎日"},
+    {"service_type": "居宅介護", "provider": "ヘルパーステーション八幡", "frequency": "週2回"},
+]
+SATISFACTIONS = ["満足", "やや満足", "普通", "やや不満", "不満"]
+MEDICATIONS = [
+    ("リスペリドン錠1mg", "リスペリドン", "統合失調症"),
+    ("アリピプラゾール錠3mg", "アリピプラゾール", "統合失調症"),
+    ("バルプロ酸ナトリウム錠200mg", "バルプロ酸ナトリウム", "てんかん"),
+    ("セルトラリン錠25mg", "セルトラリン", "うつ病"),
+    ("メチルフェニデート錠18mg", "メチルフェニデート", "注意欠如・多動症"),
+]
+NOTEBOOK_TYPES = [
+    ("療育手帳", ["A", "B1", "B2"]),
+    ("精神障害者保健福祉手帳", ["1級", "2級", "3級"]),
+    ("身体障害者手帳", ["1級", "2級", "3級", "4級"]),
+]
+
+
+def _next_id(db, model) -> int:
+    """テーブルの次のIDを取得"""
+    return (db.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    """平均 mean のばらつきのある件数（0以上）を作成"""
+    count, threshold, product = 0, pow(2.718281828459045, -mean), rng.random()
+    while product > threshold:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+def _insert_batches(db, model, rows: Iterator[Dict[str, Any]], batch_size: int) -> int:
+    """行を batch_size 件ずつ一括挿入"""
+    total, batch = 0, []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            db.execute(insert(model), batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(model), batch)
+        total += len(batch)
+    return total
+
+
+class LoadDataGenerator:
+    """負荷試験用データの作成"""
+
+    def __init__(self, db, users: int, seed: int, batch_size: int):
+        """
+        初期化
+
+        Args:
+            db: データベースセッション
+            users: 作成する利用者数
+            seed: 乱数のシード（同じ値なら同じデータを作成）
+            batch_size: 一括挿入する件数
+        """
+        self.db = db
+        self.user_count = users
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.today = date.today()
+
+        self.staff_ids: List[int] = []
+        self.organizations: List[Dict[str, Any]] = []
+        self.first_user_id = 0
+        # 利用者ごとの (利用者ID, 担当スタッフID)
+        self.users: List[tuple] = []
+        # 計画ごとの (計画ID, 利用者ID, スタッフID, 開始日, 終了日)
+        self.plans: List[tuple] = []
+
+    def run(self) -> Dict[str, int]:
+        """
+        全データを作成
+
+        Returns:
+            テーブルごとの作成件数
+        """
+        steps: List[tuple] = [
+            ("スタッフ", self.create_staffs),
+            ("関係機関", self.create_organizations),
+            ("利用者", self.create_users),
+            ("手帳", self.create_notebooks),
+            ("関係機関との関係", self.create_user_organizations),
+            ("相談記録", self.create_consultations),
+            ("計画", self.create_plans),
+            ("モニタリング記録", self.create_monitorings),
+            ("服薬情報", self.create_medications),
+        ]
+        counts = {}
+        for label, step in steps:
+            started = time.perf_counter()
+            counts[label] = step()
+            self.db.commit()
+            print(f"  ✅ {label}: {counts[label]:,}件（{time.perf_counter() - started:.1f}秒）")
+        return counts
+
+    def _insert(self, model, rows: Iterator[Dict[str, Any]]) -> int:
+        return _insert_batches(self.db, model, rows, self.batch_size)
+
+    def create_staffs(self) -> int:
+        """負荷試験用のスタッフを作成（既存の load** は再利用）"""
+        existing = dict(
+            self.db.query(Staff.username, Staff.id)
+            .filter(Staff.username.like(f"{STAFF_USERNAME_PREFIX}%"))
+            .all()
+        )
+        # bcryptは遅いため、全員で同じハッシュを使う
+        password_hash = bcrypt.hashpw(STAFF_PASSWORD.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+        count = max(1, -(-self.user_count // USERS_PER_STAFF))
+        next_id = _next_id(self.db, Staff)
+        rows = []
+        for number in range(1, count + 1):
+            username = f"{STAFF_USERNAME_PREFIX}{number:02d}"
+            if username in existing:
+                self.staff_ids.append(existing[username])
+                continue
+            family, _ = self.rng.choice(FAMILY_NAMES)
+            given, _ = self.rng.choice(GIVEN_NAMES)
+            rows.append({
+                "id": next_id,
+                "username": username,
+                "password_hash": password_hash,
+                "name": f"{family} {given}",
+                "role": "admin" if number == 1 else "staff",
+                "email": f"{username}@example.com",
+                "hire_date": self.today - timedelta(days=self.rng.randint(100, 5000)),
+                "is_active": True,
+            })
+            self.staff_ids.append(next_id)
+            next_id += 1
+        return self._insert(Staff, iter(rows))
+
+    def create_organizations(self) -> int:
+        """関係機関を作成"""
+        count = max(1, self.user_count // USERS_PER_ORGANIZATION)
+        first_id = _next_id(self.db, Organization)
+
+        def rows():
+            for offset in range(count):
+                org_type, notes = self.rng.choice(ORGANIZATION_TYPES)
+                ward, postal = self.rng.choice(WARDS)
+                row = {
+                    "id": first_id + offset,
+                    "name": f"{ward}{org_type}{offset + 1:04d}",
+                    "type": org_type,
+                    "postal_code": f"{postal}-{self.rng.randint(0, 9999):04d}",
+                    "address": f"福岡県北九州市{ward}{self.rng.randint(1, 9)}-{self.rng.randint(1, 30)}",
+                    "phone": f"093-{self.rng.randint(100, 999)}-{self.rng.randint(1000, 9999)}",
+                    "contact_person": f"{self.rng.choice(FAMILY_NAMES)[0]} 担当",
+                    "notes": self.rng.choice(notes),
+                }
+                self.organizations.append(row)
+                yield row
+
+        return self._insert(Organization, rows())
+
+    def create_users(self) -> int:
+        """利用者を作成"""
+        self.first_user_id = _next_id(self.db, User)
+
+        def rows():
+            for offset in range(self.user_count):
+                user_id = self.first_user_id + offset
+                staff_id = self.rng.choice(self.staff_ids)
+                (family, family_kana), (given, given_kana) = (
+                    self.rng.choice(FAMILY_NAMES), self.rng.choice(GIVEN_NAMES)
+                )
+                ward, postal = self.rng.choice(WARDS)
+                level = self.rng.choice([None, 1, 2, 3, 4, 5, 6])
+                certified = self.today - timedelta(days=self.rng.randint(0, 1000)) if level else None
+                has_guardian = self.rng.random() < 0.15
+                self.users.append((user_id, staff_id))
+                yield {
+                    "id": user_id,
+                    "name": f"{family} {given}",
+                    "name_kana": f"{family_kana} {given_kana}",
+                    "birth_date": date(1950, 1, 1) + timedelta(days=self.rng.randint(0, 25000)),
+                    "gender": self.rng.choice(["男性", "女性"]),
+                    "postal_code": f"{postal}-{self.rng.randint(0, 9999):04d}",
+                    "address": f"福岡県北九州市{ward}{self.rng.randint(1, 9)}-{self.rng.randint(1, 30)}",
+                    "phone": f"093-{self.rng.randint(100, 999)}-{self.rng.randint(1000, 9999)}",
+                    "emergency_contact_name": f"{family} {self.rng.choice(GIVEN_NAMES)[0]}",
+                    "emergency_contact_phone": f"090-{self.rng.randint(1000, 9999)}-{self.rng.randint(1000, 9999)}",
+                    "disability_support_level": level,
+                    "disability_support_certified_date": certified,
+                    "disability_support_expiry_date": certified + timedelta(days=1095) if certified else None,
+                    "disability_characteristics": self.rng.choice(CHARACTERISTICS),
+                    "interest_bias": "、".join(self.rng.sample(INTERESTS, 2)),
+                    "guardian_type": "成年後見人" if has_guardian else None,
+                    "guardian_name": f"{self.rng.choice(FAMILY_NAMES)[0]} 弁護士" if has_guardian else None,
+                    "assigned_staff_id": staff_id,
+                }
+
+        return self._insert(User, rows())
+
+    def create_notebooks(self) -> int:
+        """手帳を作成"""
+        def rows():
+            for user_id, _ in self.users:
+                if self.rng.random() >= NOTEBOOK_RATE:
+                    continue
+                notebook_type, grades = self.rng.choice(NOTEBOOK_TYPES)
+                issued = self.today - timedelta(days=self.rng.randint(0, 1500))
+                yield {
+                    "user_id": user_id,
+                    "notebook_type": notebook_type,
+                    "grade": self.rng.choice(grades),
+                    "issue_date": issued,
+                    "renewal_date": issued + timedelta(days=730),
+                }
+
+        return self._insert(Notebook, rows())
+
+    def create_user_organizations(self) -> int:
+        """利用者と関係機関の関係を作成"""
+        def rows():
+            for user_id, _ in self.users:
+                count = min(_poisson(self.rng, ORGANIZATIONS_PER_USER), len(self.organizations))
+                for organization in self.rng.sample(self.organizations, count):
+                    yield {
+                        "user_id": user_id,
+                        "organization_id": organization["id"],
+                        "relationship_type": RELATIONSHIP_TYPES[organization["type"]],
+                        "start_date": self.today - timedelta(days=self.rng.randint(0, 2000)),
+                        "frequency": self.rng.choice(["週5日", "週3日", "月2回", "月1回"]),
+                    }
+
+        return self._insert(UserOrganization, rows())
+
+    def create_consultations(self) -> int:
+        """相談記録を作成"""
+        def rows():
+            for user_id, staff_id in self.users:
+                for _ in range(_poisson(self.rng, CONSULTATIONS_PER_USER)):
+                    yield {
+                        "user_id": user_id,
+                        "staff_id": staff_id,
+                        "consultation_date": self.today - timedelta(days=self.rng.randint(0, 1000)),
+                        "consultation_type": self.rng.choice(CONSULTATION_TYPES),
+                        "content": self.rng.choice(CONSULTATION_CONTENTS),
+                        "response": "次回の面談で状況を確認することとした。",
+                    }
+
+        return self._insert(Consultation, rows())
+
+    def create_plans(self) -> int:
+        """計画を作成（利用者ごとに古い順、最新の計画のみ実施中）"""
+        first_id = _next_id(self.db, Plan)
+
+        def rows():
+            plan_id = first_id
+            for user_id, staff_id in self.users:
+                count = max(1, _poisson(self.rng, PLANS_PER_USER))
+                start = self.today - timedelta(days=365 * count - self.rng.randint(0, 180))
+                for index in range(count):
+                    end = start + timedelta(days=364)
+                    latest = index == count - 1
+                    self.plans.append((plan_id, user_id, staff_id, start, end))
+                    yield {
+                        "id": plan_id,
+                        "user_id": user_id,
+                        "staff_id": staff_id,
+                        "plan_type": "初回" if index == 0 else "更新",
+                        "plan_number": f"L{user_id:07d}-{index + 1}",
+                        "created_date": start - timedelta(days=14),
+                        "start_date": start,
+                        "end_date": end,
+                        "current_situation": self.rng.choice(CHARACTERISTICS),
+                        "hopes_and_needs": "地域で安心して暮らしたい。日中活動を続けたい。",
+                        "support_policy": "本人の意向を尊重し、段階的に自立した生活を目指す。",
+                        "long_term_goal": "地域で安定した生活を送る",
+                        "long_term_goal_period": "1年",
+                        "short_term_goal": "日中活動に週4日以上参加する",
+                        "short_term_goal_period": "6ヶ月",
+                        "services": self.rng.sample(SERVICES, self.rng.randint(1, 3)),
+                        "approval_status": self.rng.choice(["作成中", "承認済み", "実施中"]) if latest else "終了",
+                        "approval_date": start - timedelta(days=7),
+                    }
+                    plan_id += 1
+                    start = end + timedelta(days=1)
+
+        return self._insert(Plan, rows())
+
+    def create_monitorings(self) -> int:
+        """モニタリング記録を作成（計画期間内、今日以前）"""
+        def rows():
+            for plan_id, user_id, staff_id, start, end in self.plans:
+                last = min(end, self.today)
+                if last <= start:
+                    continue
+                span = (last - start).days
+                dates = sorted(
+                    start + timedelta(days=self.rng.randint(0, span))
+                    for _ in range(_poisson(self.rng, MONITORINGS_PER_PLAN))
+                )
+                for monitoring_date in dates:
+                    yield {
+                        "plan_id": plan_id,
+                        "user_id": user_id,
+                        "staff_id": staff_id,
+                        "monitoring_date": monitoring_date,
+                        "monitoring_type": "定期" if self.rng.random() < 0.85 else "随時",
+                        "service_usage_status": "予定どおり利用している。",
+                        "goal_achievement": "目標に向けて取り組めている。",
+                        "satisfaction": self.rng.choice(SATISFACTIONS),
+                        "future_policy": "現在の支援を継続する。",
+                        "plan_revision_needed": self.rng.random() < 0.1,
+                        "next_monitoring_date": monitoring_date + timedelta(days=self.rng.choice([30, 90, 180])),
+                    }
+
+        return self._insert(Monitoring, rows())
+
+    def create_medications(self) -> int:
+        """服薬情報を作成"""
+        def rows():
+            for user_id, _ in self.users:
+                for _ in range(_poisson(self.rng, MEDICATIONS_PER_USER)):
+                    name, generic, purpose = self.rng.choice(MEDICATIONS)
+                    current = self.rng.random() < 0.8
+                    started = self.today - timedelta(days=self.rng.randint(30, 2000))
+                    yield {
+                        "user_id": user_id,
+                        "medication_name": name,
+                        "generic_name": generic,
+                        "dosage": "1錠",
+                        "frequency": self.rng.choice(["1日1回", "1日2回", "1日3回"]),
+                        "timing": self.rng.choice(["朝食後", "夕食後", "就寝前", "毎食後"]),
+                        "start_date": started,
+                        "end_date": None if current else started + timedelta(days=self.rng.randint(30, 365)),
+                        "is_current": current,
+                        "purpose": purpose,
+                    }
+
+        return self._insert(Medication, rows())
+
+
+def main():
+    """負荷試験用データを作成"""
+    parser = argparse.ArgumentParser(description="負荷試験用の大量データを作成します")
+    parser.add_argument("--users", type=int, default=50000, help="作成する利用者数（既定: 50000）")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード（既定: 0）")
+    parser.add_argument("--batch-size", type=int, default=2000, help="一括挿入する件数（既定: 2000）")
+    parser.add_argument("--skip-schedule", action="store_true", help="モニタリング予定を再計算しない")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print(f"🌱 負荷試験用データを作成しています（利用者 {args.users:,}人）...")
+        started = time.perf_counter()
+        counts = LoadDataGenerator(db, args.users, args.seed, args.batch_size).run()
+
+        if not args.skip_schedule:
+            schedule_started = time.perf_counter()
+            result = MonitoringScheduleService(db).refresh()
+            print(f"  ✅ モニタリング予定: 登録 {result['inserted']:,}件 / 更新 {result['updated']:,}件"
+                  f"（{time.perf_counter() - schedule_started:.1f}秒）")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    print(f"\n✅ 合計 {sum(counts.values()):,}件を {time.perf_counter() - started:.1f}秒で作成しました")
+    print(f"   負荷試験用スタッフ: {STAFF_USERNAME_PREFIX}01〜 / パスワード: {STAFF_PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()
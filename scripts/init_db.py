@@ -1,7 +1,20 @@
 """
-データベース初期化スクリプト
+データベース初期化・更新スクリプト
 
-SQLiteデータベースを作成し、全テーブルを初期化します。
+Alembicのマイグレーションを最新（head）まで適用します。新しいデータベースでは
+全テーブルを作成し、既存のデータベースでは未適用のマイグレーションのみ適用します。
+
+以前のバージョン（起動時・初期化時に create_all でテーブルを作成していたバージョン）で
+作成したデータベースにはマイグレーション履歴（alembic_version）がないため、
+初期マイグレーション（BASELINE_REVISION）を適用済みとして記録してから適用します。
+以降のマイグレーションは作成済みのテーブル・インデックスを作成しないようにしています。
+
+マイグレーションの適用後、モニタリング予定（monitoring_schedule）が空の場合は
+全利用者分を算出して登録します（scripts/rebuild_monitoring_schedule.py と同じ処理）。
+予定の算出はアプリケーションのモデルを使うため、マイグレーションでは行いません。
+
+アプリケーションの起動時にはテーブルを作成・変更しないため、更新後は必ず実行してください
+（scripts/start.sh は起動前に自動で実行します）。
 """
 import sys
 from pathlib import Path
@@ -10,25 +23,68 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.database.connection import Base, engine
-from app.models import (
-    Staff, User, Notebook, Consultation, Organization, UserOrganization,
-    PrescribingDoctor, Medication, MedicationChange
-)
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.config import get_settings
+from app.database.connection import SessionLocal, engine
+from app.models.monitoring_schedule import MonitoringSchedule
+from app.services.monitoring_schedule_service import MonitoringScheduleService
+
+# 以前のバージョン（create_all で作成）のデータベースを記録するリビジョン（初期マイグレーション）
+BASELINE_REVISION = "f84416d23e66"
+
+
+def alembic_config() -> Config:
+    """アプリケーションと同じデータベースを対象とするAlembicの設定を取得"""
+    config = Config(str(project_root / "alembic.ini"))
+    config.set_main_option("script_location", str(project_root / "alembic"))
+    config.set_main_option("sqlalchemy.url", get_settings().database_url)
+    return config
+
+
+def rebuild_monitoring_schedule_if_empty():
+    """
+    モニタリング予定が空の場合に全利用者分を算出して登録
+
+    以前のバージョンのデータベースでは、マイグレーションで作成した monitoring_schedule が
+    空のままになり、ダッシュボードの期限超過アラートやカレンダーの予定が表示されないため。
+    """
+    db = SessionLocal()
+    try:
+        if db.query(MonitoringSchedule.id).first() is not None:
+            return
+        result = MonitoringScheduleService(db).refresh()
+    finally:
+        db.close()
+
+    if result["inserted"]:
+        print(f"📅 モニタリング予定を算出しました（{result['inserted']}件）")
 
 
 def init_database():
-    """データベースを初期化"""
-    print("📊 データベースを初期化しています...")
+    """データベースを初期化・更新"""
+    config = alembic_config()
+    inspector = inspect(engine)
+
+    if inspector.has_table("alembic_version"):
+        print("📊 既存のデータベースにマイグレーションを適用しています...")
+    elif inspector.get_table_names():
+        # 以前のバージョンで作成したデータベース（マイグレーション履歴なし）
+        print("📊 マイグレーション履歴のないデータベースです。初期マイグレーションを適用済みとして記録します...")
+        command.stamp(config, BASELINE_REVISION)
+    else:
+        print("📊 データベースを初期化しています...")
 
-    # 全テーブルを作成
-    Base.metadata.create_all(bind=engine)
+    command.upgrade(config, "head")
+    rebuild_monitoring_schedule_if_empty()
 
-    print("✅ データベースの初期化が完了しました！")
-    print(f"📂 データベースファイル: keikaku_sodan.db")
-    print("\n作成されたテーブル:")
-    for table in Base.metadata.sorted_tables:
-        print(f"  - {table.name}")
+    print("✅ データベースの準備が完了しました！")
+    print(f"📂 データベース: {get_settings().database_url}")
+    print("\nテーブル:")
+    for table_name in sorted(inspect(engine).get_table_names()):
+        print(f"  - {table_name}")
 
 
 if __name__ == "__main__":
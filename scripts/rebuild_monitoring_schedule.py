@@ -0,0 +1,39 @@
+"""
+モニタリング予定再計算スクリプト
+
+全利用者の有効な計画と最新のモニタリング記録から、モニタリング予定
+（monitoring_schedule）を再計算します。通常は記録・計画の更新時に自動で
+再計算されるため、導入時やデータ移行後に実行します。
+
+使い方:
+    python scripts/rebuild_monitoring_schedule.py
+"""
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.database.connection import SessionLocal
+from app.services.monitoring_schedule_service import MonitoringScheduleService
+
+
+def main():
+    """モニタリング予定を再計算"""
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        result = MonitoringScheduleService(db).refresh()
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+
+    print("✅ モニタリング予定を再計算しました")
+    print(f"   登録: {result['inserted']}件 / 更新: {result['updated']}件 / 削除: {result['removed']}件")
+    print(f"   所要時間: {elapsed:.2f}秒")
+
+
+if __name__ == "__main__":
+    main()
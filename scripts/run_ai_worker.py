@@ -0,0 +1,44 @@
+"""
+AI生成ジョブワーカー起動スクリプト
+
+Webサーバーとは別のプロセス（GPUを搭載したホストなど）でAI生成ジョブを実行します。
+Webサーバー側は AI_JOB_WORKERS=0 に設定するとジョブを実行しなくなります。
+
+使い方:
+    python scripts/run_ai_worker.py --workers 2
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.config import get_settings
+from app.services.ai_job_queue import AIJobWorkerPool
+
+
+def main():
+    """ワーカーを起動し、Ctrl+C で停止するまで待機"""
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="AI生成ジョブワーカー")
+    parser.add_argument("--workers", type=int, default=max(settings.ai_job_workers, 1), help="ワーカースレッド数")
+    args = parser.parse_args()
+
+    pool = AIJobWorkerPool(workers=args.workers, poll_interval=settings.ai_job_poll_interval_seconds)
+    pool.start()
+    print(f"🤖 AI生成ジョブワーカーを起動しました（{args.workers}スレッド）")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\n⏹  ワーカーを停止しています...")
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -34,8 +34,15 @@ if [ ! -f "keikaku_sodan.db" ]; then
         echo "❌ データベースが必要です。"
         exit 1
     fi
+else
+    # 起動時にはテーブルを作成しないため、未適用のマイグレーションをここで適用する
+    # （マイグレーション履歴のない以前のバージョンのデータベースも init_db.py が記録してから適用する）
+    .venv/bin/python scripts/init_db.py > /dev/null || { echo "❌ マイグレーションの適用に失敗しました。"; exit 1; }
 fi
 
+# 静的ファイルのビルド（縮小・事前圧縮・ハッシュ付きファイル名）
+.venv/bin/python scripts/build_static.py > /dev/null || echo "⚠️  静的ファイルのビルドに失敗しました。元のファイルを配信します。"
+
 # サーバーを起動
 echo "🌐 サーバーを起動しています..."
 echo "   アクセスURL: http://localhost:8000"